@@ -0,0 +1,44 @@
+from types import TracebackType
+from typing import Any, Mapping, Optional, Type
+
+from multidict import CIMultiDict
+from yarl import URL
+
+
+class FakeClientResponse:
+    def __init__(self, body: bytes, status: int = 200) -> None:
+        self._body = body
+        self.status = status
+        self.ok = status < 400
+        self.headers: CIMultiDict[str] = CIMultiDict()
+
+    async def read(self) -> bytes:
+        return self._body
+
+    async def __aenter__(self) -> "FakeClientResponse":
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        return None
+
+
+class FakeClientSession:
+    """Serves canned bodies by url path without touching the network."""
+
+    def __init__(self, routes: Mapping[str, bytes]) -> None:
+        self._routes = routes
+        self.requests = 0
+
+    def get(
+        self, url: str, headers: Mapping[str, str], timeout: Any = None
+    ) -> FakeClientResponse:
+        self.requests += 1
+        path = URL(url).path
+        if path not in self._routes:
+            return FakeClientResponse(body=b'{"detail": "not found"}', status=404)
+        return FakeClientResponse(body=self._routes[path])
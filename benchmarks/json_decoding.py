@@ -0,0 +1,63 @@
+"""Compare the available JSON decoders on realistic Mealie payloads.
+
+Run with `python -m benchmarks.json_decoding`.
+"""
+import json
+import timeit
+import tracemalloc
+from typing import Dict, Tuple
+
+from custom_components.mealie.json_decoder import (
+    JsonDecoder,
+    msgspec_decoder,
+    orjson_decoder,
+    stdlib_decoder,
+)
+
+from .payloads import RECIPE_SIZES, meal_plan_payload, recipe_payload
+
+
+def decoders() -> Dict[str, JsonDecoder]:
+    available = {
+        "json": stdlib_decoder,
+        "orjson": orjson_decoder(),
+        "msgspec": msgspec_decoder(),
+    }
+    return {name: decoder for name, decoder in available.items() if decoder}
+
+
+def payloads() -> Dict[str, bytes]:
+    return {
+        "very large recipe": json.dumps(
+            recipe_payload(slug="very-large", **RECIPE_SIZES["very_large"])
+        ).encode(),
+        "week plan (3/day)": json.dumps(meal_plan_payload(meals_per_day=3)).encode(),
+    }
+
+
+def measure(decoder: JsonDecoder, body: bytes, number: int) -> Tuple[float, int]:
+    seconds = min(timeit.repeat(lambda: decoder(body), number=number, repeat=5))
+
+    tracemalloc.start()
+    decoder(body)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return seconds / number, peak
+
+
+def main() -> None:
+    print(
+        f"{'payload':<20} {'bytes':>8} {'decoder':<8} {'time (us)':>10} {'peak (B)':>10}"
+    )
+    for payload, body in payloads().items():
+        for name, decoder in decoders().items():
+            seconds, peak = measure(decoder, body, number=200)
+            print(
+                f"{payload:<20} {len(body):>8} {name:<8} "
+                f"{seconds * 1e6:>10.1f} {peak:>10}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""Run the real HttpClient, Api and coordinator stack against the stub server.
+
+Run `python -m benchmarks.load_test --entries 4 --cycles 50 --latency 0.15`.
+"""
+import argparse
+import asyncio
+from dataclasses import dataclass, field
+import statistics
+import time
+from typing import Dict, List, Optional, Sequence
+from unittest.mock import MagicMock
+
+from aiohttp import ClientSession
+from homeassistant.helpers.update_coordinator import UpdateFailed
+
+from custom_components.mealie.api import Api
+from custom_components.mealie.coordinator import MealieDataUpdateCoordinator
+from custom_components.mealie.exception import (
+    HttpException,
+    InternalClientException,
+)
+from custom_components.mealie.http_client import HttpClient
+from custom_components.mealie.response_cache import ResponseCache
+from custom_components.mealie.token_repository import TokenRepository
+
+from .stub_server import MealieStubServer, config_arguments, config_from_args
+
+
+@dataclass
+class LoadReport:
+    duration: float = 0.0
+    cycles: List[float] = field(default_factory=list)
+    failures: Dict[str, int] = field(default_factory=dict)
+    endpoints: Dict[str, List[float]] = field(default_factory=dict)
+
+
+def percentile(values: Sequence[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+async def create_coordinator(
+    session: ClientSession, base_url: str, cache: bool
+) -> MealieDataUpdateCoordinator:
+    api = Api(
+        http_client=HttpClient(
+            client_session=session, response_cache=ResponseCache() if cache else None
+        ),
+        base_url=base_url,
+        token_repository=TokenRepository(),
+    )
+    await api.get_token(username="user1", password="password")
+
+    config_entry = MagicMock()
+    config_entry.options = {}
+    return MealieDataUpdateCoordinator(
+        hass=MagicMock(), config_entry=config_entry, mealie_api=api
+    )
+
+
+async def run_entry(
+    coordinator: MealieDataUpdateCoordinator, cycles: int, report: LoadReport
+) -> None:
+    for _ in range(cycles):
+        coordinator.data = None
+        start = time.perf_counter()
+        try:
+            await coordinator._async_update_data()
+        except (UpdateFailed, HttpException, InternalClientException) as error:
+            name = type(error).__name__
+            report.failures[name] = report.failures.get(name, 0) + 1
+            continue
+        report.cycles.append(time.perf_counter() - start)
+        for endpoint, seconds in coordinator.endpoint_timings.items():
+            report.endpoints.setdefault(endpoint, []).append(seconds)
+
+
+async def run_load(
+    server: MealieStubServer, entries: int, cycles: int, cache: bool
+) -> LoadReport:
+    report = LoadReport()
+    base_url = await server.start()
+    try:
+        async with ClientSession() as session:
+            coordinators = [
+                await create_coordinator(session, base_url, cache)
+                for _ in range(entries)
+            ]
+            start = time.perf_counter()
+            await asyncio.gather(
+                *(
+                    run_entry(coordinator, cycles, report)
+                    for coordinator in coordinators
+                )
+            )
+            report.duration = time.perf_counter() - start
+    finally:
+        await server.stop()
+    return report
+
+
+def print_report(report: LoadReport, server: MealieStubServer) -> None:
+    requests = sum(server.requests.values())
+    print(f"duration        {report.duration:.2f} s")
+    print(f"cycles          {len(report.cycles)} ok, {report.failures or 'no'} failed")
+    print(f"throughput      {len(report.cycles) / report.duration:.1f} cycles/s")
+    print(f"requests        {requests} ({requests / report.duration:.1f}/s)")
+    print(f"injected faults {dict(server.faults) or 'none'}")
+    print()
+    print(f"{'latency (ms)':<20} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8}")
+    rows = {"cycle": report.cycles, **report.endpoints}
+    for name, values in rows.items():
+        if not values:
+            continue
+        print(
+            f"{name:<20} {statistics.median(values) * 1e3:>8.1f} "
+            f"{percentile(values, 0.95) * 1e3:>8.1f} "
+            f"{percentile(values, 0.99) * 1e3:>8.1f} {max(values) * 1e3:>8.1f}"
+        )
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, parents=[config_arguments()])
+    parser.add_argument(
+        "--entries", type=int, default=1, help="config entries refreshing at once"
+    )
+    parser.add_argument(
+        "--cycles", type=int, default=20, help="refresh cycles per entry"
+    )
+    parser.add_argument(
+        "--no-cache", action="store_true", help="run without the response cache"
+    )
+    load_args = parser.parse_args(argv)
+
+    server = MealieStubServer(config_from_args(load_args))
+    report = asyncio.run(
+        run_load(
+            server,
+            entries=load_args.entries,
+            cycles=load_args.cycles,
+            cache=not load_args.no_cache,
+        )
+    )
+    print_report(report, server)
+
+
+if __name__ == "__main__":
+    main()
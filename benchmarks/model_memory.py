@@ -0,0 +1,52 @@
+"""Report retained bytes per parsed recipe for each model representation.
+
+Run with `python -m benchmarks.model_memory`.
+"""
+import gc
+import tracemalloc
+from typing import Any, Callable, List, Mapping
+
+from custom_components.mealie.model.compact import CompactRecipeResponse
+from custom_components.mealie.model.model import (
+    LazyRecipeResponse,
+    RecipeResponse,
+)
+
+from .payloads import RECIPE_SIZES, recipe_payloads
+
+Parser = Callable[[Mapping[str, Any]], Any]
+
+PARSERS: Mapping[str, Parser] = {
+    "dataclass": RecipeResponse.from_json,
+    "lazy": LazyRecipeResponse.from_json,
+    "compact": CompactRecipeResponse.from_json,
+}
+
+RECIPES = 100
+
+
+def bytes_per_recipe(parser: Parser, size: str) -> float:
+    gc.collect()
+    tracemalloc.start()
+    baseline, _ = tracemalloc.get_traced_memory()
+
+    payloads = recipe_payloads(size=size, count=RECIPES)
+    recipes: List[Any] = [parser(payload) for payload in payloads]
+    del payloads
+    gc.collect()
+
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del recipes
+    return (retained - baseline) / RECIPES
+
+
+def main() -> None:
+    print(f"{'size':<10} {'model':<10} {'bytes/recipe':>13}")
+    for size in RECIPE_SIZES:
+        for name, parser in PARSERS.items():
+            print(f"{size:<10} {name:<10} {bytes_per_recipe(parser, size):>13.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+from datetime import date, timedelta
+from typing import Any, Dict, List
+
+
+def token_payload() -> Dict[str, Any]:
+    return {"access_token": "benchmark-token", "token_type": "bearer"}
+
+
+def statistics_payload() -> Dict[str, Any]:
+    return {
+        "totalRecipes": 250,
+        "totalUsers": 4,
+        "totalGroups": 1,
+        "uncategorizedRecipes": 12,
+        "untaggedRecipes": 30,
+    }
+
+
+def error_payload(details: int = 3) -> Dict[str, Any]:
+    return {
+        "detail": [
+            {"loc": ["body", f"field{index}"], "msg": "field required", "type": "x"}
+            for index in range(details)
+        ]
+    }
+
+
+def user_payload(user_id: int = 1) -> Dict[str, Any]:
+    return {
+        "username": f"user{user_id}",
+        "fullName": f"User {user_id}",
+        "email": f"user{user_id}@example.com",
+        "admin": False,
+        "group": "Home",
+        "favoriteRecipes": [f"recipe-{index}" for index in range(5)],
+        "id": user_id,
+        "tokens": [{"name": "home-assistant", "id": user_id}],
+    }
+
+
+def recipe_payload(
+    slug: str = "recipe-0",
+    ingredients: int = 10,
+    instructions: int = 8,
+    comments: int = 2,
+) -> Dict[str, Any]:
+    return {
+        "id": abs(hash(slug)) % 100000,
+        "name": slug.replace("-", " ").title(),
+        "slug": slug,
+        "image": f"{slug}.webp",
+        "description": "A synthetic recipe used for benchmarking. " * 4,
+        "recipeCategory": ["dinner", "weeknight"],
+        "tags": ["quick", "family", "vegetarian"],
+        "rating": 4,
+        "dateAdded": "2021-11-29",
+        "dateUpdated": "2021-12-01T18:30:00",
+        "recipeYield": "4 servings",
+        "recipeIngredient": [
+            {
+                "title": None,
+                "note": f"ingredient {index}, finely chopped",
+                "unit": {"name": "gram", "description": "metric weight"},
+                "food": {"name": f"food {index % 25}", "description": None},
+                "disableAmount": False,
+                "quantity": index % 7 + 1,
+            }
+            for index in range(ingredients)
+        ],
+        "recipeInstructions": [
+            {"title": f"Step {index}", "text": "Stir and simmer gently. " * 6}
+            for index in range(instructions)
+        ],
+        "nutrition": {
+            "calories": "450",
+            "fatContent": "12",
+            "proteinContent": "30",
+            "carbohydrateContent": "50",
+            "fiberContent": "8",
+            "sodiumContent": "300",
+            "sugarContent": "5",
+        },
+        "tools": ["oven", "skillet"],
+        "totalTime": "45 minutes",
+        "prepTime": "15 minutes",
+        "performTime": "30 minutes",
+        "settings": {
+            "public": True,
+            "showNutrition": True,
+            "showAssets": False,
+            "landscapeView": True,
+            "disableComments": False,
+            "disableAmount": False,
+        },
+        "assets": [{"name": "photo", "icon": "mdi-file-image", "fileName": "a.jpg"}],
+        "notes": [{"title": "Tip", "text": "Tastes better the next day."}],
+        "orgURL": f"https://example.com/{slug}",
+        "extras": {"source": "benchmark"},
+        "comments": [
+            {
+                "text": f"Comment {index}: lovely recipe, would cook again.",
+                "id": index,
+                "uuid": f"00000000-0000-0000-0000-{index:012d}",
+                "recipeSlug": slug,
+                "dateAdded": "2021-12-02T12:00:00",
+                "user": user_payload(user_id=index % 10 + 1),
+            }
+            for index in range(comments)
+        ],
+    }
+
+
+def meal_plan_payload(
+    meals_per_day: int = 1, days: int = 7, start: date = date(2021, 11, 29)
+) -> Dict[str, Any]:
+    end = start + timedelta(days=days - 1)
+    return {
+        "group": "Home",
+        "startDate": start.isoformat(),
+        "endDate": end.isoformat(),
+        "planDays": [
+            {
+                "date": (start + timedelta(days=day)).isoformat(),
+                "meals": [
+                    {
+                        "slug": f"recipe-{day * meals_per_day + meal}",
+                        "name": f"Recipe {day * meals_per_day + meal}",
+                        "description": "A synthetic meal used for benchmarking.",
+                    }
+                    for meal in range(meals_per_day)
+                ],
+            }
+            for day in range(days)
+        ],
+        "uid": 27,
+        "shoppingList": 25,
+    }
+
+
+RECIPE_SIZES: Dict[str, Dict[str, int]] = {
+    "small": {"ingredients": 3, "instructions": 2, "comments": 0},
+    "typical": {"ingredients": 12, "instructions": 8, "comments": 5},
+    "very_large": {"ingredients": 60, "instructions": 30, "comments": 300},
+}
+
+
+def recipe_payloads(size: str, count: int = 1) -> List[Dict[str, Any]]:
+    return [
+        recipe_payload(slug=f"{size}-recipe-{index}", **RECIPE_SIZES[size])
+        for index in range(count)
+    ]
+
+
+MEAL_PLAN_SIZES: Dict[str, int] = {"small": 1, "typical": 3, "large": 10}
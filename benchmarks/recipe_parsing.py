@@ -0,0 +1,58 @@
+"""Compare eager and lazy parsing of recipe payloads.
+
+Run with `python -m benchmarks.recipe_parsing`.
+"""
+import timeit
+import tracemalloc
+from typing import Any, Callable, Mapping, Tuple
+
+from custom_components.mealie.model.model import (
+    LazyRecipeResponse,
+    RecipeResponse,
+)
+
+from .payloads import RECIPE_SIZES, recipe_payload
+
+Parser = Callable[[Mapping[str, Any]], Any]
+
+
+def parse_lazy_fully(json_data: Mapping[str, Any]) -> LazyRecipeResponse:
+    recipe = LazyRecipeResponse.from_json(json_data)
+    for field in ("recipe_ingredient", "recipe_instructions", "comments", "notes"):
+        getattr(recipe, field)
+    return recipe
+
+
+PARSERS: Mapping[str, Parser] = {
+    "eager": RecipeResponse.from_json,
+    "lazy": LazyRecipeResponse.from_json,
+    "lazy, all accessed": parse_lazy_fully,
+}
+
+
+def measure(
+    parser: Parser, payload: Mapping[str, Any], number: int
+) -> Tuple[float, int]:
+    seconds = min(timeit.repeat(lambda: parser(payload), number=number, repeat=5))
+
+    tracemalloc.start()
+    parsed = parser(payload)
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del parsed
+
+    return seconds / number, allocated
+
+
+def main() -> None:
+    print(f"{'size':<10} {'parser':<18} {'time (us)':>10} {'allocated (B)':>14}")
+    for size, shape in RECIPE_SIZES.items():
+        payload = recipe_payload(slug=f"{size}-recipe", **shape)
+        number = 20 if size == "very_large" else 500
+        for name, parser in PARSERS.items():
+            seconds, allocated = measure(parser, payload, number)
+            print(f"{size:<10} {name:<18} {seconds * 1e6:>10.1f} {allocated:>14}")
+
+
+if __name__ == "__main__":
+    main()
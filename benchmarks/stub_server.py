@@ -0,0 +1,246 @@
+"""Local stand-in for the Mealie endpoints used by the integration.
+
+Run `python -m benchmarks.stub_server --port 9925 --latency 0.15` and point a
+config entry at http://localhost:9925 (any username and password work). Pass
+`--notify-url` with the entry's webhook url to have it push a meal plan change
+notification every `--notify-interval` seconds, like Mealie's notifier would.
+"""
+import argparse
+import asyncio
+from collections import Counter
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+import json
+import random
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Mapping,
+    Optional,
+    Sequence,
+)
+
+from aiohttp import ClientSession, web
+import jwt
+
+from .payloads import (
+    RECIPE_SIZES,
+    meal_plan_payload,
+    recipe_payload,
+    statistics_payload,
+    user_payload,
+)
+
+Handler = Callable[[web.Request], Awaitable[web.StreamResponse]]
+
+TOKEN_SECRET = "mealie-stub"
+
+
+@dataclass
+class StubServerConfig:
+    latency: float = 0.0
+    jitter: float = 0.0
+    error_rate: float = 0.0
+    truncate_rate: float = 0.0
+    meals_per_day: int = 3
+    recipe_size: str = "typical"
+    token_lifetime: timedelta = timedelta(hours=1)
+    seed: Optional[int] = None
+    notify_url: Optional[str] = None
+    notify_interval: float = 60.0
+
+
+class MealieStubServer:
+    def __init__(self, config: Optional[StubServerConfig] = None) -> None:
+        self.config = config or StubServerConfig()
+        self.requests: Counter[str] = Counter()
+        self.faults: Counter[str] = Counter()
+        self._random = random.Random(self.config.seed)
+        self._runner: Optional[web.AppRunner] = None
+
+        self.app = web.Application(middlewares=[self._inject_faults])
+        self.app.router.add_post("/api/auth/token", self._token)
+        self.app.router.add_post("/api/auth/token/long", self._token)
+        self.app.router.add_get("/api/auth/refresh", self._authorized(self._token))
+        self.app.router.add_get("/api/users/self", self._authorized(self._user))
+        self.app.router.add_get(
+            "/api/debug/statistics", self._authorized(self._statistics)
+        )
+        self.app.router.add_get(
+            "/api/meal-plans/today", self._authorized(self._recipe_today)
+        )
+        self.app.router.add_get(
+            "/api/meal-plans/this-week", self._authorized(self._meal_plan)
+        )
+        self.app.router.add_get("/api/recipes/{slug}", self._authorized(self._recipe))
+        if self.config.notify_url is not None:
+            self.app.cleanup_ctx.append(self._notify_periodically)
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        self._runner = web.AppRunner(self.app)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, host=host, port=port).start()
+        return f"http://{host}:{self._runner.addresses[0][1]}"
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    def token(self, username: str = "user1") -> str:
+        expiry = datetime.now(timezone.utc) + self.config.token_lifetime
+        return jwt.encode({"sub": username, "exp": expiry}, TOKEN_SECRET)
+
+    async def notify(self, url: str, title: str, message: str = "") -> int:
+        """Posts an Apprise style json notification, as Mealie's notifier does."""
+        payload = {"version": "1.0", "title": title, "message": message, "type": "info"}
+        async with ClientSession() as session:
+            async with session.post(url, json=payload) as response:
+                return response.status
+
+    async def _notify_periodically(self, app: web.Application) -> AsyncIterator[None]:
+        async def notify() -> None:
+            while True:
+                await asyncio.sleep(self.config.notify_interval)
+                await self.notify(
+                    self.config.notify_url, "Meal Plan Updated", "This week changed"
+                )
+
+        task = asyncio.create_task(notify())
+        yield
+        task.cancel()
+
+    @web.middleware
+    async def _inject_faults(
+        self, request: web.Request, handler: Handler
+    ) -> web.StreamResponse:
+        self.requests[request.path] += 1
+        delay = self.config.latency + self._random.uniform(0, self.config.jitter)
+        if delay:
+            await asyncio.sleep(delay)
+
+        if self._random.random() < self.config.error_rate:
+            self.faults["5xx"] += 1
+            return web.json_response(
+                {"detail": "injected failure"},
+                status=self._random.choice((500, 502, 503)),
+            )
+
+        response = await handler(request)
+        if (
+            isinstance(response, web.Response)
+            and isinstance(response.body, bytes)
+            and self._random.random() < self.config.truncate_rate
+        ):
+            self.faults["truncated"] += 1
+            body = response.body
+            return web.Response(
+                body=body[: len(body) // 2],
+                status=response.status,
+                content_type="application/json",
+            )
+        return response
+
+    def _authorized(self, handler: Handler) -> Handler:
+        async def authorized(request: web.Request) -> web.StreamResponse:
+            _, _, token = request.headers.get("Authorization", "").partition(" ")
+            try:
+                jwt.decode(token, TOKEN_SECRET, algorithms=["HS256"])
+            except jwt.InvalidTokenError:
+                return web.json_response({"detail": "Unauthorized"}, status=401)
+            return await handler(request)
+
+        return authorized
+
+    @staticmethod
+    def _json(payload: Any) -> web.Response:
+        return web.Response(
+            body=json.dumps(payload).encode(), content_type="application/json"
+        )
+
+    async def _token(self, request: web.Request) -> web.Response:
+        return self._json({"access_token": self.token(), "token_type": "bearer"})
+
+    async def _user(self, request: web.Request) -> web.Response:
+        return self._json(user_payload())
+
+    async def _statistics(self, request: web.Request) -> web.Response:
+        return self._json(statistics_payload())
+
+    def _this_week(self) -> Mapping[str, Any]:
+        today = date.today()
+        return meal_plan_payload(
+            meals_per_day=self.config.meals_per_day,
+            start=today - timedelta(days=today.weekday()),
+        )
+
+    async def _meal_plan(self, request: web.Request) -> web.Response:
+        return self._json(self._this_week())
+
+    async def _recipe_today(self, request: web.Request) -> web.Response:
+        today = date.today().isoformat()
+        plan_day = next(
+            day for day in self._this_week()["planDays"] if day["date"] == today
+        )
+        return self._json(
+            recipe_payload(
+                slug=plan_day["meals"][0]["slug"],
+                **RECIPE_SIZES[self.config.recipe_size],
+            )
+        )
+
+    async def _recipe(self, request: web.Request) -> web.Response:
+        return self._json(
+            recipe_payload(
+                slug=request.match_info["slug"],
+                **RECIPE_SIZES[self.config.recipe_size],
+            )
+        )
+
+
+def config_arguments() -> argparse.ArgumentParser:
+    """The server behaviour options, for use as a parent parser."""
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--truncate-rate", type=float, default=0.0)
+    parser.add_argument("--meals-per-day", type=int, default=3)
+    parser.add_argument("--recipe-size", choices=RECIPE_SIZES, default="typical")
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--notify-url")
+    parser.add_argument("--notify-interval", type=float, default=60.0)
+    return parser
+
+
+def parse_config(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, parents=[config_arguments()])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9925)
+    return parser.parse_args(argv)
+
+
+def config_from_args(args: argparse.Namespace) -> StubServerConfig:
+    return StubServerConfig(
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        truncate_rate=args.truncate_rate,
+        meals_per_day=args.meals_per_day,
+        recipe_size=args.recipe_size,
+        seed=args.seed,
+        notify_url=args.notify_url,
+        notify_interval=args.notify_interval,
+    )
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    args = parse_config(argv)
+    server = MealieStubServer(config_from_args(args))
+    web.run_app(server.app, host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
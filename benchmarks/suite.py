@@ -0,0 +1,271 @@
+"""Benchmark suite for the model parsers, the Api layer and a refresh cycle.
+
+Run `python -m benchmarks.suite` to compare against the stored baseline and
+`python -m benchmarks.suite --save` to record a new one. Timings are in
+microseconds per call and only comparable on the machine that recorded the
+baseline.
+"""
+import argparse
+import asyncio
+from dataclasses import dataclass
+from datetime import date
+import gc
+import inspect
+import json
+from pathlib import Path
+import sys
+import time
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence
+from unittest.mock import MagicMock
+
+from custom_components.mealie.api import Api
+from custom_components.mealie.coordinator import MealieDataUpdateCoordinator
+from custom_components.mealie.http_client import HttpClient
+from custom_components.mealie.model import model
+from custom_components.mealie.model.model import Response, Status
+from custom_components.mealie.token_repository import TokenRepository
+
+from .fake_http import FakeClientSession
+from .payloads import (
+    MEAL_PLAN_SIZES,
+    RECIPE_SIZES,
+    error_payload,
+    meal_plan_payload,
+    recipe_payload,
+    statistics_payload,
+    token_payload,
+    user_payload,
+)
+
+BASELINE = Path(__file__).parent / "baselines" / "suite.json"
+DEFAULT_TOLERANCE = 0.5
+REPEAT = 7
+
+
+@dataclass(frozen=True)
+class Case:
+    name: str
+    function: Callable[[], Any]
+    number: int
+
+
+def model_cases() -> List[Case]:
+    recipe = recipe_payload(**RECIPE_SIZES["typical"])
+    payloads: Mapping[str, Mapping[str, Any]] = {
+        "TokenResponse": token_payload(),
+        "ErrorResponse": error_payload(),
+        "Detail": error_payload()["detail"][0],
+        "MealPlanResponse": meal_plan_payload(),
+        "PlanDay": meal_plan_payload()["planDays"][0],
+        "Meal": meal_plan_payload()["planDays"][0]["meals"][0],
+        "UserResponse": user_payload(),
+        "Token": user_payload()["tokens"][0],
+        "StatisticsResponse": statistics_payload(),
+        "RecipeResponse": recipe,
+        "LazyRecipeResponse": recipe,
+        "Comment": recipe["comments"][0],
+        "Note": recipe["notes"][0],
+        "Asset": recipe["assets"][0],
+        "Setting": recipe["settings"],
+        "Nutrition": recipe["nutrition"],
+        "RecipeIngredient": recipe["recipeIngredient"][0],
+        "RecipeIngredientUnit": recipe["recipeIngredient"][0]["unit"],
+        "RecipeIngredientFood": recipe["recipeIngredient"][0]["food"],
+        "RecipeStep": recipe["recipeInstructions"][0],
+    }
+
+    cases = [
+        Case(
+            name=f"model.{name}.from_json",
+            function=lambda parser=getattr(model, name).from_json, payload=payload: (
+                parser(payload)
+            ),
+            number=2000,
+        )
+        for name, payload in payloads.items()
+    ]
+    for size, meals_per_day in MEAL_PLAN_SIZES.items():
+        payload = meal_plan_payload(meals_per_day=meals_per_day)
+        cases.append(
+            Case(
+                name=f"model.MealPlanResponse.from_json[{size}]",
+                function=lambda payload=payload: model.MealPlanResponse.from_json(
+                    payload
+                ),
+                number=500,
+            )
+        )
+    for size, shape in RECIPE_SIZES.items():
+        payload = recipe_payload(**shape)
+        cases.append(
+            Case(
+                name=f"model.RecipeResponse.from_json[{size}]",
+                function=lambda payload=payload: model.RecipeResponse.from_json(
+                    payload
+                ),
+                number=20 if size == "very_large" else 500,
+            )
+        )
+    return cases
+
+
+def fake_routes(today: date) -> Dict[str, bytes]:
+    meal_plan = meal_plan_payload(meals_per_day=MEAL_PLAN_SIZES["typical"], start=today)
+    recipes = {
+        f"/api/recipes/{meal['slug']}": recipe_payload(
+            slug=meal["slug"], **RECIPE_SIZES["typical"]
+        )
+        for plan_day in meal_plan["planDays"]
+        for meal in plan_day["meals"]
+    }
+    return {
+        path: json.dumps(payload).encode()
+        for path, payload in {
+            "/api/auth/refresh": token_payload(),
+            "/api/users/self": user_payload(),
+            "/api/debug/statistics": statistics_payload(),
+            "/api/meal-plans/this-week": meal_plan,
+            **recipes,
+        }.items()
+    }
+
+
+def create_api(today: date) -> Api:
+    token_repository = TokenRepository()
+    token_repository._cache_token("benchmark-token")
+    return Api(
+        http_client=HttpClient(client_session=FakeClientSession(fake_routes(today))),
+        base_url="http://mealie.local",
+        token_repository=token_repository,
+    )
+
+
+def api_cases() -> List[Case]:
+    api = create_api(date.today())
+    cases = []
+    for size, meals_per_day in MEAL_PLAN_SIZES.items():
+        response = Response(
+            status=Status.SUCCESS,
+            status_code=200,
+            data=meal_plan_payload(meals_per_day=meals_per_day),
+        )
+        cases.append(
+            Case(
+                name=f"api._parse[meal_plan,{size}]",
+                function=lambda response=response: api._parse(
+                    response=response, parser=model.MealPlanResponse.from_json
+                ),
+                number=500,
+            )
+        )
+    for size, shape in RECIPE_SIZES.items():
+        response = Response(
+            status=Status.SUCCESS, status_code=200, data=recipe_payload(**shape)
+        )
+        cases.append(
+            Case(
+                name=f"api._parse[recipe,{size}]",
+                function=lambda response=response: api._parse(
+                    response=response, parser=model.RecipeResponse.from_json
+                ),
+                number=20 if size == "very_large" else 500,
+            )
+        )
+    cases.append(
+        Case(name="api.get_statistics", function=api.get_statistics, number=500)
+    )
+    cases.append(
+        Case(
+            name="api.get_meal_plan_this_week",
+            function=api.get_meal_plan_this_week,
+            number=500,
+        )
+    )
+    return cases
+
+
+def coordinator_cases() -> List[Case]:
+    config_entry = MagicMock()
+    config_entry.options = {}
+    coordinator = MealieDataUpdateCoordinator(
+        hass=MagicMock(), config_entry=config_entry, mealie_api=create_api(date.today())
+    )
+
+    async def full_cycle() -> None:
+        coordinator.data = None
+        await coordinator._async_update_data()
+
+    return [
+        Case(name="coordinator._async_update_data", function=full_cycle, number=200)
+    ]
+
+
+async def measure(case: Case) -> float:
+    best = float("inf")
+    gc.disable()
+    try:
+        for _ in range(REPEAT):
+            start = time.perf_counter()
+            for _ in range(case.number):
+                result = case.function()
+                if inspect.isawaitable(result):
+                    await result
+            best = min(best, time.perf_counter() - start)
+    finally:
+        gc.enable()
+    return best / case.number * 1e6
+
+
+async def run(name_filter: Optional[str]) -> Dict[str, float]:
+    cases = model_cases() + api_cases() + coordinator_cases()
+    return {
+        case.name: round(await measure(case), 3)
+        for case in cases
+        if name_filter is None or name_filter in case.name
+    }
+
+
+def compare(
+    results: Mapping[str, float], baseline: Mapping[str, float], tolerance: float
+) -> List[str]:
+    regressions = []
+    print(f"{'case':<48} {'baseline':>10} {'current':>10} {'change':>8}")
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if previous is None:
+            print(f"{name:<48} {'-':>10} {current:>10.1f} {'new':>8}")
+            continue
+        change = (current - previous) / previous
+        marker = " !" if change > tolerance else ""
+        print(f"{name:<48} {previous:>10.1f} {current:>10.1f} {change:>+8.0%}{marker}")
+        if change > tolerance:
+            regressions.append(name)
+    return regressions
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--save", action="store_true", help="store a new baseline")
+    parser.add_argument("--baseline", type=Path, default=BASELINE)
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument("--filter", help="only run cases containing this text")
+    args = parser.parse_args(argv)
+
+    results = asyncio.run(run(args.filter))
+
+    if args.save:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps(results, indent=2, sort_keys=True) + "\n")
+        print(f"Stored {len(results)} results in {args.baseline}")
+        return 0
+
+    baseline = json.loads(args.baseline.read_text()) if args.baseline.exists() else {}
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        print(f"{len(regressions)} case(s) regressed more than {args.tolerance:.0%}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
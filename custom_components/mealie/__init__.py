@@ -1,26 +1,55 @@
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import CONF_ACCESS_TOKEN, CONF_HOST, Platform
-from homeassistant.core import HomeAssistant
+from homeassistant.const import CONF_HOST, EVENT_HOMEASSISTANT_STOP, Platform
+from homeassistant.core import Event, HomeAssistant, callback
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.event import async_track_time_change
 
 from custom_components.mealie.api import Api
-from custom_components.mealie.const import CONF_API, CONF_COORDINATOR, DOMAIN
-from custom_components.mealie.coordinator import MealieDataUpdateCoordinator
+from custom_components.mealie.const import (
+    CONF_API,
+    CONF_COORDINATOR,
+    CONF_GROUP,
+    DOMAIN,
+    GROUP_LOOKUP_DEADLINE,
+)
+from custom_components.mealie.coordinator import (
+    FETCH_ERRORS,
+    MealieDataUpdateCoordinator,
+)
+from custom_components.mealie.exception import AuthenticationException
 from custom_components.mealie.http_client import HttpClient
+from custom_components.mealie.resilience import Deadline
+from custom_components.mealie.response_cache import ResponseCache
+from custom_components.mealie.shared_fetcher import (
+    async_get_shared_fetcher,
+    async_release_shared_fetcher,
+)
+from custom_components.mealie.snapshot import SnapshotStore
 from custom_components.mealie.token_repository import (
     HomeAssistantTokenRepository,
 )
+from custom_components.mealie.webhook import async_register_webhook
 
-PLATFORMS = [Platform.SENSOR]
+PLATFORMS = [Platform.CALENDAR, Platform.SENSOR]
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     client_session = async_get_clientsession(hass=hass)
-    http_client = HttpClient(client_session=client_session)
+    http_client = HttpClient(
+        client_session=client_session, response_cache=ResponseCache()
+    )
     home_assistant_token_repository = HomeAssistantTokenRepository(
         hass=hass, entry=entry
     )
-    await home_assistant_token_repository.set_token(entry.data[CONF_ACCESS_TOKEN])
+    entry.async_on_unload(home_assistant_token_repository.async_flush)
+
+    @callback
+    def _async_flush_token(_: Event) -> None:
+        home_assistant_token_repository.async_flush()
+
+    entry.async_on_unload(
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, _async_flush_token)
+    )
 
     base_url = entry.data[CONF_HOST]
     mealie_api = Api(
@@ -30,8 +59,13 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     )
 
     mealie_coordinator = MealieDataUpdateCoordinator(
-        hass=hass, config_entry=entry, mealie_api=mealie_api
+        hass=hass,
+        config_entry=entry,
+        mealie_api=mealie_api,
+        snapshot_store=SnapshotStore(hass=hass, entry_id=entry.entry_id),
     )
+    if CONF_GROUP in entry.data:
+        _async_share_fetches(hass, entry, mealie_coordinator, entry.data[CONF_GROUP])
 
     hass.data.setdefault(DOMAIN, {})
     hass.data[DOMAIN][entry.entry_id] = {
@@ -39,13 +73,83 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         CONF_COORDINATOR: mealie_coordinator,
     }
 
-    await mealie_coordinator.async_config_entry_first_refresh()
+    entry.async_on_unload(entry.add_update_listener(async_update_options))
+    entry.async_on_unload(
+        async_track_time_change(
+            hass, mealie_coordinator.async_handle_midnight, hour=0, minute=0, second=0
+        )
+    )
+
+    entry.async_on_unload(async_register_webhook(hass, entry, mealie_coordinator))
+
+    if await mealie_coordinator.async_restore_snapshot():
+        hass.async_create_task(mealie_coordinator.async_refresh())
+    else:
+        await mealie_coordinator.async_config_entry_first_refresh()
 
     hass.config_entries.async_setup_platforms(entry, PLATFORMS)
 
+    if CONF_GROUP not in entry.data:
+        resolve_group = hass.async_create_task(
+            _async_resolve_group(hass, entry, mealie_coordinator)
+        )
+        entry.async_on_unload(resolve_group.cancel)
+
     return True
 
 
+@callback
+def _async_share_fetches(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    mealie_coordinator: MealieDataUpdateCoordinator,
+    group: str,
+) -> None:
+    shared_fetcher = async_get_shared_fetcher(
+        hass=hass, host=entry.data[CONF_HOST], group=group
+    )
+    mealie_coordinator.async_attach_shared_fetcher(shared_fetcher)
+    unsubscribe = shared_fetcher.async_subscribe(
+        entry.entry_id, mealie_coordinator.async_receive_shared
+    )
+
+    @callback
+    def _async_release_shared_fetcher() -> None:
+        unsubscribe()
+        async_release_shared_fetcher(hass, shared_fetcher)
+
+    entry.async_on_unload(_async_release_shared_fetcher)
+
+
+async def _async_resolve_group(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    mealie_coordinator: MealieDataUpdateCoordinator,
+) -> None:
+    """Looks up the group of entries created before it was stored.
+
+    Runs in the background after setup, so a slow Mealie does not delay the
+    start from the snapshot. Fetches are shared from then on.
+    """
+    try:
+        user = await mealie_coordinator.mealie_api.get_user(
+            deadline=Deadline.after(GROUP_LOOKUP_DEADLINE)
+        )
+    except (*FETCH_ERRORS, AuthenticationException) as error:
+        mealie_coordinator.logger.debug("Could not look up the group: %s", error)
+        return
+
+    hass.config_entries.async_update_entry(
+        entry, data={**entry.data, CONF_GROUP: user.group}
+    )
+    _async_share_fetches(hass, entry, mealie_coordinator, user.group)
+
+
+async def async_update_options(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    mealie_coordinator = hass.data[DOMAIN][entry.entry_id][CONF_COORDINATOR]
+    mealie_coordinator.async_update_schedules(entry.options)
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     unload_ok = await hass.config_entries.async_unload_platforms(
         entry=entry, platforms=PLATFORMS
@@ -55,3 +159,7 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         hass.data[DOMAIN].pop(entry.entry_id)
 
     return unload_ok
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    await SnapshotStore(hass=hass, entry_id=entry.entry_id).async_remove()
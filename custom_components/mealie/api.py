@@ -1,22 +1,47 @@
-from typing import Any, Callable, Mapping, Optional, TypeVar
+import asyncio
+from collections import deque
+from datetime import datetime, timezone
+from http import HTTPStatus
+import time
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    Mapping,
+    Optional,
+    TypeVar,
+)
 
 from custom_components.mealie.model.model import StatisticsResponse
 
+from .const import (
+    RECIPE_FETCH_CONCURRENCY,
+    TOKEN_REFRESH_HISTORY_SIZE,
+    TOKEN_REFRESH_MARGIN,
+)
 from .exception import (
     ApiException,
+    AuthenticationException,
     HttpException,
     InternalClientException,
+    NotFoundException,
     ParseException,
 )
 from .http_client import HttpClient
+from .metrics import MetricsRecorder
+from .model.compact import CompactRecipeResponse
 from .model.model import (
     MealPlanResponse,
-    RecipeResponse,
     Response,
     Status,
     TokenResponse,
     UserResponse,
 )
+from .recipe_cache import RecipeCache
+from .resilience import Deadline
+from .single_flight import SingleFlight
 from .token_repository import TokenRepository
 
 T = TypeVar("T")
@@ -28,104 +53,272 @@ class Api:
         http_client: HttpClient,
         base_url: str,
         token_repository: TokenRepository,
+        recipe_cache: Optional[RecipeCache] = None,
+        recipe_concurrency: int = RECIPE_FETCH_CONCURRENCY,
     ) -> None:
         self._http_client = http_client
         self._token_repository = token_repository
         self._base_url = base_url
         self._headers = {"accept": "application/json"}
+        self._token_refresh: Optional[asyncio.Future[TokenResponse]] = None
+        self._single_flight = SingleFlight()
+        self._recipe_cache = recipe_cache if recipe_cache is not None else RecipeCache()
+        self._recipe_semaphore = asyncio.Semaphore(recipe_concurrency)
+        self.token_refresh_history: Deque[Dict[str, Any]] = deque(
+            maxlen=TOKEN_REFRESH_HISTORY_SIZE
+        )
 
     def _url(self, suffix: str) -> str:
         return f"{self._base_url}{suffix}"
 
+    @staticmethod
+    def _authorization_header(access_token: str) -> Mapping[str, str]:
+        return {"Authorization": f"Bearer {access_token}"}
+
     async def _get_authorization_header(self) -> Mapping[str, str]:
         access_token = await self._token_repository.get_token()
-        return {"Authorization": f"Bearer {access_token}"}
+        return self._authorization_header(access_token)
+
+    @property
+    def metrics(self) -> MetricsRecorder:
+        return self._http_client.metrics
+
+    async def diagnostics(self) -> Dict[str, Any]:
+        response_cache = self._http_client.response_cache
+        token_expiry = await self._token_repository.get_token_expiry()
+        return {
+            "endpoints": self.metrics.snapshot(),
+            "token_expiry": token_expiry.isoformat() if token_expiry else None,
+            "token_refresh_history": list(self.token_refresh_history),
+            "token_repository": self._token_repository.stats(),
+            "single_flight": self._single_flight.stats(),
+            "response_cache": response_cache.stats() if response_cache else None,
+            "recipe_cache": self._recipe_cache.stats(),
+            "resilience": self._http_client.resilience_stats(),
+            "blocking": self._http_client.payload_executor.blocking_stats(),
+        }
+
+    async def _get(
+        self, endpoint: str, deadline: Optional[Deadline] = None, **path: str
+    ) -> Response:
+        url = self._url(endpoint.format(**path))
+        access_token = await self._token_repository.get_token()
+        response = await self._http_client.get(
+            url=url,
+            headers=self._headers | self._authorization_header(access_token),
+            endpoint=endpoint,
+            deadline=deadline,
+        )
+        if response.status_code != HTTPStatus.UNAUTHORIZED:
+            return response
 
-    def _parse(self, response: Response, parser: Callable[[Mapping[str, Any]], T]) -> T:
+        if await self._token_repository.get_token() == access_token:
+            await self.refresh_token(deadline=deadline)
+        access_token = await self._token_repository.get_token()
+        response = await self._http_client.get(
+            url=url,
+            headers=self._headers | self._authorization_header(access_token),
+            endpoint=endpoint,
+            deadline=deadline,
+        )
+        if response.status_code == HTTPStatus.UNAUTHORIZED:
+            raise AuthenticationException()
+        return response
+
+    async def _read(
+        self,
+        endpoint: str,
+        parser: Callable[[Mapping[str, Any]], T],
+        allow_empty: bool = False,
+        deadline: Optional[Deadline] = None,
+        **path: str,
+    ) -> Optional[T]:
+        async def read() -> Optional[T]:
+            response = await self._get(endpoint, deadline=deadline, **path)
+            if allow_empty and not response.data:
+                return None
+            return await self._parse(
+                response=response, parser=parser, endpoint=endpoint
+            )
+
+        url = self._url(endpoint.format(**path))
+        access_token = await self._token_repository.get_token()
+        return await self._single_flight.run(("GET", url, access_token), read)
+
+    async def _parse(
+        self,
+        response: Response,
+        parser: Callable[[Mapping[str, Any]], T],
+        endpoint: Optional[str] = None,
+    ) -> T:
+        if response.status_code == HTTPStatus.NOT_FOUND:
+            raise NotFoundException()
         if response.status == Status.FAILURE:
             raise ApiException()
+
+        operation = endpoint or parser.__qualname__
+        start = time.perf_counter()
         try:
-            return parser(response.data)
+            return await self._http_client.payload_executor.run(
+                f"parse {operation}", response.size, parser, response.data
+            )
         except KeyError as error:
             raise ParseException() from error
+        finally:
+            if endpoint is not None:
+                self.metrics.endpoint(endpoint).record_parse(
+                    time.perf_counter() - start
+                )
 
     async def get_token(
         self, username: str, password: str, long_token: bool = False
     ) -> TokenResponse:
-        url = (
-            self._url("/api/auth/token/long")
-            if long_token
-            else self._url("/api/auth/token")
-        )
+        endpoint = "/api/auth/token/long" if long_token else "/api/auth/token"
         headers = self._headers
 
         try:
             response = await self._http_client.post(
-                url=url,
+                url=self._url(endpoint),
                 headers=headers,
                 data={"username": username, "password": password},
+                endpoint=endpoint,
             )
 
         except HttpException as error:
             raise InternalClientException() from error
 
-        token_reponse = self._parse(response=response, parser=TokenResponse.from_json)
+        token_reponse = await self._parse(
+            response=response, parser=TokenResponse.from_json, endpoint=endpoint
+        )
 
         await self._token_repository.set_token(token=token_reponse.access_token)
         return token_reponse
 
-    async def get_refresh_token(self) -> TokenResponse:
-        url = self._url("/api/auth/refresh")
-        headers = self._headers | await self._get_authorization_header()
+    async def get_refresh_token(
+        self, deadline: Optional[Deadline] = None
+    ) -> TokenResponse:
+        endpoint = "/api/auth/refresh"
+        started = datetime.now(timezone.utc)
+        start = time.perf_counter()
+        succeeded = False
 
         try:
-            response = await self._http_client.get(url=url, headers=headers)
-        except HttpException as error:
-            raise InternalClientException() from error
+            headers = self._headers | await self._get_authorization_header()
+            try:
+                response = await self._http_client.get(
+                    url=self._url(endpoint),
+                    headers=headers,
+                    endpoint=endpoint,
+                    deadline=deadline,
+                )
+            except HttpException as error:
+                raise InternalClientException() from error
+            if response.status_code in (HTTPStatus.UNAUTHORIZED, HTTPStatus.FORBIDDEN):
+                raise AuthenticationException()
+            if response.status_code >= HTTPStatus.INTERNAL_SERVER_ERROR:
+                raise InternalClientException()
 
-        token_reponse = self._parse(response=response, parser=TokenResponse.from_json)
-        await self._token_repository.set_token(token=token_reponse.access_token)
-        return token_reponse
-
-    async def get_meal_plan_this_week(self) -> Optional[MealPlanResponse]:
-        url = self._url("/api/meal-plans/this-week")
-        headers = self._headers | await self._get_authorization_header()
-
-        meal_plan_response = await self._http_client.get(url=url, headers=headers)
+            token_reponse = await self._parse(
+                response=response, parser=TokenResponse.from_json, endpoint=endpoint
+            )
+            await self._token_repository.set_token(token=token_reponse.access_token)
+            succeeded = True
+            return token_reponse
+        finally:
+            self.token_refresh_history.append(
+                {
+                    "started": started.isoformat(),
+                    "duration": time.perf_counter() - start,
+                    "succeeded": succeeded,
+                }
+            )
 
-        if meal_plan_response.data:
-            return self._parse(
-                response=meal_plan_response, parser=MealPlanResponse.from_json
+    async def refresh_token(self, deadline: Optional[Deadline] = None) -> TokenResponse:
+        if self._token_refresh is None or self._token_refresh.done():
+            self._token_refresh = asyncio.ensure_future(
+                self.get_refresh_token(deadline=deadline)
             )
-        else:
-            return None
+        return await asyncio.shield(self._token_refresh)
 
-    async def get_user(self) -> UserResponse:
-        url = self._url("/api/users/self")
-        headers = self._headers | await self._get_authorization_header()
+    async def ensure_valid_token(self, deadline: Optional[Deadline] = None) -> None:
+        expiry = await self._token_repository.get_token_expiry()
+        if expiry is None:
+            return
+        if expiry - datetime.now(timezone.utc) <= TOKEN_REFRESH_MARGIN:
+            await self.refresh_token(deadline=deadline)
 
-        user_response = await self._http_client.get(url=url, headers=headers)
-        return self._parse(response=user_response, parser=UserResponse.from_json)
+    async def get_meal_plan_this_week(
+        self, deadline: Optional[Deadline] = None
+    ) -> Optional[MealPlanResponse]:
+        return await self._read(
+            "/api/meal-plans/this-week",
+            MealPlanResponse.from_json,
+            allow_empty=True,
+            deadline=deadline,
+        )
 
-    async def get_statistics(self) -> StatisticsResponse:
-        url = self._url("/api/debug/statistics")
-        headers = self._headers | await self._get_authorization_header()
+    async def get_user(self, deadline: Optional[Deadline] = None) -> UserResponse:
+        return await self._read(
+            "/api/users/self", UserResponse.from_json, deadline=deadline
+        )
 
-        statistics_response = await self._http_client.get(url=url, headers=headers)
-        return self._parse(
-            response=statistics_response, parser=StatisticsResponse.from_json
+    async def get_statistics(
+        self, deadline: Optional[Deadline] = None
+    ) -> StatisticsResponse:
+        return await self._read(
+            "/api/debug/statistics", StatisticsResponse.from_json, deadline=deadline
         )
 
-    async def get_recipe_today(self) -> Optional[RecipeResponse]:
-        url = self._url("/api/meal-plans/today")
+    async def get_recipe(
+        self, slug: str, deadline: Optional[Deadline] = None
+    ) -> CompactRecipeResponse:
+        return await self._read(
+            "/api/recipes/{slug}",
+            CompactRecipeResponse.from_json,
+            deadline=deadline,
+            slug=slug,
+        )
 
-        headers = self._headers | await self._get_authorization_header()
+    def invalidate_recipes(self) -> None:
+        self._recipe_cache.clear()
 
-        recipe_response = await self._http_client.get(url=url, headers=headers)
+    def use_recipe_cache(self, recipe_cache: RecipeCache) -> None:
+        self._recipe_cache = recipe_cache
 
-        if recipe_response.data:
-            return self._parse(
-                response=recipe_response, parser=RecipeResponse.from_json
-            )
-        else:
-            return None
+    async def get_recipes(
+        self, slugs: Iterable[str], deadline: Optional[Deadline] = None
+    ) -> Dict[str, CompactRecipeResponse]:
+        """Fetches several recipes, at most `recipe_concurrency` at a time.
+
+        Cached recipes are returned without a request, concurrent requests for
+        a slug share one download and refetched recipes whose `date_updated`
+        did not change keep their cached instance.
+        Recipes Mealie no longer has are left out.
+        """
+        requested = list(dict.fromkeys(slugs))
+        recipes: Dict[str, CompactRecipeResponse] = {}
+        for slug in requested:
+            cached = self._recipe_cache.get(slug)
+            if cached is not None:
+                recipes[slug] = cached
+
+        recipe_cache = self._recipe_cache
+
+        async def download(slug: str) -> Optional[CompactRecipeResponse]:
+            async with self._recipe_semaphore:
+                try:
+                    recipe = await self.get_recipe(slug, deadline=deadline)
+                except NotFoundException:
+                    return None
+            return recipe_cache.store(slug, recipe)
+
+        async def fetch(slug: str) -> Optional[CompactRecipeResponse]:
+            return await recipe_cache.in_flight.run(slug, lambda: download(slug))
+
+        missing = [slug for slug in requested if slug not in recipes]
+        for slug, recipe in zip(
+            missing, await asyncio.gather(*(fetch(slug) for slug in missing))
+        ):
+            if recipe is not None:
+                recipes[slug] = recipe
+        return {slug: recipes[slug] for slug in requested if slug in recipes}
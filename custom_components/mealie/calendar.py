@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+from datetime import date, datetime, time, timedelta
+from typing import List, Optional, Tuple
+
+from homeassistant.components.calendar import CalendarEntity, CalendarEvent
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from homeassistant.util import dt as dt_util
+
+from custom_components.mealie.model.model import Meal
+
+from .const import CONF_COORDINATOR, DOMAIN, SENSOR_MEAL_PLAN_KEY
+from .coordinator import MealieDataUpdateCoordinator
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    entry_config: ConfigEntry,
+    add_entitities_callback: AddEntitiesCallback,
+) -> None:
+    mealie_coordinator = hass.data[DOMAIN][entry_config.entry_id][CONF_COORDINATOR]
+
+    add_entitities_callback(
+        [MealieMealPlanCalendar(mealie_coordinator=mealie_coordinator)]
+    )
+
+
+def _meal_events(day: date, meals: Tuple[Meal, ...]) -> List[CalendarEvent]:
+    return [
+        CalendarEvent(
+            start=day,
+            end=day + timedelta(days=1),
+            summary=meal.name or meal.slug or "",
+            description=meal.description,
+        )
+        for meal in meals
+    ]
+
+
+class MealieMealPlanCalendar(CalendarEntity, CoordinatorEntity):
+    """All day events for the planned meals.
+
+    Range queries are answered from the coordinator's meal plan index, so the
+    calendar never hits Mealie itself.
+    """
+
+    _attr_name = "Mealie meal plan"
+    _attr_icon = "mdi:food"
+
+    def __init__(self, mealie_coordinator: MealieDataUpdateCoordinator) -> None:
+        super().__init__(coordinator=mealie_coordinator, context=SENSOR_MEAL_PLAN_KEY)
+        self._attr_unique_id = (
+            f"{mealie_coordinator.config_entry.entry_id}_{SENSOR_MEAL_PLAN_KEY}"
+        )
+
+    @property
+    def available(self) -> bool:
+        return self.coordinator.is_available(SENSOR_MEAL_PLAN_KEY)
+
+    @property
+    def event(self) -> Optional[CalendarEvent]:
+        next_day = self.coordinator.meal_plan_index.next_day_with_meals(
+            dt_util.now().date()
+        )
+        return _meal_events(*next_day)[0] if next_day else None
+
+    async def async_get_events(
+        self, hass: HomeAssistant, start_date: datetime, end_date: datetime
+    ) -> List[CalendarEvent]:
+        end = dt_util.as_local(end_date)
+        end_day = end.date() if end.time() == time.min else end.date() + timedelta(1)
+
+        return [
+            event
+            for day, meals in self.coordinator.meal_plan_index.meals_between(
+                dt_util.as_local(start_date).date(), end_day
+            )
+            for event in _meal_events(day, meals)
+        ]
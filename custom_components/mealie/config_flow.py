@@ -1,20 +1,34 @@
 import logging
 from typing import Tuple
 
+from homeassistant import config_entries
+from homeassistant.components import webhook
 from homeassistant.const import (
     CONF_ACCESS_TOKEN,
     CONF_HOST,
     CONF_PASSWORD,
     CONF_USERNAME,
+    CONF_WEBHOOK_ID,
 )
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.exceptions import IntegrationError
 from homeassistant.helpers import config_entry_oauth2_flow
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 import voluptuous as vol
 
 from .api import Api
-from .const import DOMAIN
+from .const import (
+    CONF_GROUP,
+    CONF_MEAL_PLAN_INTERVAL,
+    CONF_STALENESS_BOUND,
+    CONF_STATISTICS_INTERVAL,
+    CONF_TODAY_RECIPE_INTERVAL,
+    DEFAULT_MEAL_PLAN_INTERVAL,
+    DEFAULT_STALENESS_BOUND,
+    DEFAULT_STATISTICS_INTERVAL,
+    DEFAULT_TODAY_RECIPE_INTERVAL,
+    DOMAIN,
+)
 from .http_client import HttpClient
 from .model.model import TokenResponse, UserResponse
 from .token_repository import TokenRepository
@@ -51,6 +65,13 @@ class MealieConfigFlow(
 
     DOMAIN = DOMAIN
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        config_entry: config_entries.ConfigEntry,
+    ) -> config_entries.OptionsFlow:
+        return MealieOptionsFlow(config_entry)
+
     @property
     def logger(self) -> logging.Logger:
         """Return logger."""
@@ -81,6 +102,10 @@ class MealieConfigFlow(
                     CONF_USERNAME: username,
                     CONF_ACCESS_TOKEN: token_response.access_token,
                     CONF_HOST: host,
+                    CONF_GROUP: user_response.group,
+                    CONF_WEBHOOK_ID: config_entry.data[CONF_WEBHOOK_ID]
+                    if config_entry and CONF_WEBHOOK_ID in config_entry.data
+                    else webhook.async_generate_id(),
                 }
 
                 if config_entry:
@@ -114,3 +139,36 @@ class MealieConfigFlow(
         self.username = user_input.get(CONF_USERNAME)
 
         return await self.async_step_user()
+
+
+class MealieOptionsFlow(config_entries.OptionsFlow):
+    def __init__(self, config_entry: config_entries.ConfigEntry) -> None:
+        self.config_entry = config_entry
+
+    def _interval(self, key: str, default: int) -> vol.Required:
+        return vol.Required(key, default=self.config_entry.options.get(key, default))
+
+    async def async_step_init(self, user_input=None):
+        if user_input is not None:
+            return self.async_create_entry(title="", data=user_input)
+
+        interval = vol.All(vol.Coerce(int), vol.Range(min=1))
+        return self.async_show_form(
+            step_id="init",
+            data_schema=vol.Schema(
+                {
+                    self._interval(
+                        CONF_STATISTICS_INTERVAL, DEFAULT_STATISTICS_INTERVAL
+                    ): interval,
+                    self._interval(
+                        CONF_TODAY_RECIPE_INTERVAL, DEFAULT_TODAY_RECIPE_INTERVAL
+                    ): interval,
+                    self._interval(
+                        CONF_MEAL_PLAN_INTERVAL, DEFAULT_MEAL_PLAN_INTERVAL
+                    ): interval,
+                    self._interval(
+                        CONF_STALENESS_BOUND, DEFAULT_STALENESS_BOUND
+                    ): interval,
+                }
+            ),
+        )
@@ -1,11 +1,74 @@
 from dataclasses import dataclass
-from typing import Final, Tuple
+from datetime import timedelta
+from typing import Final, Mapping, Optional, Tuple
 
 from homeassistant.components.sensor import SensorEntityDescription
+from homeassistant.helpers.entity import EntityCategory
 
 DOMAIN: Final[str] = "mealie"
 CONF_API: Final[str] = "api"
 CONF_COORDINATOR: Final[str] = "coordinator"
+CONF_GROUP: Final[str] = "group"
+CONF_SHARED_FETCHERS: Final[str] = "shared_fetchers"
+
+MAX_CONCURRENT_REQUESTS: Final[int] = 3
+
+TOKEN_REFRESH_MARGIN: Final[timedelta] = timedelta(minutes=5)
+TOKEN_WRITE_DELAY: Final[float] = 30.0
+
+CONF_STATISTICS_INTERVAL: Final[str] = "statistics_interval"
+CONF_TODAY_RECIPE_INTERVAL: Final[str] = "today_recipe_interval"
+CONF_MEAL_PLAN_INTERVAL: Final[str] = "meal_plan_interval"
+CONF_STALENESS_BOUND: Final[str] = "staleness_bound"
+
+DEFAULT_STATISTICS_INTERVAL: Final[int] = 360
+DEFAULT_TODAY_RECIPE_INTERVAL: Final[int] = 60
+DEFAULT_MEAL_PLAN_INTERVAL: Final[int] = 30
+DEFAULT_STALENESS_BOUND: Final[int] = 720
+PUSH_SAFETY_NET_INTERVAL: Final[int] = 360
+FAILED_REFRESH_RETRY_INTERVAL: Final[timedelta] = timedelta(minutes=5)
+STALE_RETRY_BASE_INTERVAL: Final[timedelta] = timedelta(minutes=1)
+STALE_RETRY_MAX_INTERVAL: Final[timedelta] = timedelta(minutes=30)
+
+SHARED_RESULT_MAX_AGE: Final[float] = 60.0
+
+PAYLOAD_EXECUTOR_THRESHOLD: Final[int] = 64 * 1024
+
+SNAPSHOT_STORAGE_VERSION: Final[int] = 1
+SNAPSHOT_SAVE_DELAY: Final[float] = 10.0
+
+REFRESH_HISTORY_SIZE: Final[int] = 10
+TOKEN_REFRESH_HISTORY_SIZE: Final[int] = 10
+
+LATENCY_BUCKETS: Final[Tuple[float, ...]] = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+DEFAULT_REQUEST_TIMEOUT: Final[float] = 10.0
+REQUEST_TIMEOUTS: Final[Mapping[str, float]] = {
+    "/api/auth/token": 10.0,
+    "/api/auth/token/long": 10.0,
+    "/api/auth/refresh": 10.0,
+    "/api/users/self": 10.0,
+    "/api/debug/statistics": 10.0,
+    "/api/meal-plans/this-week": 15.0,
+    "/api/recipes/{slug}": 20.0,
+}
+REFRESH_CYCLE_DEADLINE: Final[float] = 45.0
+GROUP_LOOKUP_DEADLINE: Final[float] = 15.0
+
+RETRY_ATTEMPTS: Final[int] = 3
+RETRY_BASE_DELAY: Final[float] = 0.5
+RETRY_MAX_DELAY: Final[float] = 8.0
+RETRY_JITTER: Final[float] = 0.5
+CIRCUIT_BREAKER_FAILURE_THRESHOLD: Final[int] = 5
+CIRCUIT_BREAKER_RESET_TIMEOUT: Final[float] = 30.0
+
+RESPONSE_CACHE_MAX_ENTRIES: Final[int] = 32
+RESPONSE_CACHE_MAX_BYTES: Final[int] = 4 * 1024 * 1024
+UNCACHED_ENDPOINT_PREFIX: Final[str] = "/api/auth/"
+
+RECIPE_CACHE_MAX_ENTRIES: Final[int] = 64
+RECIPE_CACHE_TTL: Final[float] = 24 * 3600.0
+RECIPE_FETCH_CONCURRENCY: Final[int] = 4
 
 SENSOR_NO_RECIPES_KEY: Final[str] = "total_recipes"
 SENSOR_NO_RECIPES_NAME: Final[str] = "Total number of recipes"
@@ -23,10 +86,13 @@ SENSOR_TODAY_RECIPE_NAME: Final[str] = "Today's recipe"
 SENSOR_MEAL_PLAN_KEY: Final[str] = "meal_plan"
 SENSOR_MEAL_PLAN_NAME: Final[str] = "This week's meal plan"
 
+SENSOR_SHOPPING_LIST_KEY: Final[str] = "shopping_list"
+SENSOR_SHOPPING_LIST_NAME: Final[str] = "This week's shopping list"
+
 
 @dataclass
 class MealieSensorEnitityDescription(SensorEntityDescription):
-    ...
+    endpoint: Optional[str] = None
 
 
 SENSOR_TYPES: Tuple[MealieSensorEnitityDescription, ...] = (
@@ -61,3 +127,28 @@ meal_plan_sensor_entity_description = MealieSensorEnitityDescription(
     name=SENSOR_MEAL_PLAN_NAME,
     icon="mdi:food",
 )
+
+shopping_list_sensor_entity_description = MealieSensorEnitityDescription(
+    key=SENSOR_SHOPPING_LIST_KEY,
+    name=SENSOR_SHOPPING_LIST_NAME,
+    native_unit_of_measurement="items",
+    icon="mdi:cart",
+)
+
+ENDPOINT_METRICS_SENSOR_TYPES: Tuple[MealieSensorEnitityDescription, ...] = tuple(
+    MealieSensorEnitityDescription(
+        key=f"endpoint_latency_{key}",
+        name=f"Mealie {name} latency",
+        endpoint=endpoint,
+        native_unit_of_measurement="ms",
+        icon="mdi:timer-outline",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+    )
+    for key, name, endpoint in (
+        ("statistics", "statistics", "/api/debug/statistics"),
+        ("meal_plan", "meal plan", "/api/meal-plans/this-week"),
+        ("recipe", "recipe", "/api/recipes/{slug}"),
+        ("token_refresh", "token refresh", "/api/auth/refresh"),
+    )
+)
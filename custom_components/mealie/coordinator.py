@@ -1,60 +1,535 @@
-from datetime import timedelta
+import asyncio
+from collections import deque
+from datetime import datetime, timedelta
+from functools import partial
 import logging
-from typing import Any
+import time
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    Mapping,
+    Optional,
+    Set,
+    Tuple,
+    TypeVar,
+)
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.exceptions import ConfigEntryAuthFailed
 from homeassistant.helpers.update_coordinator import (
     DataUpdateCoordinator,
     UpdateFailed,
 )
+from homeassistant.util import dt as dt_util
 
-from custom_components.mealie.exception import ApiException, ParseException
+from custom_components.mealie.exception import (
+    ApiException,
+    AuthenticationException,
+    HttpException,
+    InternalClientException,
+    ParseException,
+)
 
 from .api import Api
 from .const import (
+    CONF_MEAL_PLAN_INTERVAL,
+    CONF_STALENESS_BOUND,
+    CONF_STATISTICS_INTERVAL,
+    CONF_TODAY_RECIPE_INTERVAL,
+    DEFAULT_MEAL_PLAN_INTERVAL,
+    DEFAULT_STALENESS_BOUND,
+    DEFAULT_STATISTICS_INTERVAL,
+    DEFAULT_TODAY_RECIPE_INTERVAL,
+    FAILED_REFRESH_RETRY_INTERVAL,
+    MAX_CONCURRENT_REQUESTS,
+    PUSH_SAFETY_NET_INTERVAL,
+    REFRESH_CYCLE_DEADLINE,
+    REFRESH_HISTORY_SIZE,
     SENSOR_MEAL_PLAN_KEY,
     SENSOR_NO_RECIPES_KEY,
     SENSOR_NO_UNCATEGORIZED_RECIPES_KEY,
     SENSOR_NO_UNTAGGED_RECIPES_KEY,
+    SENSOR_SHOPPING_LIST_KEY,
     SENSOR_TODAY_RECIPE_KEY,
 )
+from .meal_plan_index import MealPlanIndex
+from .resilience import Deadline
+from .scheduler import RefreshSchedule, RefreshScheduler
+from .shared_fetcher import SharedFetcher
+from .shopping_list import ShoppingList, planned_servings
+from .snapshot import SnapshotStore
+
+T = TypeVar("T")
+
+FETCH_ERRORS = (ApiException, HttpException, InternalClientException, ParseException)
+
+DATA_KEYS: Mapping[str, Tuple[str, ...]] = {
+    SENSOR_NO_RECIPES_KEY: (
+        SENSOR_NO_RECIPES_KEY,
+        SENSOR_NO_UNCATEGORIZED_RECIPES_KEY,
+        SENSOR_NO_UNTAGGED_RECIPES_KEY,
+    ),
+    SENSOR_MEAL_PLAN_KEY: (SENSOR_MEAL_PLAN_KEY,),
+    SENSOR_SHOPPING_LIST_KEY: (SENSOR_SHOPPING_LIST_KEY,),
+    SENSOR_TODAY_RECIPE_KEY: (SENSOR_TODAY_RECIPE_KEY,),
+}
+
+
+def staleness_bound(options: Mapping[str, Any]) -> timedelta:
+    return timedelta(minutes=options.get(CONF_STALENESS_BOUND, DEFAULT_STALENESS_BOUND))
+
+
+def refresh_schedules(
+    options: Mapping[str, Any], push: bool = False
+) -> Dict[str, RefreshSchedule]:
+    """Builds the refresh schedules for the configured intervals.
+
+    Once Mealie pushes changes, the fetched keys only need a slow safety net
+    poll in case a notification is missed.
+    """
+    safety_net = PUSH_SAFETY_NET_INTERVAL if push else 0
+    return {
+        SENSOR_NO_RECIPES_KEY: RefreshSchedule(
+            interval=timedelta(
+                minutes=max(
+                    options.get(CONF_STATISTICS_INTERVAL, DEFAULT_STATISTICS_INTERVAL),
+                    safety_net,
+                )
+            ),
+        ),
+        SENSOR_TODAY_RECIPE_KEY: RefreshSchedule(
+            interval=timedelta(
+                minutes=options.get(
+                    CONF_TODAY_RECIPE_INTERVAL, DEFAULT_TODAY_RECIPE_INTERVAL
+                )
+            ),
+            aligned=True,
+        ),
+        SENSOR_MEAL_PLAN_KEY: RefreshSchedule(
+            interval=timedelta(
+                minutes=max(
+                    options.get(CONF_MEAL_PLAN_INTERVAL, DEFAULT_MEAL_PLAN_INTERVAL),
+                    safety_net,
+                )
+            ),
+            aligned=True,
+        ),
+    }
 
 
 class MealieDataUpdateCoordinator(DataUpdateCoordinator):
     def __init__(
-        self, hass: HomeAssistant, config_entry: ConfigEntry, mealie_api: Api
+        self,
+        hass: HomeAssistant,
+        config_entry: ConfigEntry,
+        mealie_api: Api,
+        shared_fetcher: Optional[SharedFetcher] = None,
+        cycle_deadline: float = REFRESH_CYCLE_DEADLINE,
+        snapshot_store: Optional[SnapshotStore] = None,
     ) -> None:
         self._mealie_api = mealie_api
+        self._snapshot_store = snapshot_store
+        self._shared_fetcher: Optional[SharedFetcher] = None
+        self._cycle_deadline = cycle_deadline
         self._entry = config_entry
+        self._request_semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+        self._scheduler = RefreshScheduler(refresh_schedules(config_entry.options))
+        self._fetchers: Dict[
+            str, Callable[[Optional[Deadline]], Awaitable[Mapping[str, Any]]]
+        ] = {
+            SENSOR_NO_RECIPES_KEY: self._async_fetch_statistics,
+            SENSOR_MEAL_PLAN_KEY: self._async_fetch_meal_plan,
+        }
+        self._meal_plan_index = MealPlanIndex()
+        self._shopping_list = ShoppingList()
+        self._staleness_bound = staleness_bound(config_entry.options)
+        self._push_active = False
+        self._recipes_invalidated = False
+        self.pushes = 0
+        self._refreshed_at: Dict[str, datetime] = {}
+        self._failed_keys: Set[str] = set()
+        self._versions: Dict[str, int] = {}
+        self._notified_data: Dict[str, Any] = {}
+        self._notified_available: Set[str] = set()
+        self._notified_requests: Dict[str, int] = {}
+        self._notified_success = True
+        self.endpoint_timings: Dict[str, float] = {}
+        self.refresh_history: Deque[Dict[str, Any]] = deque(maxlen=REFRESH_HISTORY_SIZE)
+        if shared_fetcher is not None:
+            self.async_attach_shared_fetcher(shared_fetcher)
         logger = logging.getLogger(__name__)
         super().__init__(
             hass=hass,
             logger=logger,
             name="MealieDataUpdateCoordinator",
-            update_interval=timedelta(minutes=30),
+            update_interval=timedelta(minutes=DEFAULT_MEAL_PLAN_INTERVAL),
+        )
+
+    @callback
+    def async_update_schedules(self, options: Mapping[str, Any]) -> None:
+        self._staleness_bound = staleness_bound(options)
+        if self._scheduler.update_schedules(
+            refresh_schedules(options, push=self._push_active), dt_util.now()
+        ):
+            self.update_interval = self._scheduler.time_until_next_run(dt_util.now())
+            self.hass.async_create_task(self.async_request_refresh())
+
+    @callback
+    def async_handle_push(self, keys: Iterable[str]) -> None:
+        """Refreshes the keys Mealie notified a change for.
+
+        The first notification switches polling to the safety net interval.
+        """
+        now = dt_util.now()
+        self.pushes += 1
+        if not self._push_active:
+            self._push_active = True
+            self._scheduler.update_schedules(
+                refresh_schedules(self._entry.options, push=True), now
+            )
+
+        keys = set(keys)
+        if self._shared_fetcher is not None:
+            for key in keys:
+                self._shared_fetcher.invalidate(key)
+        self._scheduler.mark_due(keys, now)
+        self.update_interval = self._scheduler.time_until_next_run(now)
+        self.hass.async_create_task(self.async_request_refresh())
+
+    def _mark_fresh(self, keys: Iterable[str]) -> None:
+        now = dt_util.utcnow()
+        for key in keys:
+            self._refreshed_at[key] = now
+
+    @callback
+    def _async_save_snapshot(self) -> None:
+        if self._snapshot_store is not None:
+            self._snapshot_store.async_schedule_save(
+                lambda: self.data or {}, lambda: self._refreshed_at
+            )
+
+    async def async_restore_snapshot(self) -> bool:
+        if self._snapshot_store is None:
+            return False
+
+        snapshot = await self._snapshot_store.async_load()
+        if snapshot is None:
+            return False
+
+        data, refreshed_at = snapshot
+        self._refreshed_at.update(refreshed_at)
+        if data.get(SENSOR_MEAL_PLAN_KEY) is not None:
+            self._meal_plan_index.update(data[SENSOR_MEAL_PLAN_KEY])
+        for key in self._scheduler.keys & refreshed_at.keys():
+            self._scheduler.mark_refreshed({key}, dt_util.as_local(refreshed_at[key]))
+        self.data = data
+        return True
+
+    @property
+    def meal_plan_index(self) -> MealPlanIndex:
+        return self._meal_plan_index
+
+    def data_version(self, key: str) -> int:
+        return self._versions.get(key, 0)
+
+    def _changed_keys(self) -> Set[str]:
+        data: Mapping[str, Any] = self.data or {}
+        changed = {
+            key
+            for key in data.keys() | self._notified_data.keys()
+            if data.get(key) is not self._notified_data.get(key)
+            and data.get(key) != self._notified_data.get(key)
+        }
+        available = {key for key in self._refreshed_at if self.is_available(key)}
+        changed |= available ^ self._notified_available
+        changed |= self._failed_keys
+
+        requests = self._mealie_api.metrics.request_counts()
+        changed |= {
+            endpoint
+            for endpoint, count in requests.items()
+            if self._notified_requests.get(endpoint) != count
+        }
+        self._notified_requests = requests
+
+        self._notified_data = dict(data)
+        self._notified_available = available
+        self._failed_keys = set()
+        return changed
+
+    @callback
+    def async_update_listeners(self) -> None:
+        changed = self._changed_keys()
+        for key in changed:
+            self._versions[key] = self.data_version(key) + 1
+
+        notify_all = self.last_update_success != self._notified_success
+        self._notified_success = self.last_update_success
+        for update_callback, context in list(self._listeners.values()):
+            if notify_all or context is None or context in changed:
+                update_callback()
+
+    def data_age(self, key: str) -> Optional[timedelta]:
+        refreshed_at = self._refreshed_at.get(key)
+        return dt_util.utcnow() - refreshed_at if refreshed_at else None
+
+    def data_ages(self) -> Dict[str, float]:
+        now = dt_util.utcnow()
+        return {
+            key: (now - refreshed_at).total_seconds()
+            for key, refreshed_at in self._refreshed_at.items()
+        }
+
+    def is_available(self, key: str) -> bool:
+        age = self.data_age(key)
+        return age is not None and age <= self._staleness_bound
+
+    async def _timed(self, endpoint: str, request: Awaitable[T]) -> T:
+        async with self._request_semaphore:
+            start = time.perf_counter()
+            try:
+                return await request
+            finally:
+                self.endpoint_timings[endpoint] = time.perf_counter() - start
+
+    @property
+    def shared_fetcher(self) -> Optional[SharedFetcher]:
+        return self._shared_fetcher
+
+    @callback
+    def async_attach_shared_fetcher(self, shared_fetcher: SharedFetcher) -> None:
+        self._shared_fetcher = shared_fetcher
+        self._mealie_api.use_recipe_cache(shared_fetcher.recipe_cache)
+
+    async def _async_fetch(
+        self, key: str, deadline: Optional[Deadline] = None
+    ) -> Mapping[str, Any]:
+        if self._shared_fetcher is None:
+            return await self._fetchers[key](deadline)
+        return await self._shared_fetcher.fetch(
+            self._entry.entry_id, key, partial(self._fetchers[key], deadline)
+        )
+
+    @callback
+    def async_receive_shared(self, key: str, result: Mapping[str, Any]) -> None:
+        self.hass.async_create_task(self._async_receive_shared(key, result))
+
+    async def _async_receive_shared(self, key: str, result: Mapping[str, Any]) -> None:
+        if self.data is None:
+            return
+
+        data: Dict[str, Any] = {**self.data, **result}
+        if key == SENSOR_MEAL_PLAN_KEY:
+            self._meal_plan_index.update(data[SENSOR_MEAL_PLAN_KEY])
+            try:
+                shopping_list = await self._async_resolve_shopping_list(data)
+                recipe_today = await self._async_resolve_recipe_today(data)
+            except (*FETCH_ERRORS, AuthenticationException) as error:
+                self.logger.error(error)
+                return
+            data.update(shopping_list)
+            data.update(recipe_today)
+            self._mark_fresh(shopping_list)
+            self._mark_fresh(recipe_today)
+
+        self._mark_fresh(result)
+        self._scheduler.mark_refreshed({key}, dt_util.now())
+        self.update_interval = self._scheduler.time_until_next_run(dt_util.now())
+        self.async_set_updated_data(data)
+        self._async_save_snapshot()
+
+    async def _async_fetch_statistics(
+        self, deadline: Optional[Deadline] = None
+    ) -> Mapping[str, Any]:
+        statistics_response = await self._mealie_api.get_statistics(deadline=deadline)
+        return {
+            SENSOR_NO_RECIPES_KEY: statistics_response.total_recipes,
+            SENSOR_NO_UNCATEGORIZED_RECIPES_KEY: statistics_response.uncategorized_recipes,
+            SENSOR_NO_UNTAGGED_RECIPES_KEY: statistics_response.untagged_recipes,
+        }
+
+    @callback
+    def async_invalidate_recipes(self) -> None:
+        """Makes the next refresh download today's recipe again."""
+        self._recipes_invalidated = True
+        self._mealie_api.invalidate_recipes()
+
+    async def _async_resolve_recipe_today(
+        self, data: Mapping[str, Any], deadline: Optional[Deadline] = None
+    ) -> Mapping[str, Any]:
+        slug = self._meal_plan_index.recipe_slug_on(dt_util.now().date())
+        recipe = data.get(SENSOR_TODAY_RECIPE_KEY)
+
+        if slug is None:
+            return {SENSOR_TODAY_RECIPE_KEY: None}
+        if recipe is not None and recipe.slug == slug and not self._recipes_invalidated:
+            return {SENSOR_TODAY_RECIPE_KEY: recipe}
+        recipes = await self._mealie_api.get_recipes([slug], deadline=deadline)
+        self._recipes_invalidated = False
+        return {SENSOR_TODAY_RECIPE_KEY: recipes.get(slug)}
+
+    async def _async_resolve_shopping_list(
+        self, data: Mapping[str, Any], deadline: Optional[Deadline] = None
+    ) -> Mapping[str, Any]:
+        servings = planned_servings(data.get(SENSOR_MEAL_PLAN_KEY))
+        recipes = await self._mealie_api.get_recipes(servings, deadline=deadline)
+        self._shopping_list.update(
+            {slug: count for slug, count in servings.items() if slug in recipes},
+            recipes,
         )
+        return {SENSOR_SHOPPING_LIST_KEY: self._shopping_list.items}
+
+    def _shopping_list_outdated(self) -> bool:
+        """Whether the shopping list failed to follow the last meal plan."""
+        meal_plan_at = self._refreshed_at.get(SENSOR_MEAL_PLAN_KEY)
+        shopping_list_at = self._refreshed_at.get(SENSOR_SHOPPING_LIST_KEY)
+        return meal_plan_at is not None and (
+            shopping_list_at is None or shopping_list_at < meal_plan_at
+        )
+
+    def shopping_list_stats(self) -> Dict[str, int]:
+        return self._shopping_list.stats()
+
+    async def async_handle_midnight(self, now: datetime) -> None:
+        if self.data is None:
+            return
+
+        try:
+            recipe_today = await self._async_resolve_recipe_today(self.data)
+        except (*FETCH_ERRORS, AuthenticationException) as error:
+            self.logger.error(error)
+            return
+        self._mark_fresh(recipe_today)
+
+        if recipe_today[SENSOR_TODAY_RECIPE_KEY] is self.data.get(
+            SENSOR_TODAY_RECIPE_KEY
+        ):
+            return
+
+        self.update_interval = self._scheduler.time_until_next_run(dt_util.now())
+        self.async_set_updated_data({**self.data, **recipe_today})
+        self._async_save_snapshot()
+
+    async def _async_fetch_meal_plan(
+        self, deadline: Optional[Deadline] = None
+    ) -> Mapping[str, Any]:
+        return {
+            SENSOR_MEAL_PLAN_KEY: await self._mealie_api.get_meal_plan_this_week(
+                deadline=deadline
+            )
+        }
+
+    @property
+    def mealie_api(self) -> Api:
+        return self._mealie_api
 
     async def _async_update_data(self) -> Any:
+        cycle: Dict[str, Any] = {"started": dt_util.utcnow().isoformat()}
+        start = time.perf_counter()
+        bytes_before = self._mealie_api.metrics.total_bytes()
+        self.endpoint_timings = {}
+
         try:
-            await self._mealie_api.get_refresh_token()
-        except (ApiException, ParseException) as error:
+            data = await self._async_refresh_due_keys(cycle)
+            self._async_save_snapshot()
+            return data
+        except AuthenticationException as error:
+            cycle["error"] = type(error).__name__
             raise ConfigEntryAuthFailed() from error
+        except (ConfigEntryAuthFailed, UpdateFailed) as error:
+            cycle["error"] = type(error.__cause__ or error).__name__
+            raise
+        finally:
+            cycle["duration"] = time.perf_counter() - start
+            cycle["timings"] = dict(self.endpoint_timings)
+            cycle["bytes"] = self._mealie_api.metrics.total_bytes() - bytes_before
+            self.refresh_history.append(cycle)
 
+    async def _async_refresh_due_keys(self, cycle: Dict[str, Any]) -> Any:
+        deadline = Deadline.after(self._cycle_deadline)
         try:
-            statistics_response = await self._mealie_api.get_statistics()
-            next_recipe_response = await self._mealie_api.get_recipe_today()
-            meal_plan_response = await self._mealie_api.get_meal_plan_this_week()
-
-            return {
-                SENSOR_MEAL_PLAN_KEY: meal_plan_response,
-                SENSOR_TODAY_RECIPE_KEY: next_recipe_response,
-                SENSOR_NO_RECIPES_KEY: statistics_response.total_recipes,
-                SENSOR_NO_UNCATEGORIZED_RECIPES_KEY: statistics_response.uncategorized_recipes,
-                SENSOR_NO_UNTAGGED_RECIPES_KEY: statistics_response.untagged_recipes,
+            await self._timed(
+                "refresh_token", self._mealie_api.ensure_valid_token(deadline=deadline)
+            )
+        except InternalClientException as error:
+            self.update_interval = FAILED_REFRESH_RETRY_INTERVAL
+            raise UpdateFailed() from error
+        except (ApiException, ParseException) as error:
+            raise ConfigEntryAuthFailed() from error
+
+        now = dt_util.now()
+        due_keys = self._scheduler.due_keys(now) if self.data else self._scheduler.keys
+        cycle["keys"] = sorted(due_keys)
+        fetched_keys = [key for key in due_keys if key in self._fetchers]
+        failed: Dict[str, str] = {}
+
+        results = await asyncio.gather(
+            *(
+                self._timed(key, self._async_fetch(key, deadline))
+                for key in fetched_keys
+            ),
+            return_exceptions=True,
+        )
+
+        data: Dict[str, Any] = dict(self.data or {})
+        for key, result in zip(fetched_keys, results):
+            if isinstance(result, FETCH_ERRORS):
+                failed[key] = type(result).__name__
+            elif isinstance(result, BaseException):
+                raise result
+            else:
+                data.update(result)
+                self._mark_fresh(result)
+
+        refreshed_keys = due_keys - failed.keys()
+        if SENSOR_MEAL_PLAN_KEY in refreshed_keys:
+            self._meal_plan_index.update(data[SENSOR_MEAL_PLAN_KEY])
+        if SENSOR_MEAL_PLAN_KEY in data and (
+            SENSOR_MEAL_PLAN_KEY in refreshed_keys or self._shopping_list_outdated()
+        ):
+            try:
+                shopping_list = await self._timed(
+                    SENSOR_SHOPPING_LIST_KEY,
+                    self._async_resolve_shopping_list(data, deadline),
+                )
+            except FETCH_ERRORS as error:
+                failed[SENSOR_SHOPPING_LIST_KEY] = type(error).__name__
+            else:
+                data.update(shopping_list)
+                self._mark_fresh(shopping_list)
+        if refreshed_keys & {SENSOR_MEAL_PLAN_KEY, SENSOR_TODAY_RECIPE_KEY}:
+            try:
+                recipe_today = await self._timed(
+                    SENSOR_TODAY_RECIPE_KEY,
+                    self._async_resolve_recipe_today(data, deadline),
+                )
+            except FETCH_ERRORS as error:
+                failed[SENSOR_TODAY_RECIPE_KEY] = type(error).__name__
+            else:
+                data.update(recipe_today)
+                self._mark_fresh(recipe_today)
+
+        if failed:
+            cycle["failed"] = dict(sorted(failed.items()))
+            self._failed_keys = {
+                data_key for key in failed for data_key in DATA_KEYS[key]
             }
+            if self.data is None and failed.keys() >= set(fetched_keys):
+                self.update_interval = FAILED_REFRESH_RETRY_INTERVAL
+                raise UpdateFailed(f"Failed to refresh {', '.join(sorted(failed))}")
 
-        except (ApiException, ParseException) as error:
-            self.logger.error(error)
-            raise UpdateFailed() from error
+            self.logger.warning(
+                "Serving stale data for %s: %s",
+                ", ".join(sorted(failed)),
+                ", ".join(sorted(set(failed.values()))),
+            )
+            self._scheduler.mark_failed(failed.keys() & self._scheduler.keys, now)
+
+        self._scheduler.mark_refreshed(due_keys - failed.keys(), now)
+        self.update_interval = self._scheduler.time_until_next_run(dt_util.now())
+        return data
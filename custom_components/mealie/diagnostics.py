@@ -0,0 +1,75 @@
+from dataclasses import asdict
+from typing import Any, Dict
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import (
+    CONF_ACCESS_TOKEN,
+    CONF_PASSWORD,
+    CONF_USERNAME,
+    CONF_WEBHOOK_ID,
+)
+from homeassistant.core import HomeAssistant
+
+from .const import CONF_COORDINATOR, DOMAIN
+from .coordinator import MealieDataUpdateCoordinator
+from .exception import (
+    ApiException,
+    AuthenticationException,
+    HttpException,
+    InternalClientException,
+    NoTokenException,
+    ParseException,
+)
+
+TO_REDACT = {
+    CONF_ACCESS_TOKEN,
+    CONF_PASSWORD,
+    CONF_USERNAME,
+    CONF_WEBHOOK_ID,
+    "full_name",
+    "email",
+    "id",
+    "tokens",
+}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> Dict[str, Any]:
+    mealie_coordinator: MealieDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id][
+        CONF_COORDINATOR
+    ]
+    mealie_api = mealie_coordinator.mealie_api
+
+    try:
+        user: Dict[str, Any] = asdict(await mealie_api.get_user())
+    except (
+        ApiException,
+        AuthenticationException,
+        HttpException,
+        InternalClientException,
+        NoTokenException,
+        ParseException,
+    ) as error:
+        user = {"error": type(error).__name__}
+
+    return {
+        "entry": {
+            "data": async_redact_data(entry.data, TO_REDACT),
+            "options": dict(entry.options),
+        },
+        "user": async_redact_data(user, TO_REDACT),
+        "coordinator": {
+            "last_update_success": mealie_coordinator.last_update_success,
+            "update_interval": str(mealie_coordinator.update_interval),
+            "refresh_history": list(mealie_coordinator.refresh_history),
+            "data_ages": mealie_coordinator.data_ages(),
+            "shared_fetcher": mealie_coordinator.shared_fetcher.stats()
+            if mealie_coordinator.shared_fetcher
+            else None,
+            "shopping_list": mealie_coordinator.shopping_list_stats(),
+            "pushes": mealie_coordinator.pushes,
+        },
+        "api": await mealie_api.diagnostics(),
+    }
@@ -6,6 +6,10 @@ class ApiException(BaseException):
     pass
 
 
+class NotFoundException(ApiException):
+    pass
+
+
 class InternalClientException(BaseException):
     pass
 
@@ -14,5 +18,17 @@ class HttpException(BaseException):
     pass
 
 
+class CircuitOpenException(HttpException):
+    pass
+
+
+class RequestTimeoutException(HttpException):
+    pass
+
+
 class NoTokenException(BaseException):
     pass
+
+
+class AuthenticationException(BaseException):
+    pass
@@ -1,51 +1,294 @@
 from __future__ import annotations
 
-from typing import Mapping
+import asyncio
+from http import HTTPStatus
+import time
+from typing import Any, Awaitable, Callable, Dict, Mapping, Optional
 
-from aiohttp.client import ClientSession
+from aiohttp import ClientTimeout, hdrs
+from aiohttp.client import ClientResponse, ClientSession
 from aiohttp.client_exceptions import ClientError
+from yarl import URL
 
-from .exception import HttpException
+from .const import (
+    DEFAULT_REQUEST_TIMEOUT,
+    REQUEST_TIMEOUTS,
+    UNCACHED_ENDPOINT_PREFIX,
+)
+from .exception import (
+    CircuitOpenException,
+    HttpException,
+    RequestTimeoutException,
+)
+from .json_decoder import JsonDecoder, default_decoder
+from .metrics import MetricsRecorder
 from .model.model import Response, Status
+from .offload import PayloadExecutor
+from .resilience import (
+    RETRY_STATUS_CODES,
+    CircuitBreaker,
+    Deadline,
+    RetryPolicy,
+)
+from .response_cache import ResponseCache, content_hash
 
 
 class HttpClient:
-    def __init__(self, client_session: ClientSession) -> None:
+    def __init__(
+        self,
+        client_session: ClientSession,
+        response_cache: Optional[ResponseCache] = None,
+        decoder: Optional[JsonDecoder] = None,
+        payload_executor: Optional[PayloadExecutor] = None,
+        metrics: Optional[MetricsRecorder] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        circuit_breaker_factory: Callable[[], CircuitBreaker] = CircuitBreaker,
+        request_timeouts: Mapping[str, float] = REQUEST_TIMEOUTS,
+        default_timeout: float = DEFAULT_REQUEST_TIMEOUT,
+    ) -> None:
         self._client = client_session
+        self._response_cache = response_cache
+        self._decoder = decoder or default_decoder()
+        self.payload_executor = payload_executor or PayloadExecutor()
+        self.metrics = metrics or MetricsRecorder()
+        self._retry_policy = retry_policy or RetryPolicy()
+        self._circuit_breaker_factory = circuit_breaker_factory
+        self._circuit_breakers: Dict[str, CircuitBreaker] = {}
+        self._request_timeouts = request_timeouts
+        self._default_timeout = default_timeout
+        self.retries = 0
+        self.timeouts = 0
+
+    @property
+    def response_cache(self) -> Optional[ResponseCache]:
+        return self._response_cache
+
+    def circuit_breaker(self, url: str) -> CircuitBreaker:
+        parsed_url = URL(url)
+        host = str(parsed_url.origin()) if parsed_url.is_absolute() else ""
+        if host not in self._circuit_breakers:
+            self._circuit_breakers[host] = self._circuit_breaker_factory()
+        return self._circuit_breakers[host]
+
+    def _timeout(self, endpoint: str, deadline: Optional[Deadline]) -> ClientTimeout:
+        timeout = self._request_timeouts.get(endpoint, self._default_timeout)
+        if deadline is not None:
+            if deadline.expired:
+                self.timeouts += 1
+                raise RequestTimeoutException()
+            timeout = deadline.timeout(timeout)
+        return ClientTimeout(total=timeout)
+
+    def resilience_stats(self) -> Dict[str, Any]:
+        return {
+            "retries": self.retries,
+            "timeouts": self.timeouts,
+            "circuit_breakers": {
+                host: breaker.stats()
+                for host, breaker in self._circuit_breakers.items()
+            },
+        }
+
+    async def _guarded(
+        self, url: str, request: Callable[[], Awaitable[Response]]
+    ) -> Response:
+        breaker = self.circuit_breaker(url)
+        if not breaker.allow():
+            raise CircuitOpenException()
 
-    async def get(self, url: str, headers: Mapping[str, str]) -> Response:
         try:
-            async with self._client.get(url=url, headers=headers) as resp:
-                status = Status.SUCCESS if resp.ok else Status.FAILURE
-                status_code = resp.status
-                data = await resp.json()
-                return Response(status=status, status_code=status_code, data=data)
-        except ClientError:
-            raise HttpException()
+            response = await request()
+        except HttpException as error:
+            if isinstance(error, RequestTimeoutException):
+                self.timeouts += 1
+            breaker.record_failure()
+            raise
+        except BaseException:
+            breaker.release_trial()
+            raise
 
-    async def post(
-        self, url: str, headers: Mapping[str, str], data: Mapping[str, str]
+        if response.status_code in RETRY_STATUS_CODES:
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+        return response
+
+    async def _decode(self, endpoint: str, body: bytes) -> Optional[Any]:
+        if not body:
+            return None
+        start = time.perf_counter()
+        try:
+            return await self.payload_executor.run(
+                f"decode {endpoint}", len(body), self._decoder, body
+            )
+        finally:
+            self.metrics.endpoint(endpoint).record_decode(time.perf_counter() - start)
+
+    async def _read(self, endpoint: str, resp: ClientResponse, start: float) -> bytes:
+        body = await resp.read()
+        self.metrics.endpoint(endpoint).record_request(
+            latency=time.perf_counter() - start,
+            status_code=resp.status,
+            size=len(body),
+        )
+        return body
+
+    async def _response(
+        self, endpoint: str, resp: ClientResponse, start: float
+    ) -> Response:
+        status = Status.SUCCESS if resp.ok else Status.FAILURE
+        body = await self._read(endpoint, resp, start)
+        return Response(
+            status=status,
+            status_code=resp.status,
+            data=await self._decode(endpoint, body),
+            size=len(body),
+        )
+
+    async def get(
+        self,
+        url: str,
+        headers: Mapping[str, str],
+        endpoint: Optional[str] = None,
+        deadline: Optional[Deadline] = None,
     ) -> Response:
+        endpoint = endpoint or URL(url).path
+        attempt = 0
+        while True:
+            timeout = self._timeout(endpoint, deadline)
+            response: Optional[Response] = None
+            try:
+                response = await self._guarded(
+                    url, lambda: self._get_once(url, headers, endpoint, timeout)
+                )
+                if (
+                    response.status_code not in RETRY_STATUS_CODES
+                    or not self._retry_policy.should_retry(attempt)
+                ):
+                    return response
+            except CircuitOpenException:
+                raise
+            except HttpException:
+                if not self._retry_policy.should_retry(attempt):
+                    raise
+
+            delay = self._retry_policy.delay(attempt)
+            if deadline is not None and deadline.remaining() <= delay:
+                if response is not None:
+                    return response
+                self.timeouts += 1
+                raise RequestTimeoutException()
+            self.retries += 1
+            self.metrics.endpoint(endpoint).record_retry()
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def _get_once(
+        self,
+        url: str,
+        headers: Mapping[str, str],
+        endpoint: str,
+        timeout: ClientTimeout,
+    ) -> Response:
+        cache = (
+            None
+            if endpoint.startswith(UNCACHED_ENDPOINT_PREFIX)
+            else self._response_cache
+        )
+        cache_key = cache.key(url=url, headers=headers) if cache else None
+        cached = cache.get(cache_key) if cache and cache_key else None
+        request_headers = (
+            {**headers, **cached.validation_headers()} if cached else headers
+        )
+
+        start = time.perf_counter()
         try:
-            async with self._client.post(url=url, data=data, headers=headers) as resp:
+            async with self._client.get(
+                url=url, headers=request_headers, timeout=timeout
+            ) as resp:
+                body = await self._read(endpoint, resp, start)
+                if cache and cached and resp.status == HTTPStatus.NOT_MODIFIED:
+                    return cache.hit(cache_key, cached)
+
+                if (
+                    cache
+                    and cached
+                    and resp.ok
+                    and not cached.has_validators
+                    and cached.content_hash == content_hash(body)
+                ):
+                    return cache.hit(cache_key, cached)
+
                 status = Status.SUCCESS if resp.ok else Status.FAILURE
-                status_code = resp.status
-                data = await resp.json()
-                return Response(status=status, status_code=status_code, data=data)
-        except ClientError:
+                response = Response(
+                    status=status,
+                    status_code=resp.status,
+                    data=await self._decode(endpoint, body),
+                    size=len(body),
+                )
+                if cache and resp.ok:
+                    cache.store(
+                        key=cache_key,
+                        response=response,
+                        body=body,
+                        etag=resp.headers.get(hdrs.ETAG),
+                        last_modified=resp.headers.get(hdrs.LAST_MODIFIED),
+                    )
+                return response
+        except asyncio.TimeoutError:
+            raise RequestTimeoutException()
+        except (ClientError, ValueError):
             raise HttpException()
 
+    async def post(
+        self,
+        url: str,
+        headers: Mapping[str, str],
+        data: Mapping[str, str],
+        endpoint: Optional[str] = None,
+        deadline: Optional[Deadline] = None,
+    ) -> Response:
+        endpoint = endpoint or URL(url).path
+        timeout = self._timeout(endpoint, deadline)
+
+        async def post() -> Response:
+            start = time.perf_counter()
+            try:
+                async with self._client.post(
+                    url=url, data=data, headers=headers, timeout=timeout
+                ) as resp:
+                    return await self._response(endpoint, resp, start)
+            except asyncio.TimeoutError:
+                raise RequestTimeoutException()
+            except (ClientError, ValueError):
+                raise HttpException()
+
+        return await self._guarded(url, post)
+
     async def put(
-        self, url: str, headers: Mapping[str, str], data: Mapping[str, str]
+        self,
+        url: str,
+        headers: Mapping[str, str],
+        data: Mapping[str, str],
+        endpoint: Optional[str] = None,
+        deadline: Optional[Deadline] = None,
     ) -> Response:
-        try:
-            async with self._client.put(url=url, data=data, headers=headers) as resp:
-                status = Status.SUCCESS if resp.ok else Status.FAILURE
-                status_code = resp.status
-                data = await resp.json()
-                return Response(status=status, status_code=status_code, data=data)
-        except ClientError:
-            raise HttpException()
+        endpoint = endpoint or URL(url).path
+        timeout = self._timeout(endpoint, deadline)
+
+        async def put() -> Response:
+            start = time.perf_counter()
+            try:
+                async with self._client.put(
+                    url=url, data=data, headers=headers, timeout=timeout
+                ) as resp:
+                    return await self._response(endpoint, resp, start)
+            except asyncio.TimeoutError:
+                raise RequestTimeoutException()
+            except (ClientError, ValueError):
+                raise HttpException()
+
+        return await self._guarded(url, put)
 
     async def delete(self, url: str, headers: Mapping[str, str]) -> Response:
         pass
@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+import json
+from typing import Any, Callable, Optional
+
+JsonDecoder = Callable[[bytes], Any]
+
+
+def stdlib_decoder(body: bytes) -> Any:
+    return json.loads(body)
+
+
+def orjson_decoder() -> Optional[JsonDecoder]:
+    try:
+        import orjson
+    except ImportError:
+        return None
+
+    return orjson.loads
+
+
+def msgspec_decoder() -> Optional[JsonDecoder]:
+    try:
+        import msgspec
+    except ImportError:
+        return None
+
+    decoder = msgspec.json.Decoder()
+
+    def decode(body: bytes) -> Any:
+        try:
+            return decoder.decode(body)
+        except msgspec.DecodeError as error:
+            raise ValueError(str(error)) from error
+
+    return decode
+
+
+def default_decoder() -> JsonDecoder:
+    return orjson_decoder() or msgspec_decoder() or stdlib_decoder
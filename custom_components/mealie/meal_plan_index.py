@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+from bisect import bisect_left, insort
+from datetime import date
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+from .model.model import Meal, MealPlanResponse
+
+
+class MealPlanIndex:
+    """Date indexed view over the meals of a cached meal plan.
+
+    Dates are kept sorted so range queries bisect instead of scanning, and
+    updates only touch the days whose meals changed.
+    """
+
+    def __init__(self, meal_plan: Optional[MealPlanResponse] = None) -> None:
+        self._dates: List[date] = []
+        self._meals: Dict[date, Tuple[Meal, ...]] = {}
+        self.update(meal_plan)
+
+    def update(self, meal_plan: Optional[MealPlanResponse]) -> Set[date]:
+        meals = (
+            {plan_day.date: tuple(plan_day.meals) for plan_day in meal_plan.plan_days}
+            if meal_plan
+            else {}
+        )
+
+        changed = {day for day in self._meals if day not in meals}
+        for day in changed:
+            del self._meals[day]
+            del self._dates[bisect_left(self._dates, day)]
+
+        for day, day_meals in meals.items():
+            if day not in self._meals:
+                insort(self._dates, day)
+            elif self._meals[day] == day_meals:
+                continue
+            self._meals[day] = day_meals
+            changed.add(day)
+
+        return changed
+
+    def meals_on(self, day: date) -> Tuple[Meal, ...]:
+        return self._meals.get(day, ())
+
+    def recipe_slug_on(self, day: date) -> Optional[str]:
+        return next((meal.slug for meal in self.meals_on(day) if meal.slug), None)
+
+    def meals_between(
+        self, start: date, end: date
+    ) -> Iterator[Tuple[date, Tuple[Meal, ...]]]:
+        """Yields the planned days from start up to, but excluding, end."""
+        first, last = bisect_left(self._dates, start), bisect_left(self._dates, end)
+        for day in self._dates[first:last]:
+            yield day, self._meals[day]
+
+    def next_day_with_meals(
+        self, start: date
+    ) -> Optional[Tuple[date, Tuple[Meal, ...]]]:
+        first = bisect_left(self._dates, start)
+        for day in self._dates[first:]:
+            if self._meals[day]:
+                return day, self._meals[day]
+        return None
@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence
+
+from .const import LATENCY_BUCKETS
+
+
+@dataclass
+class EndpointMetrics:
+    buckets: Sequence[float]
+    requests: int = 0
+    latency_counts: List[int] = field(default_factory=list)
+    total_latency: float = 0.0
+    last_latency: Optional[float] = None
+    total_bytes: int = 0
+    last_bytes: Optional[int] = None
+    status_codes: Dict[int, int] = field(default_factory=dict)
+    retries: int = 0
+    decode_count: int = 0
+    total_decode_time: float = 0.0
+    last_decode_time: Optional[float] = None
+    parse_count: int = 0
+    total_parse_time: float = 0.0
+    last_parse_time: Optional[float] = None
+
+    def __post_init__(self) -> None:
+        if not self.latency_counts:
+            self.latency_counts = [0] * (len(self.buckets) + 1)
+
+    def record_request(self, latency: float, status_code: int, size: int) -> None:
+        self.requests += 1
+        self.latency_counts[bisect_left(self.buckets, latency)] += 1
+        self.total_latency += latency
+        self.last_latency = latency
+        self.total_bytes += size
+        self.last_bytes = size
+        self.status_codes[status_code] = self.status_codes.get(status_code, 0) + 1
+
+    def record_retry(self) -> None:
+        self.retries += 1
+
+    def record_decode(self, seconds: float) -> None:
+        self.decode_count += 1
+        self.total_decode_time += seconds
+        self.last_decode_time = seconds
+
+    def record_parse(self, seconds: float) -> None:
+        self.parse_count += 1
+        self.total_parse_time += seconds
+        self.last_parse_time = seconds
+
+    def histogram(self) -> Dict[str, int]:
+        labels = [f"<={bucket * 1000:g}ms" for bucket in self.buckets] + [
+            f">{self.buckets[-1] * 1000:g}ms"
+        ]
+        return dict(zip(labels, self.latency_counts))
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "latency_histogram": self.histogram(),
+            "mean_latency": self.total_latency / self.requests
+            if self.requests
+            else None,
+            "last_latency": self.last_latency,
+            "total_bytes": self.total_bytes,
+            "last_bytes": self.last_bytes,
+            "status_codes": dict(self.status_codes),
+            "retries": self.retries,
+            "mean_decode_time": self.total_decode_time / self.decode_count
+            if self.decode_count
+            else None,
+            "last_decode_time": self.last_decode_time,
+            "mean_parse_time": self.total_parse_time / self.parse_count
+            if self.parse_count
+            else None,
+            "last_parse_time": self.last_parse_time,
+        }
+
+
+class MetricsRecorder:
+    """Collects request, decode and parse metrics per endpoint."""
+
+    def __init__(self, buckets: Sequence[float] = LATENCY_BUCKETS) -> None:
+        self._buckets = tuple(sorted(buckets))
+        self._endpoints: Dict[str, EndpointMetrics] = {}
+
+    def endpoint(self, endpoint: str) -> EndpointMetrics:
+        if endpoint not in self._endpoints:
+            self._endpoints[endpoint] = EndpointMetrics(buckets=self._buckets)
+        return self._endpoints[endpoint]
+
+    def get(self, endpoint: str) -> Optional[EndpointMetrics]:
+        return self._endpoints.get(endpoint)
+
+    def request_counts(self) -> Dict[str, int]:
+        return {
+            endpoint: metrics.requests for endpoint, metrics in self._endpoints.items()
+        }
+
+    def total_bytes(self) -> int:
+        return sum(metrics.total_bytes for metrics in self._endpoints.values())
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        return {
+            endpoint: metrics.as_dict() for endpoint, metrics in self._endpoints.items()
+        }
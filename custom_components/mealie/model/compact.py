@@ -0,0 +1,501 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Any, Mapping, Optional, Tuple
+
+from .model import parse_date, parse_datetime
+
+
+@dataclass(frozen=True)
+class CompactMealPlanResponse:
+    __slots__ = ("group", "start_date", "end_date", "plan_days", "uid", "shopping_list")
+
+    group: str
+    start_date: date
+    end_date: date
+    plan_days: Tuple[CompactPlanDay, ...]
+    uid: int
+    shopping_list: int
+
+    @classmethod
+    def from_json(cls, json_data: Mapping[str, Any]) -> CompactMealPlanResponse:
+        return CompactMealPlanResponse(
+            group=json_data["group"],
+            start_date=parse_date(json_data["startDate"]),
+            end_date=parse_date(json_data["endDate"]),
+            plan_days=tuple(
+                CompactPlanDay.from_json(json_data=plan_day)
+                for plan_day in json_data.get("planDays", ())
+            ),
+            uid=json_data["uid"],
+            shopping_list=json_data["shoppingList"],
+        )
+
+
+@dataclass(frozen=True)
+class CompactPlanDay:
+    __slots__ = ("date", "meals")
+
+    date: date
+    meals: Tuple[CompactMeal, ...]
+
+    @classmethod
+    def from_json(cls, json_data: Mapping[str, Any]) -> CompactPlanDay:
+        return CompactPlanDay(
+            date=parse_date(json_data["date"]),
+            meals=tuple(
+                CompactMeal.from_json(json_data=meal)
+                for meal in json_data.get("meals", ())
+            ),
+        )
+
+
+@dataclass(frozen=True)
+class CompactMeal:
+    __slots__ = ("slug", "name", "description")
+
+    slug: Optional[str]
+    name: Optional[str]
+    description: Optional[str]
+
+    @classmethod
+    def from_json(cls, json_data: Mapping[str, Any]) -> CompactMeal:
+        return CompactMeal(
+            slug=json_data.get("slug"),
+            name=json_data.get("name"),
+            description=json_data.get("description"),
+        )
+
+
+@dataclass(frozen=True)
+class CompactUserResponse:
+    __slots__ = (
+        "username",
+        "full_name",
+        "email",
+        "admin",
+        "group",
+        "favorite_recipes",
+        "id",
+        "tokens",
+    )
+
+    username: str
+    full_name: str
+    email: str
+    admin: bool
+    group: str
+    favorite_recipes: Tuple[str, ...]
+    id: int
+    tokens: Tuple[CompactToken, ...]
+
+    @classmethod
+    def from_json(cls, json_data: Mapping[str, Any]) -> CompactUserResponse:
+        return CompactUserResponse(
+            username=json_data["username"],
+            full_name=json_data["fullName"],
+            email=json_data["email"],
+            admin=json_data["admin"],
+            group=json_data["group"],
+            favorite_recipes=tuple(
+                str(recipe) for recipe in json_data.get("favoriteRecipes", ())
+            ),
+            id=int(json_data["id"]),
+            tokens=tuple(
+                CompactToken.from_json(token) for token in json_data.get("tokens", ())
+            ),
+        )
+
+    def to_json(self) -> Mapping[str, Any]:
+        return {
+            "username": self.username,
+            "fullName": self.full_name,
+            "email": self.email,
+            "admin": self.admin,
+            "group": self.group,
+            "favoriteRecipes": list(self.favorite_recipes),
+            "id": self.id,
+            "tokens": [token.to_json() for token in self.tokens],
+        }
+
+
+@dataclass(frozen=True)
+class CompactToken:
+    __slots__ = ("name", "id")
+
+    name: str
+    id: int
+
+    @classmethod
+    def from_json(cls, json_data: Mapping[str, Any]) -> CompactToken:
+        return CompactToken(name=json_data["name"], id=int(json_data["id"]))
+
+    def to_json(self) -> Mapping[str, Any]:
+        return {"name": self.name, "id": self.id}
+
+
+@dataclass(frozen=True)
+class CompactRecipeResponse:
+    __slots__ = (
+        "id",
+        "name",
+        "slug",
+        "image",
+        "description",
+        "recipe_category",
+        "tags",
+        "rating",
+        "date_added",
+        "date_updated",
+        "recipe_yield",
+        "recipe_ingredient",
+        "recipe_instructions",
+        "nutrition",
+        "tools",
+        "total_time",
+        "prep_time",
+        "perform_time",
+        "settings",
+        "assets",
+        "notes",
+        "org_url",
+        "extras",
+        "comments",
+    )
+
+    id: int
+    name: str
+    slug: str
+    image: Optional[str]
+    description: Optional[str]
+    recipe_category: Tuple[str, ...]
+    tags: Tuple[str, ...]
+    rating: Optional[int]
+    date_added: date
+    date_updated: datetime
+    recipe_yield: Optional[str]
+    recipe_ingredient: Tuple[CompactRecipeIngredient, ...]
+    recipe_instructions: Tuple[CompactRecipeStep, ...]
+    nutrition: Optional[CompactNutrition]
+    tools: Tuple[str, ...]
+    total_time: Optional[str]
+    prep_time: Optional[str]
+    perform_time: Optional[str]
+    settings: CompactSetting
+    assets: Tuple[CompactAsset, ...]
+    notes: Tuple[CompactNote, ...]
+    org_url: Optional[str]
+    extras: Optional[Mapping[str, Any]]
+    comments: Tuple[CompactComment, ...]
+
+    @classmethod
+    def from_json(cls, json_data: Mapping[str, Any]) -> CompactRecipeResponse:
+        return CompactRecipeResponse(
+            id=json_data["id"],
+            name=json_data["name"],
+            slug=json_data["slug"],
+            image=json_data.get("image"),
+            description=json_data.get("description"),
+            recipe_category=tuple(json_data.get("recipeCategory", ())),
+            tags=tuple(json_data.get("tags", ())),
+            rating=json_data.get("rating"),
+            date_added=parse_date(json_data["dateAdded"]),
+            date_updated=parse_datetime(json_data["dateUpdated"]),
+            recipe_yield=json_data.get("recipeYield"),
+            recipe_ingredient=tuple(
+                CompactRecipeIngredient.from_json(data)
+                for data in json_data.get("recipeIngredient", ())
+            ),
+            recipe_instructions=tuple(
+                CompactRecipeStep.from_json(data)
+                for data in json_data.get("recipeInstructions", ())
+            ),
+            nutrition=CompactNutrition.from_json(json_data["nutrition"])
+            if json_data.get("nutrition")
+            else None,
+            tools=tuple(json_data.get("tools", ())),
+            total_time=json_data.get("totalTime"),
+            prep_time=json_data.get("prepTime"),
+            perform_time=json_data.get("performTime"),
+            settings=CompactSetting.from_json(json_data["settings"]),
+            assets=tuple(
+                CompactAsset.from_json(data) for data in json_data.get("assets", ())
+            ),
+            notes=tuple(
+                CompactNote.from_json(data) for data in json_data.get("notes", ())
+            ),
+            org_url=json_data.get("orgURL"),
+            extras=json_data.get("extras"),
+            comments=tuple(
+                CompactComment.from_json(data) for data in json_data.get("comments", ())
+            ),
+        )
+
+    def to_json(self) -> Mapping[str, Any]:
+        return {
+            "id": self.id,
+            "name": self.name,
+            "slug": self.slug,
+            "image": self.image,
+            "description": self.description,
+            "recipeCategory": list(self.recipe_category),
+            "tags": list(self.tags),
+            "rating": self.rating,
+            "dateAdded": self.date_added.isoformat(),
+            "dateUpdated": self.date_updated.isoformat(),
+            "recipeYield": self.recipe_yield,
+            "recipeIngredient": [data.to_json() for data in self.recipe_ingredient],
+            "recipeInstructions": [data.to_json() for data in self.recipe_instructions],
+            "nutrition": self.nutrition.to_json() if self.nutrition else None,
+            "tools": list(self.tools),
+            "totalTime": self.total_time,
+            "prepTime": self.prep_time,
+            "performTime": self.perform_time,
+            "settings": self.settings.to_json(),
+            "assets": [data.to_json() for data in self.assets],
+            "notes": [data.to_json() for data in self.notes],
+            "orgURL": self.org_url,
+            "extras": self.extras,
+            "comments": [data.to_json() for data in self.comments],
+        }
+
+
+@dataclass(frozen=True)
+class CompactComment:
+    __slots__ = ("text", "id", "uuid", "recipe_slug", "date_added", "user")
+
+    text: str
+    id: int
+    uuid: str
+    recipe_slug: str
+    date_added: datetime
+    user: CompactUserResponse
+
+    @classmethod
+    def from_json(cls, json_data: Mapping[str, Any]) -> CompactComment:
+        return CompactComment(
+            text=json_data["text"],
+            id=json_data["id"],
+            uuid=json_data["uuid"],
+            recipe_slug=json_data["recipeSlug"],
+            date_added=parse_datetime(json_data["dateAdded"]),
+            user=CompactUserResponse.from_json(json_data["user"]),
+        )
+
+    def to_json(self) -> Mapping[str, Any]:
+        return {
+            "text": self.text,
+            "id": self.id,
+            "uuid": self.uuid,
+            "recipeSlug": self.recipe_slug,
+            "dateAdded": self.date_added.isoformat(),
+            "user": self.user.to_json(),
+        }
+
+
+@dataclass(frozen=True)
+class CompactNote:
+    __slots__ = ("title", "text")
+
+    title: Optional[str]
+    text: Optional[str]
+
+    @classmethod
+    def from_json(cls, json_data: Mapping[str, Any]) -> CompactNote:
+        return CompactNote(title=json_data.get("title"), text=json_data.get("text"))
+
+    def to_json(self) -> Mapping[str, Any]:
+        return {"title": self.title, "text": self.text}
+
+
+@dataclass(frozen=True)
+class CompactAsset:
+    __slots__ = ("name", "icon", "file_name")
+
+    name: Optional[str]
+    icon: Optional[str]
+    file_name: Optional[str]
+
+    @classmethod
+    def from_json(cls, json_data: Mapping[str, Any]) -> CompactAsset:
+        return CompactAsset(
+            name=json_data.get("name"),
+            icon=json_data.get("icon"),
+            file_name=json_data.get("fileName"),
+        )
+
+    def to_json(self) -> Mapping[str, Any]:
+        return {"name": self.name, "icon": self.icon, "fileName": self.file_name}
+
+
+@dataclass(frozen=True)
+class CompactSetting:
+    __slots__ = (
+        "public",
+        "show_nutrition",
+        "show_assets",
+        "landscape_view",
+        "disable_comments",
+        "disable_amount",
+    )
+
+    public: bool
+    show_nutrition: bool
+    show_assets: bool
+    landscape_view: bool
+    disable_comments: bool
+    disable_amount: bool
+
+    @classmethod
+    def from_json(cls, json_data: Mapping[str, Any]) -> CompactSetting:
+        return CompactSetting(
+            public=json_data.get("public"),
+            show_nutrition=json_data.get("showNutrition"),
+            show_assets=json_data.get("showAssets"),
+            landscape_view=json_data.get("landscapeView"),
+            disable_comments=json_data.get("disableComments"),
+            disable_amount=json_data.get("disableAmount"),
+        )
+
+    def to_json(self) -> Mapping[str, Any]:
+        return {
+            "public": self.public,
+            "showNutrition": self.show_nutrition,
+            "showAssets": self.show_assets,
+            "landscapeView": self.landscape_view,
+            "disableComments": self.disable_comments,
+            "disableAmount": self.disable_amount,
+        }
+
+
+@dataclass(frozen=True)
+class CompactNutrition:
+    __slots__ = (
+        "calories",
+        "fat_content",
+        "protein_content",
+        "carbohydrate_content",
+        "fiber_content",
+        "sodium_content",
+        "sugar_content",
+    )
+
+    calories: Optional[str]
+    fat_content: Optional[str]
+    protein_content: Optional[str]
+    carbohydrate_content: Optional[str]
+    fiber_content: Optional[str]
+    sodium_content: Optional[str]
+    sugar_content: Optional[str]
+
+    @classmethod
+    def from_json(cls, json_data: Mapping[str, Any]) -> CompactNutrition:
+        return CompactNutrition(
+            calories=json_data.get("calories"),
+            fat_content=json_data.get("fatContent"),
+            protein_content=json_data.get("proteinContent"),
+            carbohydrate_content=json_data.get("carbohydrateContent"),
+            fiber_content=json_data.get("fiberContent"),
+            sodium_content=json_data.get("sodiumContent"),
+            sugar_content=json_data.get("sugarContent"),
+        )
+
+    def to_json(self) -> Mapping[str, Any]:
+        return {
+            "calories": self.calories,
+            "fatContent": self.fat_content,
+            "proteinContent": self.protein_content,
+            "carbohydrateContent": self.carbohydrate_content,
+            "fiberContent": self.fiber_content,
+            "sodiumContent": self.sodium_content,
+            "sugarContent": self.sugar_content,
+        }
+
+
+@dataclass(frozen=True)
+class CompactRecipeIngredient:
+    __slots__ = ("title", "note", "unit", "food", "disable_amount", "quantity")
+
+    title: Optional[str]
+    note: Optional[str]
+    unit: Optional[CompactRecipeIngredientUnit]
+    food: Optional[CompactRecipeIngredientFood]
+    disable_amount: Optional[bool]
+    quantity: Optional[int]
+
+    @classmethod
+    def from_json(cls, json_data: Mapping[str, Any]) -> CompactRecipeIngredient:
+        return CompactRecipeIngredient(
+            title=json_data.get("title"),
+            note=json_data.get("note"),
+            unit=CompactRecipeIngredientUnit.from_json(json_data["unit"])
+            if json_data.get("unit")
+            else None,
+            food=CompactRecipeIngredientFood.from_json(json_data["food"])
+            if json_data.get("food")
+            else None,
+            disable_amount=json_data.get("disableAmount"),
+            quantity=json_data.get("quantity"),
+        )
+
+    def to_json(self) -> Mapping[str, Any]:
+        return {
+            "title": self.title,
+            "note": self.note,
+            "unit": self.unit.to_json() if self.unit else None,
+            "food": self.food.to_json() if self.food else None,
+            "disableAmount": self.disable_amount,
+            "quantity": self.quantity,
+        }
+
+
+@dataclass(frozen=True)
+class CompactRecipeIngredientUnit:
+    __slots__ = ("name", "description")
+
+    name: Optional[str]
+    description: Optional[str]
+
+    @classmethod
+    def from_json(cls, json_data: Mapping[str, Any]) -> CompactRecipeIngredientUnit:
+        return CompactRecipeIngredientUnit(
+            name=json_data.get("name"), description=json_data.get("description")
+        )
+
+    def to_json(self) -> Mapping[str, Any]:
+        return {"name": self.name, "description": self.description}
+
+
+@dataclass(frozen=True)
+class CompactRecipeIngredientFood:
+    __slots__ = ("name", "description")
+
+    name: Optional[str]
+    description: Optional[str]
+
+    @classmethod
+    def from_json(cls, json_data: Mapping[str, Any]) -> CompactRecipeIngredientFood:
+        return CompactRecipeIngredientFood(
+            name=json_data.get("name"), description=json_data.get("description")
+        )
+
+    def to_json(self) -> Mapping[str, Any]:
+        return {"name": self.name, "description": self.description}
+
+
+@dataclass(frozen=True)
+class CompactRecipeStep:
+    __slots__ = ("title", "text")
+
+    title: Optional[str]
+    text: Optional[str]
+
+    @classmethod
+    def from_json(cls, json_data: Mapping[str, Any]) -> CompactRecipeStep:
+        return CompactRecipeStep(
+            title=json_data.get("title"), text=json_data.get("text")
+        )
+
+    def to_json(self) -> Mapping[str, Any]:
+        return {"title": self.title, "text": self.text}
@@ -1,8 +1,9 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import date, datetime
 from enum import Enum, auto
+from functools import cached_property
 from typing import Any, List, Mapping, Optional
 
 
@@ -66,6 +67,7 @@ class Response:
     status: Status
     status_code: int
     data: Optional[Mapping[str, Any]]
+    size: int = field(default=0, compare=False)
 
 
 @dataclass(frozen=True)
@@ -244,9 +246,105 @@ class RecipeResponse:
             notes=[Note.from_json(data) for data in json_data.get("notes", [])],
             org_url=json_data.get("orgURL"),
             extras=json_data.get("extras", []),
-            comments=[Comment.from_json(data) for data in json_data.get("comments")],
+            comments=[
+                Comment.from_json(data) for data in json_data.get("comments", [])
+            ],
+        )
+
+
+class LazyRecipeResponse:
+    """Recipe that parses scalar fields up front and nested fields on access."""
+
+    def __init__(self, json_data: Mapping[str, Any]) -> None:
+        self._json_data = json_data
+        self.id: int = json_data["id"]
+        self.name: str = json_data["name"]
+        self.slug: str = json_data["slug"]
+        self.image: Optional[str] = json_data.get("image")
+        self.description: Optional[str] = json_data.get("description")
+        self.rating: Optional[int] = json_data.get("rating")
+        self.date_added: date = parse_date(json_data["dateAdded"])
+        self.date_updated: datetime = parse_datetime(json_data["dateUpdated"])
+        self.recipe_yield: Optional[str] = json_data.get("recipeYield")
+        self.total_time: Optional[str] = json_data.get("totalTime")
+        self.prep_time: Optional[str] = json_data.get("prepTime")
+        self.perform_time: Optional[str] = json_data.get("performTime")
+        self.org_url: Optional[str] = json_data.get("orgURL")
+
+    @classmethod
+    def from_json(cls, json_data: Mapping[str, Any]) -> LazyRecipeResponse:
+        return LazyRecipeResponse(json_data=json_data)
+
+    @cached_property
+    def recipe_category(self) -> List[str]:
+        return list(self._json_data.get("recipeCategory", []))
+
+    @cached_property
+    def tags(self) -> List[str]:
+        return list(self._json_data.get("tags", []))
+
+    @cached_property
+    def recipe_ingredient(self) -> List[RecipeIngredient]:
+        return [
+            RecipeIngredient.from_json(data)
+            for data in self._json_data.get("recipeIngredient", [])
+        ]
+
+    @cached_property
+    def recipe_instructions(self) -> List[Any]:
+        return [
+            RecipeStep.from_json(data)
+            for data in self._json_data.get("recipeInstructions", [])
+        ]
+
+    @cached_property
+    def nutrition(self) -> Optional[Nutrition]:
+        return (
+            Nutrition.from_json(self._json_data["nutrition"])
+            if self._json_data.get("nutrition")
+            else None
         )
 
+    @cached_property
+    def tools(self) -> List[str]:
+        return list(self._json_data.get("tools", []))
+
+    @cached_property
+    def settings(self) -> Setting:
+        return Setting.from_json(self._json_data["settings"])
+
+    @cached_property
+    def assets(self) -> List[Asset]:
+        return [Asset.from_json(data) for data in self._json_data.get("assets", [])]
+
+    @cached_property
+    def notes(self) -> List[Note]:
+        return [Note.from_json(data) for data in self._json_data.get("notes", [])]
+
+    @cached_property
+    def extras(self) -> Optional[Mapping[str, Any]]:
+        return self._json_data.get("extras", [])
+
+    @cached_property
+    def comments(self) -> List[Comment]:
+        return [Comment.from_json(data) for data in self._json_data.get("comments", [])]
+
+    def to_recipe_response(self) -> RecipeResponse:
+        return RecipeResponse.from_json(self._json_data)
+
+    def to_json(self) -> Mapping[str, Any]:
+        return self._json_data
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, LazyRecipeResponse):
+            return self._json_data == other._json_data
+        if isinstance(other, RecipeResponse):
+            return self.to_recipe_response() == other
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"LazyRecipeResponse(id={self.id!r}, slug={self.slug!r})"
+
 
 @dataclass(frozen=True)
 class Comment:
@@ -276,7 +374,7 @@ class Note:
 
     @classmethod
     def from_json(cls, json_data: Mapping[str, Any]) -> Note:
-        Note(
+        return Note(
             title=json_data.get("title"),
             text=json_data.get("text"),
         )
@@ -308,7 +406,6 @@ class Setting:
 
     @classmethod
     def from_json(cls, json_data: Mapping[str, Any]) -> Setting:
-        print(json_data)
         return Setting(
             public=json_data.get("public"),
             show_nutrition=json_data.get("showNutrition"),
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import asyncio
+from dataclasses import asdict, dataclass
+import time
+from typing import Any, Callable, Dict, TypeVar
+
+from .const import PAYLOAD_EXECUTOR_THRESHOLD
+
+T = TypeVar("T")
+
+
+@dataclass
+class BlockingStats:
+    inline: int = 0
+    offloaded: int = 0
+    total: float = 0.0
+    maximum: float = 0.0
+    last: float = 0.0
+
+
+class PayloadExecutor:
+    """Runs payload work inline or, above a size threshold, in an executor.
+
+    Inline runs block the event loop, so their duration is recorded per
+    operation.
+    """
+
+    def __init__(self, threshold: int = PAYLOAD_EXECUTOR_THRESHOLD) -> None:
+        self.threshold = threshold
+        self._stats: Dict[str, BlockingStats] = {}
+
+    async def run(
+        self, operation: str, size: int, function: Callable[..., T], *args: Any
+    ) -> T:
+        stats = self._stats.setdefault(operation, BlockingStats())
+        if size > self.threshold:
+            stats.offloaded += 1
+            return await asyncio.get_running_loop().run_in_executor(
+                None, function, *args
+            )
+
+        start = time.perf_counter()
+        try:
+            return function(*args)
+        finally:
+            elapsed = time.perf_counter() - start
+            stats.inline += 1
+            stats.total += elapsed
+            stats.maximum = max(stats.maximum, elapsed)
+            stats.last = elapsed
+
+    def blocking_stats(self) -> Dict[str, Dict[str, float]]:
+        return {operation: asdict(stats) for operation, stats in self._stats.items()}
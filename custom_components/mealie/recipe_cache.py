@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from dataclasses import dataclass
+import time
+from typing import Callable, Dict, Optional
+
+from .const import RECIPE_CACHE_MAX_ENTRIES, RECIPE_CACHE_TTL
+from .model.compact import CompactRecipeResponse
+from .single_flight import SingleFlight
+
+
+@dataclass
+class CachedRecipe:
+    recipe: CompactRecipeResponse
+    stored_at: float
+
+
+class RecipeCache:
+    """Parsed recipes keyed by slug.
+
+    Entries younger than `ttl` seconds are served without a request. The
+    default ttl spans a day, so polling never downloads an unchanged recipe
+    again; edits reach the cache through `clear()` on a Mealie notification or
+    through the daily revalidation. When the refetched recipe has the same
+    `date_updated` the cached instance is kept and its age reset. Entries are
+    evicted least recently used first once `max_entries` is exceeded.
+
+    Downloads are run through `in_flight`, so entries sharing a cache also
+    share a request for the same slug.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = RECIPE_CACHE_MAX_ENTRIES,
+        ttl: float = RECIPE_CACHE_TTL,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._max_entries = max_entries
+        self._ttl = ttl
+        self._clock = clock
+        self._entries: OrderedDict[str, CachedRecipe] = OrderedDict()
+        self.in_flight = SingleFlight()
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, slug: str) -> Optional[CompactRecipeResponse]:
+        """Returns the cached recipe while it is younger than the ttl."""
+        entry = self._entries.get(slug)
+        if entry is None or self._clock() - entry.stored_at > self._ttl:
+            return None
+        self.hits += 1
+        self._entries.move_to_end(slug)
+        return entry.recipe
+
+    def store(self, slug: str, recipe: CompactRecipeResponse) -> CompactRecipeResponse:
+        """Caches a fetched recipe and returns the instance to hand out."""
+        entry = self._entries.pop(slug, None)
+        if entry is not None and entry.recipe.date_updated == recipe.date_updated:
+            self.revalidated += 1
+            recipe = entry.recipe
+        else:
+            self.misses += 1
+
+        self._entries[slug] = CachedRecipe(recipe=recipe, stored_at=self._clock())
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+        return recipe
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "revalidated": self.revalidated,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
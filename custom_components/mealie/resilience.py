@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from enum import Enum
+from http import HTTPStatus
+import random
+import time
+from typing import Any, Callable, Dict, FrozenSet, Optional
+
+from .const import (
+    CIRCUIT_BREAKER_FAILURE_THRESHOLD,
+    CIRCUIT_BREAKER_RESET_TIMEOUT,
+    RETRY_ATTEMPTS,
+    RETRY_BASE_DELAY,
+    RETRY_JITTER,
+    RETRY_MAX_DELAY,
+)
+
+RETRY_STATUS_CODES: FrozenSet[int] = frozenset(
+    {
+        HTTPStatus.BAD_GATEWAY,
+        HTTPStatus.SERVICE_UNAVAILABLE,
+        HTTPStatus.GATEWAY_TIMEOUT,
+    }
+)
+
+
+@dataclass(frozen=True)
+class Deadline:
+    expires_at: float
+    clock: Callable[[], float] = time.monotonic
+
+    @classmethod
+    def after(
+        cls, seconds: float, clock: Callable[[], float] = time.monotonic
+    ) -> Deadline:
+        return cls(expires_at=clock() + seconds, clock=clock)
+
+    def remaining(self) -> float:
+        return max(self.expires_at - self.clock(), 0.0)
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def timeout(self, limit: float) -> float:
+        return min(limit, self.remaining())
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    attempts: int = RETRY_ATTEMPTS
+    base_delay: float = RETRY_BASE_DELAY
+    max_delay: float = RETRY_MAX_DELAY
+    jitter: float = RETRY_JITTER
+
+    def should_retry(self, attempt: int) -> bool:
+        return attempt + 1 < self.attempts
+
+    def delay(
+        self, attempt: int, uniform: Callable[[float, float], float] = random.uniform
+    ) -> float:
+        delay = min(self.max_delay, self.base_delay * 2**attempt)
+        return uniform(delay * (1 - self.jitter), delay)
+
+
+class CircuitState(str, Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Fails fast after repeated failures until the reset timeout has passed.
+
+    Once the timeout has passed a single trial request is let through; its
+    outcome closes the circuit again or re-opens it.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = CIRCUIT_BREAKER_FAILURE_THRESHOLD,
+        reset_timeout: float = CIRCUIT_BREAKER_RESET_TIMEOUT,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._failure_threshold = failure_threshold
+        self._reset_timeout = reset_timeout
+        self._clock = clock
+        self._opened_at: Optional[float] = None
+        self._trial_in_flight = False
+        self.state = CircuitState.CLOSED
+        self.failures = 0
+        self.rejected = 0
+        self.opened = 0
+
+    def allow(self) -> bool:
+        if self.state == CircuitState.OPEN and self._opened_at is not None:
+            if self._clock() - self._opened_at >= self._reset_timeout:
+                self.state = CircuitState.HALF_OPEN
+                self._trial_in_flight = False
+
+        if self.state == CircuitState.CLOSED:
+            return True
+        if self.state == CircuitState.HALF_OPEN and not self._trial_in_flight:
+            self._trial_in_flight = True
+            return True
+
+        self.rejected += 1
+        return False
+
+    def record_success(self) -> None:
+        self.state = CircuitState.CLOSED
+        self.failures = 0
+        self._opened_at = None
+        self._trial_in_flight = False
+
+    def release_trial(self) -> None:
+        """Let another request try the host when a trial ended without an outcome."""
+        self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if (
+            self.state == CircuitState.HALF_OPEN
+            or self.failures >= self._failure_threshold
+        ):
+            if self.state != CircuitState.OPEN:
+                self.opened += 1
+            self.state = CircuitState.OPEN
+            self._opened_at = self._clock()
+            self._trial_in_flight = False
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "state": self.state.value,
+            "failures": self.failures,
+            "rejected": self.rejected,
+            "opened": self.opened,
+        }
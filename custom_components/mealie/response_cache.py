@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+import hashlib
+import time
+from typing import Dict, Mapping, Optional, Tuple
+
+from .const import RESPONSE_CACHE_MAX_BYTES, RESPONSE_CACHE_MAX_ENTRIES
+from .model.model import Response
+
+CacheKey = Tuple[str, str]
+
+
+def content_hash(body: bytes) -> str:
+    return hashlib.sha256(body).hexdigest()
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    response: Response
+    etag: Optional[str]
+    last_modified: Optional[str]
+    content_hash: Optional[str]
+    size: int
+    stored_at: float
+
+    @property
+    def has_validators(self) -> bool:
+        return self.etag is not None or self.last_modified is not None
+
+    def validation_headers(self) -> Mapping[str, str]:
+        headers = {}
+        if self.etag is not None:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified is not None:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class ResponseCache:
+    """Validation cache for GET responses, keyed by url and auth scope.
+
+    Entries are evicted least recently used first once either `max_entries`
+    or `max_bytes` is exceeded, and are dropped after `max_age` seconds when
+    it is set.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = RESPONSE_CACHE_MAX_ENTRIES,
+        max_bytes: int = RESPONSE_CACHE_MAX_BYTES,
+        max_age: Optional[float] = None,
+    ) -> None:
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._max_age = max_age
+        self._entries: OrderedDict[CacheKey, CachedResponse] = OrderedDict()
+        self._size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def key(url: str, headers: Mapping[str, str]) -> CacheKey:
+        authorization = headers.get("Authorization", "")
+        return (url, content_hash(authorization.encode()) if authorization else "")
+
+    def get(self, key: CacheKey) -> Optional[CachedResponse]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if self._max_age is not None and time.monotonic() - entry.stored_at > (
+            self._max_age
+        ):
+            self._remove(key)
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def hit(self, key: CacheKey, entry: CachedResponse) -> Response:
+        self.hits += 1
+        self._entries[key] = replace(entry, stored_at=time.monotonic())
+        return entry.response
+
+    def store(
+        self,
+        key: CacheKey,
+        response: Response,
+        body: bytes,
+        etag: Optional[str],
+        last_modified: Optional[str],
+    ) -> None:
+        self.misses += 1
+        self._remove(key)
+        if len(body) > self._max_bytes:
+            return
+
+        self._entries[key] = CachedResponse(
+            response=response,
+            etag=etag,
+            last_modified=last_modified,
+            content_hash=None
+            if etag is not None or last_modified is not None
+            else content_hash(body),
+            size=len(body),
+            stored_at=time.monotonic(),
+        )
+        self._size += len(body)
+        self._evict()
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._size = 0
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "entries": len(self._entries),
+            "bytes": self._size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+    def _remove(self, key: CacheKey) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._size -= entry.size
+
+    def _evict(self) -> None:
+        while self._entries and (
+            len(self._entries) > self._max_entries or self._size > self._max_bytes
+        ):
+            _, entry = self._entries.popitem(last=False)
+            self._size -= entry.size
+            self.evictions += 1
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Mapping, Set
+
+from .const import STALE_RETRY_BASE_INTERVAL, STALE_RETRY_MAX_INTERVAL
+
+SCHEDULE_TOLERANCE = timedelta(seconds=1)
+
+
+@dataclass(frozen=True)
+class RefreshSchedule:
+    interval: timedelta
+    aligned: bool = False
+
+    def next_run(self, now: datetime) -> datetime:
+        if not self.aligned:
+            return now + self.interval
+
+        midnight = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        next_midnight = midnight + timedelta(days=1)
+        periods = (now - midnight) // self.interval + 1
+        return min(midnight + periods * self.interval, next_midnight)
+
+
+class RefreshScheduler:
+    """Keeps track of when each data key is due for a refresh.
+
+    Keys that fail are retried with an exponential backoff instead of on
+    their regular schedule, until they succeed again.
+    """
+
+    def __init__(
+        self,
+        schedules: Mapping[str, RefreshSchedule],
+        retry_base: timedelta = STALE_RETRY_BASE_INTERVAL,
+        retry_max: timedelta = STALE_RETRY_MAX_INTERVAL,
+    ) -> None:
+        self._schedules: Dict[str, RefreshSchedule] = dict(schedules)
+        self._next_runs: Dict[str, datetime] = {}
+        self._failures: Dict[str, int] = {}
+        self._retry_base = retry_base
+        self._retry_max = retry_max
+
+    @property
+    def keys(self) -> Set[str]:
+        return set(self._schedules)
+
+    def next_run(self, key: str) -> datetime | None:
+        return self._next_runs.get(key)
+
+    def update_schedules(
+        self, schedules: Mapping[str, RefreshSchedule], now: datetime
+    ) -> Set[str]:
+        changed = {
+            key
+            for key, schedule in schedules.items()
+            if self._schedules.get(key) != schedule
+        }
+        self._schedules = dict(schedules)
+        for key in changed:
+            if key in self._next_runs:
+                self._next_runs[key] = self._schedules[key].next_run(now)
+        return changed
+
+    def due_keys(self, now: datetime) -> Set[str]:
+        return {
+            key
+            for key in self._schedules
+            if key not in self._next_runs
+            or self._next_runs[key] <= now + SCHEDULE_TOLERANCE
+        }
+
+    def mark_refreshed(self, keys: Iterable[str], now: datetime) -> None:
+        for key in keys:
+            self._failures.pop(key, None)
+            self._next_runs[key] = self._schedules[key].next_run(now)
+
+    def mark_due(self, keys: Iterable[str], now: datetime) -> None:
+        for key in keys:
+            if key in self._schedules:
+                self._next_runs[key] = now
+
+    def mark_failed(self, keys: Iterable[str], now: datetime) -> None:
+        for key in keys:
+            failures = self._failures.get(key, 0) + 1
+            self._failures[key] = failures
+            self._next_runs[key] = now + self._retry_delay(failures)
+
+    def _retry_delay(self, failures: int) -> timedelta:
+        delay = self._retry_base
+        for _ in range(failures - 1):
+            if delay >= self._retry_max:
+                break
+            delay *= 2
+        return min(delay, self._retry_max)
+
+    def failures(self, key: str) -> int:
+        return self._failures.get(key, 0)
+
+    def time_until_next_run(self, now: datetime) -> timedelta:
+        if self.due_keys(now):
+            return timedelta(0)
+        return max(min(self._next_runs.values()) - now, timedelta(0))
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from datetime import date, datetime
-from typing import Mapping
+from typing import Any, Mapping, Optional, Tuple
 
 from homeassistant.components.sensor import SensorEntity
 from homeassistant.config_entries import ConfigEntry
@@ -11,20 +11,21 @@ from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.typing import StateType
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from custom_components.mealie.model.model import (
-    MealPlanResponse,
-    RecipeResponse,
-)
+from custom_components.mealie.model.compact import CompactRecipeResponse
+from custom_components.mealie.model.model import MealPlanResponse
+from custom_components.mealie.shopping_list import ShoppingListItem
 
 from .api import Api
 from .const import (
     CONF_API,
     CONF_COORDINATOR,
     DOMAIN,
+    ENDPOINT_METRICS_SENSOR_TYPES,
     SENSOR_TYPES,
     MealieSensorEnitityDescription,
     meal_plan_sensor_entity_description,
     next_meal_sensor_entitity_description,
+    shopping_list_sensor_entity_description,
 )
 from .coordinator import MealieDataUpdateCoordinator
 
@@ -58,63 +59,97 @@ async def async_setup_entry(
                 mealie_coordinator=mealie_coordinator,
                 description=meal_plan_sensor_entity_description,
             ),
+            MealieShoppingListSensor(
+                mealie_api=mealie_api,
+                mealie_coordinator=mealie_coordinator,
+                description=shopping_list_sensor_entity_description,
+            ),
         ]
     )
 
+    add_entitities_callback(
+        MealieEndpointMetricsSensor(
+            mealie_api=mealie_api,
+            mealie_coordinator=mealie_coordinator,
+            description=description,
+        )
+        for description in ENDPOINT_METRICS_SENSOR_TYPES
+    )
+
     return True
 
 
-class MealieSensor(SensorEntity, CoordinatorEntity):
+class MealieDataSensor(SensorEntity, CoordinatorEntity):
+    """Base for sensors backed by a coordinator data key.
+
+    The last good value is kept while refreshes fail, until it is older than
+    the configured staleness bound.
+    """
+
+    _fixed_entity_id = True
+
     def __init__(
         self,
         mealie_api: Api,
         mealie_coordinator: MealieDataUpdateCoordinator,
         description: MealieSensorEnitityDescription,
     ) -> None:
-        super().__init__(coordinator=mealie_coordinator)
+        super().__init__(coordinator=mealie_coordinator, context=description.key)
         self._mealie_api = mealie_api
         self.entity_description = description
-        self.entity_id = f"sensor.mealie_{description.key}"
+        if self._fixed_entity_id:
+            self.entity_id = f"sensor.mealie_{description.key}"
+        else:
+            self._attr_unique_id = (
+                f"{mealie_coordinator.config_entry.entry_id}_{description.key}"
+            )
+        self._derived_version: Optional[int] = None
+        self._derived_attributes: Mapping[str, Any] = {}
 
     @property
-    def native_value(self) -> StateType | date | datetime:
+    def _value(self) -> Any:
         return (
             self.coordinator.data.get(self.entity_description.key)
             if self.coordinator.data
             else None
         )
 
+    def _derive_attributes(self, value: Any) -> Mapping[str, Any]:
+        return {}
 
-class MealieMealPlanSensor(SensorEntity, CoordinatorEntity):
-    def __init__(
-        self,
-        mealie_api: Api,
-        mealie_coordinator: MealieDataUpdateCoordinator,
-        description: MealieSensorEnitityDescription,
-    ) -> None:
-        super().__init__(coordinator=mealie_coordinator)
-        self._mealie_api = mealie_api
-        self.entity_description = description
-        self.entity_id = f"sensor.mealie_{description.key}"
+    @property
+    def available(self) -> bool:
+        return self.coordinator.is_available(self.entity_description.key)
 
+    @property
+    def extra_state_attributes(self) -> Mapping[str, Any]:
+        version = self.coordinator.data_version(self.entity_description.key)
+        if version != self._derived_version:
+            self._derived_version = version
+            self._derived_attributes = self._derive_attributes(self._value)
+
+        age = self.coordinator.data_age(self.entity_description.key)
+        return {
+            "age": round(age.total_seconds()) if age is not None else None,
+            **self._derived_attributes,
+        }
+
+
+class MealieSensor(MealieDataSensor):
     @property
     def native_value(self) -> StateType | date | datetime:
-        meal_plan_response: MealPlanResponse = (
-            self.coordinator.data.get(self.entity_description.key)
-            if self.coordinator.data
-            else None
-        )
+        return self._value
 
-        return meal_plan_response.group if meal_plan_response else None
 
+class MealieMealPlanSensor(MealieDataSensor):
     @property
-    def extra_state_attributes(self) -> Mapping[str, str]:
-        meal_plan_response: MealPlanResponse = (
-            self.coordinator.data.get(self.entity_description.key)
-            if self.coordinator.data
-            else None
-        )
+    def native_value(self) -> StateType | date | datetime:
+        meal_plan_response: Optional[MealPlanResponse] = self._value
+        return meal_plan_response.group if meal_plan_response else None
 
+    def _derive_attributes(
+        self, meal_plan_response: Optional[MealPlanResponse]
+    ) -> Mapping[str, Any]:
         return {
             "start_date": datetime.combine(
                 meal_plan_response.start_date, datetime.min.time()
@@ -129,37 +164,60 @@ class MealieMealPlanSensor(SensorEntity, CoordinatorEntity):
         }
 
 
-class MealieNextmealSensor(SensorEntity, CoordinatorEntity):
+class MealieNextmealSensor(MealieDataSensor):
+    @property
+    def native_value(self) -> StateType | date | datetime:
+        recipe_response: Optional[CompactRecipeResponse] = self._value
+        return recipe_response.name if recipe_response else None
+
+    def _derive_attributes(
+        self, recipe_response: Optional[CompactRecipeResponse]
+    ) -> Mapping[str, Any]:
+        slug = recipe_response.slug if recipe_response else None
+        host = self.coordinator.config_entry.data.get(CONF_HOST)
+
+        return {"url": f"{host}/recipe/{slug}" if slug and host else None}
+
+
+class MealieShoppingListSensor(MealieDataSensor):
+    _fixed_entity_id = False
+
+    @property
+    def native_value(self) -> StateType | date | datetime:
+        items: Optional[Tuple[ShoppingListItem, ...]] = self._value
+        return len(items) if items is not None else None
+
+    def _derive_attributes(
+        self, items: Optional[Tuple[ShoppingListItem, ...]]
+    ) -> Mapping[str, Any]:
+        return {"items": [item.as_dict() for item in items or ()]}
+
+
+class MealieEndpointMetricsSensor(SensorEntity, CoordinatorEntity):
     def __init__(
         self,
         mealie_api: Api,
         mealie_coordinator: MealieDataUpdateCoordinator,
         description: MealieSensorEnitityDescription,
     ) -> None:
-        super().__init__(coordinator=mealie_coordinator)
+        super().__init__(coordinator=mealie_coordinator, context=description.endpoint)
         self._mealie_api = mealie_api
         self.entity_description = description
-        self.entity_id = f"sensor.mealie_{description.key}"
-
-    @property
-    def native_value(self) -> StateType | date | datetime:
-        recipe_response = (
-            self.coordinator.data.get(self.entity_description.key)
-            if self.coordinator.data
-            else None
+        self._attr_unique_id = (
+            f"{mealie_coordinator.config_entry.entry_id}_{description.key}"
         )
 
-        return recipe_response.name if recipe_response else None
-
-    @property
-    def extra_state_attributes(self) -> Mapping[str, str]:
-        recipe_response: RecipeResponse = (
-            self.coordinator.data.get(self.entity_description.key)
-            if self.coordinator.data
-            else None
+    def _metrics(self) -> Mapping[str, Any]:
+        metrics = self.coordinator.mealie_api.metrics.get(
+            self.entity_description.endpoint
         )
+        return metrics.as_dict() if metrics else {}
 
-        slug = recipe_response.slug if recipe_response else None
-        host = self.coordinator.config_entry.data.get(CONF_HOST)
+    @property
+    def native_value(self) -> StateType | date | datetime:
+        last_latency = self._metrics().get("last_latency")
+        return round(last_latency * 1000, 1) if last_latency is not None else None
 
-        return {"url": f"{host}/recipe/{slug}" if slug and host else None}
+    @property
+    def extra_state_attributes(self) -> Mapping[str, Any]:
+        return self._metrics()
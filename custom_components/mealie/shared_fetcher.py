@@ -0,0 +1,103 @@
+import time
+from typing import Any, Awaitable, Callable, Dict, Mapping, Optional, Set, Tuple
+
+from homeassistant.core import HomeAssistant, callback
+
+from .const import CONF_SHARED_FETCHERS, DOMAIN, SHARED_RESULT_MAX_AGE
+from .recipe_cache import RecipeCache
+from .single_flight import SingleFlight
+
+Fetch = Callable[[], Awaitable[Mapping[str, Any]]]
+Receiver = Callable[[str, Mapping[str, Any]], None]
+
+
+class SharedFetcher:
+    """Fetches group-wide data once for every config entry on a host and group.
+
+    A result fetched on behalf of one entry is fanned out to the other
+    subscribed entries, so their own schedules see the key as fresh. The
+    entries also share one recipe cache, so each recipe is downloaded once.
+    """
+
+    def __init__(self, max_age: float = SHARED_RESULT_MAX_AGE) -> None:
+        self._max_age = max_age
+        self._single_flight = SingleFlight()
+        self._results: Dict[str, Tuple[float, Mapping[str, Any]]] = {}
+        self._receivers: Dict[str, Receiver] = {}
+        self._waiting: Dict[str, Set[str]] = {}
+        self.recipe_cache = RecipeCache()
+        self.fetches = 0
+        self.reused = 0
+
+    @property
+    def subscribers(self) -> int:
+        return len(self._receivers)
+
+    @callback
+    def async_subscribe(self, entry_id: str, receive: Receiver) -> Callable[[], None]:
+        self._receivers[entry_id] = receive
+
+        @callback
+        def unsubscribe() -> None:
+            self._receivers.pop(entry_id, None)
+
+        return unsubscribe
+
+    def invalidate(self, key: str) -> None:
+        self._results.pop(key, None)
+
+    async def fetch(self, entry_id: str, key: str, fetch: Fetch) -> Mapping[str, Any]:
+        cached = self._results.get(key)
+        if cached is not None and time.monotonic() - cached[0] < self._max_age:
+            self.reused += 1
+            return cached[1]
+
+        waiting = self._waiting.setdefault(key, set())
+        waiting.add(entry_id)
+        try:
+            return await self._single_flight.run(key, lambda: self._fetch(key, fetch))
+        finally:
+            waiting.discard(entry_id)
+
+    async def _fetch(self, key: str, fetch: Fetch) -> Mapping[str, Any]:
+        result = await fetch()
+        self.fetches += 1
+        self._results[key] = (time.monotonic(), result)
+
+        waiting = self._waiting.get(key, set())
+        for entry_id, receive in list(self._receivers.items()):
+            if entry_id not in waiting:
+                receive(key, result)
+        return result
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "subscribers": self.subscribers,
+            "fetches": self.fetches,
+            "reused": self.reused + self._single_flight.saved,
+        }
+
+
+@callback
+def async_get_shared_fetcher(
+    hass: HomeAssistant, host: str, group: Optional[str]
+) -> Optional[SharedFetcher]:
+    if group is None:
+        return None
+
+    shared_fetchers: Dict[Tuple[str, str], SharedFetcher] = hass.data.setdefault(
+        DOMAIN, {}
+    ).setdefault(CONF_SHARED_FETCHERS, {})
+    return shared_fetchers.setdefault((host.rstrip("/"), group), SharedFetcher())
+
+
+@callback
+def async_release_shared_fetcher(
+    hass: HomeAssistant, shared_fetcher: SharedFetcher
+) -> None:
+    shared_fetchers: Dict[Tuple[str, str], SharedFetcher] = hass.data[DOMAIN].get(
+        CONF_SHARED_FETCHERS, {}
+    )
+    for key, fetcher in list(shared_fetchers.items()):
+        if fetcher is shared_fetcher and not fetcher.subscribers:
+            del shared_fetchers[key]
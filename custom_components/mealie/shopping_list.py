@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+from collections import Counter
+from dataclasses import dataclass
+from typing import Dict, Mapping, Optional, Tuple
+
+from .model.compact import CompactRecipeIngredient, CompactRecipeResponse
+from .model.model import MealPlanResponse
+
+IngredientKey = Tuple[str, str]
+
+
+@dataclass(frozen=True)
+class ShoppingListItem:
+    food: str
+    unit: Optional[str]
+    quantity: float
+
+    def as_dict(self) -> Dict[str, object]:
+        return {"food": self.food, "unit": self.unit, "quantity": self.quantity}
+
+
+def planned_servings(meal_plan: Optional[MealPlanResponse]) -> Dict[str, int]:
+    """Counts how often each recipe is planned."""
+    if meal_plan is None:
+        return {}
+    return dict(
+        Counter(
+            meal.slug
+            for plan_day in meal_plan.plan_days
+            for meal in plan_day.meals
+            if meal.slug
+        )
+    )
+
+
+def _ingredient_key(
+    ingredient: CompactRecipeIngredient,
+) -> Optional[Tuple[IngredientKey, str, Optional[str]]]:
+    food = (ingredient.food.name if ingredient.food else None) or ingredient.note
+    if not food:
+        return None
+    unit = ingredient.unit.name if ingredient.unit else None
+    return (food.strip().lower(), (unit or "").strip().lower()), food.strip(), unit
+
+
+class ShoppingList:
+    """Ingredients of the planned recipes, merged by food and unit.
+
+    The totals are kept per ingredient, so an update only re-aggregates the
+    recipes whose instance or planned count changed.
+    """
+
+    def __init__(self) -> None:
+        self._recipes: Dict[str, Tuple[CompactRecipeResponse, int]] = {}
+        self._totals: Dict[IngredientKey, float] = {}
+        self._references: Counter[IngredientKey] = Counter()
+        self._labels: Dict[IngredientKey, Tuple[str, Optional[str]]] = {}
+        self._items: Tuple[ShoppingListItem, ...] = ()
+        self.aggregated = 0
+
+    @property
+    def items(self) -> Tuple[ShoppingListItem, ...]:
+        return self._items
+
+    def update(
+        self,
+        servings: Mapping[str, int],
+        recipes: Mapping[str, CompactRecipeResponse],
+    ) -> bool:
+        changed = False
+        for slug in self._recipes.keys() - servings.keys():
+            self._apply(*self._recipes.pop(slug), sign=-1)
+            changed = True
+
+        for slug, count in servings.items():
+            recipe = recipes[slug]
+            previous = self._recipes.get(slug)
+            if previous is not None:
+                if previous[0] is recipe and previous[1] == count:
+                    continue
+                self._apply(*previous, sign=-1)
+            self._apply(recipe, count, sign=1)
+            self._recipes[slug] = (recipe, count)
+            changed = True
+
+        if changed:
+            self._items = tuple(
+                ShoppingListItem(
+                    food=self._labels[key][0],
+                    unit=self._labels[key][1],
+                    quantity=round(total, 3),
+                )
+                for key, total in sorted(self._totals.items())
+            )
+        return changed
+
+    def _apply(self, recipe: CompactRecipeResponse, count: int, sign: int) -> None:
+        self.aggregated += 1
+        for ingredient in recipe.recipe_ingredient:
+            parsed = _ingredient_key(ingredient)
+            if parsed is None:
+                continue
+            key, food, unit = parsed
+            quantity = (
+                0 if ingredient.disable_amount else ingredient.quantity or 0
+            ) * count
+
+            self._references[key] += sign
+            if self._references[key] <= 0:
+                del self._references[key]
+                del self._totals[key]
+                del self._labels[key]
+                continue
+            self._totals[key] = self._totals.get(key, 0) + sign * quantity
+            self._labels.setdefault(key, (food, unit))
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "recipes": len(self._recipes),
+            "items": len(self._items),
+            "aggregated": self.aggregated,
+        }
@@ -0,0 +1,37 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """Shares one in-flight call between concurrent callers with the same key."""
+
+    def __init__(self) -> None:
+        self._in_flight: Dict[Hashable, "asyncio.Future[Any]"] = {}
+        self.calls = 0
+        self.saved = 0
+
+    async def run(self, key: Hashable, call: Callable[[], Awaitable[T]]) -> T:
+        future = self._in_flight.get(key)
+        if future is None:
+            self.calls += 1
+            future = asyncio.ensure_future(call())
+            self._in_flight[key] = future
+            future.add_done_callback(lambda done: self._forget(key, done))
+        else:
+            self.saved += 1
+        return await asyncio.shield(future)
+
+    def _forget(self, key: Hashable, future: "asyncio.Future[Any]") -> None:
+        if self._in_flight.get(key) is future:
+            del self._in_flight[key]
+        if not future.cancelled():
+            future.exception()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "calls": self.calls,
+            "saved": self.saved,
+            "in_flight": len(self._in_flight),
+        }
@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+from datetime import datetime
+import logging
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    DOMAIN,
+    SENSOR_MEAL_PLAN_KEY,
+    SENSOR_NO_RECIPES_KEY,
+    SENSOR_NO_UNCATEGORIZED_RECIPES_KEY,
+    SENSOR_NO_UNTAGGED_RECIPES_KEY,
+    SENSOR_SHOPPING_LIST_KEY,
+    SENSOR_TODAY_RECIPE_KEY,
+    SNAPSHOT_SAVE_DELAY,
+    SNAPSHOT_STORAGE_VERSION,
+)
+from .model.compact import CompactRecipeResponse
+from .model.model import Meal, MealPlanResponse, PlanDay, parse_date
+from .shopping_list import ShoppingListItem
+
+_LOGGER = logging.getLogger(__name__)
+
+STATISTICS_KEYS = (
+    SENSOR_NO_RECIPES_KEY,
+    SENSOR_NO_UNCATEGORIZED_RECIPES_KEY,
+    SENSOR_NO_UNTAGGED_RECIPES_KEY,
+)
+
+
+def pack_meal_plan(meal_plan: Optional[MealPlanResponse]) -> Optional[List[Any]]:
+    if meal_plan is None:
+        return None
+    return [
+        meal_plan.group,
+        meal_plan.start_date.isoformat(),
+        meal_plan.end_date.isoformat(),
+        [
+            [
+                plan_day.date.isoformat(),
+                [[meal.slug, meal.name, meal.description] for meal in plan_day.meals],
+            ]
+            for plan_day in meal_plan.plan_days
+        ],
+        meal_plan.uid,
+        meal_plan.shopping_list,
+    ]
+
+
+def unpack_meal_plan(packed: Optional[List[Any]]) -> Optional[MealPlanResponse]:
+    if packed is None:
+        return None
+    group, start_date, end_date, plan_days, uid, shopping_list = packed
+    return MealPlanResponse(
+        group=group,
+        start_date=parse_date(start_date),
+        end_date=parse_date(end_date),
+        plan_days=[
+            PlanDay(
+                date=parse_date(day),
+                meals=[
+                    Meal(slug=slug, name=name, description=description)
+                    for slug, name, description in meals
+                ],
+            )
+            for day, meals in plan_days
+        ],
+        uid=uid,
+        shopping_list=shopping_list,
+    )
+
+
+def pack_data(data: Mapping[str, Any]) -> Dict[str, Any]:
+    recipe_today: Optional[CompactRecipeResponse] = data.get(SENSOR_TODAY_RECIPE_KEY)
+    packed: Dict[str, Any] = {key: data[key] for key in STATISTICS_KEYS if key in data}
+    if SENSOR_MEAL_PLAN_KEY in data:
+        packed[SENSOR_MEAL_PLAN_KEY] = pack_meal_plan(data[SENSOR_MEAL_PLAN_KEY])
+    if SENSOR_SHOPPING_LIST_KEY in data:
+        packed[SENSOR_SHOPPING_LIST_KEY] = [
+            [item.food, item.unit, item.quantity]
+            for item in data[SENSOR_SHOPPING_LIST_KEY]
+        ]
+    if SENSOR_TODAY_RECIPE_KEY in data:
+        packed[SENSOR_TODAY_RECIPE_KEY] = (
+            recipe_today.to_json() if recipe_today else None
+        )
+    return packed
+
+
+def unpack_data(packed: Mapping[str, Any]) -> Dict[str, Any]:
+    data: Dict[str, Any] = {
+        key: packed[key] for key in STATISTICS_KEYS if key in packed
+    }
+    if SENSOR_MEAL_PLAN_KEY in packed:
+        data[SENSOR_MEAL_PLAN_KEY] = unpack_meal_plan(packed[SENSOR_MEAL_PLAN_KEY])
+    if SENSOR_SHOPPING_LIST_KEY in packed:
+        data[SENSOR_SHOPPING_LIST_KEY] = tuple(
+            ShoppingListItem(food=food, unit=unit, quantity=quantity)
+            for food, unit, quantity in packed[SENSOR_SHOPPING_LIST_KEY]
+        )
+    if SENSOR_TODAY_RECIPE_KEY in packed:
+        recipe_today = packed[SENSOR_TODAY_RECIPE_KEY]
+        data[SENSOR_TODAY_RECIPE_KEY] = (
+            CompactRecipeResponse.from_json(recipe_today) if recipe_today else None
+        )
+    return data
+
+
+class SnapshotStore:
+    """Persists the last coordinator data so entities can start from it.
+
+    Model objects are stored in a compact positional form and writes are
+    delayed, so a burst of refreshes results in a single write.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry_id: str,
+        save_delay: float = SNAPSHOT_SAVE_DELAY,
+    ) -> None:
+        self._store: Store = Store(
+            hass, SNAPSHOT_STORAGE_VERSION, f"{DOMAIN}.snapshot.{entry_id}"
+        )
+        self._save_delay = save_delay
+
+    async def async_load(
+        self,
+    ) -> Optional[Tuple[Dict[str, Any], Dict[str, datetime]]]:
+        stored = await self._store.async_load()
+        if not stored:
+            return None
+
+        try:
+            data = unpack_data(stored["data"])
+            refreshed_at = {
+                key: dt_util.parse_datetime(timestamp)
+                for key, timestamp in stored["refreshed_at"].items()
+            }
+        except (KeyError, TypeError, ValueError) as error:
+            _LOGGER.debug("Ignoring unreadable snapshot: %s", error)
+            return None
+
+        return data, {
+            key: timestamp
+            for key, timestamp in refreshed_at.items()
+            if timestamp is not None
+        }
+
+    @callback
+    def async_schedule_save(
+        self,
+        data: Callable[[], Mapping[str, Any]],
+        refreshed_at: Callable[[], Mapping[str, datetime]],
+    ) -> None:
+        self._store.async_delay_save(
+            lambda: {
+                "data": pack_data(data()),
+                "refreshed_at": {
+                    key: timestamp.isoformat()
+                    for key, timestamp in refreshed_at().items()
+                },
+            },
+            self._save_delay,
+        )
+
+    async def async_remove(self) -> None:
+        await self._store.async_remove()
@@ -1,18 +1,44 @@
-from typing import Optional
+from datetime import datetime, timezone
+import logging
+from typing import Dict, Optional
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_ACCESS_TOKEN
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.debounce import Debouncer
+import jwt
 
+from .const import TOKEN_WRITE_DELAY
 from .exception import NoTokenException
 
 
+def parse_token_expiry(token: Optional[str]) -> Optional[datetime]:
+    if not token:
+        return None
+    try:
+        claims = jwt.decode(token, options={"verify_signature": False})
+    except jwt.InvalidTokenError:
+        return None
+
+    expiry = claims.get("exp")
+    return (
+        datetime.fromtimestamp(expiry, tz=timezone.utc)
+        if isinstance(expiry, (int, float))
+        else None
+    )
+
+
 class TokenRepository:
     def __init__(self) -> None:
         self._token: Optional[str] = None
+        self._token_expiry: Optional[datetime] = None
 
-    async def set_token(self, token: str) -> None:
+    def _cache_token(self, token: Optional[str]) -> None:
         self._token = token
+        self._token_expiry = parse_token_expiry(token)
+
+    async def set_token(self, token: str) -> None:
+        self._cache_token(token)
 
     async def get_token(self) -> str:
         if self._token:
@@ -20,27 +46,81 @@ class TokenRepository:
         else:
             raise NoTokenException()
 
+    async def get_token_expiry(self) -> Optional[datetime]:
+        return self._token_expiry
+
     async def purge_token(self) -> None:
-        self._token = None
+        self._cache_token(None)
+
+    def stats(self) -> Dict[str, int]:
+        return {}
 
 
 class HomeAssistantTokenRepository(TokenRepository):
     # TODO seperate this class from main mealie api
 
-    def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry: ConfigEntry,
+        write_delay: float = TOKEN_WRITE_DELAY,
+    ) -> None:
+        super().__init__()
         self._hass = hass
         self._entry = entry
-        super().__init__()
+        self._cache_token(entry.data.get(CONF_ACCESS_TOKEN))
+        self._write_pending = False
+        self._persisted_token: Optional[str] = None
+        self._debouncer = Debouncer(
+            hass,
+            logging.getLogger(__name__),
+            cooldown=write_delay,
+            immediate=False,
+            function=self._async_write,
+        )
+        self.writes = 0
+        self.writes_avoided = 0
 
     async def set_token(self, token: str) -> None:
-        data = {**self._entry.data, CONF_ACCESS_TOKEN: token}
+        self._cache_token(token)
+        await self._async_schedule_write()
 
-        self._hass.config_entries.async_update_entry(self._entry, data=data)
+    async def purge_token(self) -> None:
+        self._cache_token(None)
+        await self._async_schedule_write()
 
-    async def get_token(self) -> str:
-        return self._entry.data[CONF_ACCESS_TOKEN]
+    @callback
+    def async_flush(self) -> None:
+        self._debouncer.async_cancel()
+        if self._write_pending:
+            self._async_write()
 
-    async def purge_token(self) -> None:
-        data = {**self._entry.data, CONF_ACCESS_TOKEN: None}
+    def stats(self) -> Dict[str, int]:
+        return {"writes": self.writes, "writes_avoided": self.writes_avoided}
+
+    def _is_persisted(self) -> bool:
+        return self._entry.data.get(CONF_ACCESS_TOKEN) == self._token
+
+    async def _async_schedule_write(self) -> None:
+        if self._write_pending or self._is_persisted():
+            self.writes_avoided += 1
+        if self._is_persisted():
+            return
+
+        if not self._write_pending:
+            self._persisted_token = self._entry.data.get(CONF_ACCESS_TOKEN)
+        self._write_pending = True
+        await self._debouncer.async_call()
+
+    @callback
+    def _async_write(self) -> None:
+        self._write_pending = False
+        if self._is_persisted():
+            return
+        if self._entry.data.get(CONF_ACCESS_TOKEN) != self._persisted_token:
+            # A reauth stored a new token meanwhile; ours is outdated.
+            return
 
+        data = {**self._entry.data, CONF_ACCESS_TOKEN: self._token}
         self._hass.config_entries.async_update_entry(self._entry, data=data)
+        self.writes += 1
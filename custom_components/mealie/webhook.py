@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import logging
+from typing import Any, Awaitable, Callable, Mapping, Set
+
+from aiohttp import web
+from homeassistant.components import webhook
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_WEBHOOK_ID
+from homeassistant.core import HomeAssistant, callback
+
+from .const import (
+    DOMAIN,
+    SENSOR_MEAL_PLAN_KEY,
+    SENSOR_NO_RECIPES_KEY,
+    SENSOR_TODAY_RECIPE_KEY,
+)
+from .coordinator import MealieDataUpdateCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+Handler = Callable[[HomeAssistant, str, web.Request], Awaitable[None]]
+
+
+def webhook_keys(payload: Mapping[str, Any]) -> Set[str]:
+    """Maps a Mealie notification to the data keys it affects.
+
+    Mealie's notifier posts an Apprise style json body with a title and a
+    message. Anything that isn't a meal plan change may have touched recipes,
+    so it refreshes every key that is derived from them.
+    """
+    text = f"{payload.get('title', '')} {payload.get('message', '')}".lower()
+    if "meal plan" in text or "mealplan" in text:
+        return {SENSOR_MEAL_PLAN_KEY}
+    return {SENSOR_NO_RECIPES_KEY, SENSOR_MEAL_PLAN_KEY, SENSOR_TODAY_RECIPE_KEY}
+
+
+def webhook_handler(mealie_coordinator: MealieDataUpdateCoordinator) -> Handler:
+    async def handle(
+        hass: HomeAssistant, webhook_id: str, request: web.Request
+    ) -> None:
+        try:
+            payload = await request.json()
+        except ValueError:
+            payload = {"message": await request.text()}
+        if not isinstance(payload, Mapping):
+            payload = {}
+
+        keys = webhook_keys(payload)
+        _LOGGER.debug("Mealie notification %s refreshes %s", payload, keys)
+        if SENSOR_TODAY_RECIPE_KEY in keys:
+            mealie_coordinator.async_invalidate_recipes()
+        mealie_coordinator.async_handle_push(keys)
+
+    return handle
+
+
+@callback
+def async_register_webhook(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    mealie_coordinator: MealieDataUpdateCoordinator,
+) -> Callable[[], None]:
+    """Registers the entry's webhook and returns a callback removing it."""
+    webhook_id = entry.data.get(CONF_WEBHOOK_ID)
+    if webhook_id is None:
+        webhook_id = webhook.async_generate_id()
+        hass.config_entries.async_update_entry(
+            entry, data={**entry.data, CONF_WEBHOOK_ID: webhook_id}
+        )
+
+    webhook.async_register(
+        hass, DOMAIN, entry.title, webhook_id, webhook_handler(mealie_coordinator)
+    )
+    _LOGGER.info(
+        "Point Mealie's notifier at %s to push changes",
+        webhook.async_generate_path(webhook_id),
+    )
+
+    @callback
+    def _async_unregister() -> None:
+        webhook.async_unregister(hass, webhook_id)
+
+    return _async_unregister
@@ -1,12 +1,17 @@
-from datetime import date
-from typing import Union
+import asyncio
+from datetime import date, datetime, timedelta, timezone
+from typing import Mapping, Optional, Union
 
 from aiohttp.client import ClientSession
+import jwt
 import pytest
 from pytest_mock import MockerFixture
 
 from custom_components.mealie.api import Api, ApiException, ParseException
-from custom_components.mealie.exception import InternalClientException
+from custom_components.mealie.exception import (
+    AuthenticationException,
+    InternalClientException,
+)
 from custom_components.mealie.http_client import HttpClient
 from custom_components.mealie.model.model import (
     Meal,
@@ -16,6 +21,8 @@ from custom_components.mealie.model.model import (
     Status,
     TokenResponse,
 )
+from custom_components.mealie.recipe_cache import RecipeCache
+from custom_components.mealie.resilience import Deadline
 from custom_components.mealie.token_repository import TokenRepository
 
 
@@ -282,3 +289,324 @@ async def test_get_meal_plan_this_week(
         uid=27,
         shopping_list=25,
     )
+
+
+async def test_unauthorized_get_refreshes_token_once(
+    mocker: MockerFixture, http_client: HttpClient
+) -> None:
+    unauthorized_response = Response(
+        status=Status.FAILURE, status_code=401, data={"detail": "unauthorized"}
+    )
+    statistics_response = Response(
+        status=Status.SUCCESS,
+        status_code=200,
+        data={
+            "totalRecipes": 10,
+            "totalUsers": 1,
+            "totalGroups": 1,
+            "uncategorizedRecipes": 2,
+            "untaggedRecipes": 3,
+        },
+    )
+    refreshed_token = {"access_token": "refreshed_token", "token_type": "bearer"}
+
+    async def get(
+        url: str,
+        headers: Mapping[str, str],
+        endpoint: Optional[str] = None,
+        deadline: Optional[Deadline] = None,
+    ) -> Response:
+        if url == "/api/auth/refresh":
+            await asyncio.sleep(0.01)
+            return Response(
+                status=Status.SUCCESS, status_code=200, data=refreshed_token
+            )
+        if headers["Authorization"] == "Bearer expired_token":
+            return unauthorized_response
+        return statistics_response
+
+    http_get = mocker.patch(
+        "custom_components.mealie.http_client.HttpClient.get", side_effect=get
+    )
+
+    token_repository = TokenRepository()
+    await token_repository.set_token("expired_token")
+    api = Api(
+        http_client=http_client,
+        base_url="",
+        token_repository=token_repository,
+    )
+
+    first, second = await asyncio.gather(api.get_statistics(), api.get_statistics())
+
+    assert first.total_recipes == second.total_recipes == 10
+    assert await token_repository.get_token() == "refreshed_token"
+    refresh_calls = [
+        call
+        for call in http_get.call_args_list
+        if call.kwargs["url"] == "/api/auth/refresh"
+    ]
+    assert len(refresh_calls) == 1
+
+
+async def test_rejected_token_raises_authentication_exception(
+    mocker: MockerFixture, http_client: HttpClient
+) -> None:
+    mocker.patch(
+        "custom_components.mealie.http_client.HttpClient.get",
+        return_value=Response(
+            status=Status.FAILURE, status_code=401, data={"detail": "unauthorized"}
+        ),
+    )
+
+    token_repository = TokenRepository()
+    await token_repository.set_token("revoked_token")
+    api = Api(
+        http_client=http_client,
+        base_url="",
+        token_repository=token_repository,
+    )
+
+    with pytest.raises(AuthenticationException):
+        await api.get_statistics()
+    assert not api.token_refresh_history[-1]["succeeded"]
+
+
+async def test_unavailable_refresh_endpoint_raises_internal_client_exception(
+    mocker: MockerFixture, http_client: HttpClient
+) -> None:
+    mocker.patch(
+        "custom_components.mealie.http_client.HttpClient.get",
+        return_value=Response(
+            status=Status.FAILURE, status_code=503, data={"detail": "restarting"}
+        ),
+    )
+
+    token_repository = TokenRepository()
+    await token_repository.set_token("token")
+    api = Api(
+        http_client=http_client,
+        base_url="",
+        token_repository=token_repository,
+    )
+
+    with pytest.raises(InternalClientException):
+        await api.get_refresh_token()
+    assert not api.token_refresh_history[-1]["succeeded"]
+
+
+async def test_ensure_valid_token_skips_refresh_for_fresh_token(
+    mocker: MockerFixture, http_client: HttpClient
+) -> None:
+    refresh = mocker.patch("custom_components.mealie.api.Api.get_refresh_token")
+
+    token_repository = TokenRepository()
+    await token_repository.set_token(
+        jwt.encode({"exp": datetime.now(timezone.utc) + timedelta(hours=1)}, "secret")
+    )
+    api = Api(
+        http_client=http_client,
+        base_url="",
+        token_repository=token_repository,
+    )
+    await api.ensure_valid_token()
+    refresh.assert_not_called()
+
+    await token_repository.set_token(
+        jwt.encode({"exp": datetime.now(timezone.utc) + timedelta(minutes=1)}, "secret")
+    )
+    await api.ensure_valid_token()
+    refresh.assert_called_once()
+
+
+async def test_concurrent_identical_reads_share_one_request(
+    mocker: MockerFixture, http_client: HttpClient
+) -> None:
+    statistics_response = Response(
+        status=Status.SUCCESS,
+        status_code=200,
+        data={
+            "totalRecipes": 10,
+            "totalUsers": 1,
+            "totalGroups": 1,
+            "uncategorizedRecipes": 2,
+            "untaggedRecipes": 3,
+        },
+    )
+
+    async def get(
+        url: str,
+        headers: Mapping[str, str],
+        endpoint: Optional[str] = None,
+        deadline: Optional[Deadline] = None,
+    ) -> Response:
+        await asyncio.sleep(0.01)
+        return statistics_response
+
+    http_get = mocker.patch(
+        "custom_components.mealie.http_client.HttpClient.get", side_effect=get
+    )
+
+    token_repository = TokenRepository()
+    await token_repository.set_token("token")
+    api = Api(
+        http_client=http_client,
+        base_url="",
+        token_repository=token_repository,
+    )
+
+    results = await asyncio.gather(*(api.get_statistics() for _ in range(3)))
+    await api.get_statistics()
+
+    assert results[0] is results[1] is results[2]
+    assert http_get.call_count == 2
+    assert (await api.diagnostics())["single_flight"]["saved"] == 2
+
+
+async def test_get_recipes_bounds_concurrency_and_reuses_cached_recipes(
+    mocker: MockerFixture, http_client: HttpClient
+) -> None:
+    in_flight = 0
+    max_in_flight = 0
+    now = 0.0
+
+    async def get(
+        url: str,
+        headers: Mapping[str, str],
+        endpoint: Optional[str] = None,
+        deadline: Optional[Deadline] = None,
+    ) -> Response:
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        slug = url.rsplit("/", 1)[-1]
+        return Response(
+            status=Status.SUCCESS,
+            status_code=200,
+            data={
+                "id": 1,
+                "name": slug,
+                "slug": slug,
+                "dateAdded": "2021-11-29",
+                "dateUpdated": "2021-12-01T18:30:00",
+                "settings": {},
+            },
+        )
+
+    http_get = mocker.patch(
+        "custom_components.mealie.http_client.HttpClient.get", side_effect=get
+    )
+
+    token_repository = TokenRepository()
+    await token_repository.set_token("token")
+    api = Api(
+        http_client=http_client,
+        base_url="",
+        token_repository=token_repository,
+        recipe_cache=RecipeCache(ttl=60, clock=lambda: now),
+        recipe_concurrency=2,
+    )
+    slugs = [f"recipe-{index}" for index in range(5)]
+
+    recipes = await api.get_recipes(slugs + ["recipe-0"])
+    assert list(recipes) == slugs
+    assert max_in_flight == 2
+    assert http_get.call_count == 5
+
+    assert await api.get_recipes(slugs[:2]) == {
+        slug: recipes[slug] for slug in slugs[:2]
+    }
+    assert http_get.call_count == 5
+
+    now = 120.0
+    revalidated = await api.get_recipes(slugs[:1])
+    assert revalidated["recipe-0"] is recipes["recipe-0"]
+    assert http_get.call_count == 6
+    assert (await api.diagnostics())["recipe_cache"] == {
+        "entries": 5,
+        "hits": 2,
+        "revalidated": 1,
+        "misses": 5,
+        "evictions": 0,
+    }
+
+
+async def test_get_recipes_only_leaves_out_recipes_mealie_no_longer_has(
+    mocker: MockerFixture, http_client: HttpClient
+) -> None:
+    status_codes = {"kept": 200, "deleted": 404, "broken": 500}
+
+    async def get(
+        url: str,
+        headers: Mapping[str, str],
+        endpoint: Optional[str] = None,
+        deadline: Optional[Deadline] = None,
+    ) -> Response:
+        slug = url.rsplit("/", 1)[-1]
+        status_code = status_codes[slug]
+        return Response(
+            status=Status.SUCCESS if status_code == 200 else Status.FAILURE,
+            status_code=status_code,
+            data={
+                "id": 1,
+                "name": slug,
+                "slug": slug,
+                "dateAdded": "2021-11-29",
+                "dateUpdated": "2021-12-01T18:30:00",
+                "settings": {},
+            },
+        )
+
+    mocker.patch("custom_components.mealie.http_client.HttpClient.get", side_effect=get)
+
+    token_repository = TokenRepository()
+    await token_repository.set_token("token")
+    api = Api(
+        http_client=http_client,
+        base_url="",
+        token_repository=token_repository,
+    )
+
+    assert list(await api.get_recipes(["kept", "deleted"])) == ["kept"]
+    with pytest.raises(ApiException):
+        await api.get_recipes(["kept", "broken"])
+
+
+async def test_cached_recipes_outlive_the_polling_intervals(
+    mocker: MockerFixture, http_client: HttpClient
+) -> None:
+    now = 0.0
+    http_get = mocker.patch(
+        "custom_components.mealie.http_client.HttpClient.get",
+        return_value=Response(
+            status=Status.SUCCESS,
+            status_code=200,
+            data={
+                "id": 1,
+                "name": "meal1",
+                "slug": "meal1",
+                "dateAdded": "2021-11-29",
+                "dateUpdated": "2021-12-01T18:30:00",
+                "settings": {},
+            },
+        ),
+    )
+
+    token_repository = TokenRepository()
+    await token_repository.set_token("token")
+    api = Api(
+        http_client=http_client,
+        base_url="",
+        token_repository=token_repository,
+        recipe_cache=RecipeCache(clock=lambda: now),
+    )
+
+    for now in range(0, 23 * 3600, 30 * 60):
+        await api.get_recipes(["meal1"])
+    assert http_get.call_count == 1
+
+    now = 25 * 3600
+    await api.get_recipes(["meal1"])
+    assert http_get.call_count == 2
@@ -0,0 +1,505 @@
+import asyncio
+from datetime import date, datetime, timedelta
+import time
+from typing import Any
+from unittest.mock import MagicMock
+
+from aiohttp.client import ClientSession
+from homeassistant.exceptions import ConfigEntryAuthFailed
+from homeassistant.helpers.update_coordinator import UpdateFailed
+from homeassistant.util import dt as dt_util
+import pytest
+from pytest_mock import MockerFixture
+
+from custom_components.mealie.api import Api
+from custom_components.mealie.const import (
+    DEFAULT_STALENESS_BOUND,
+    FAILED_REFRESH_RETRY_INTERVAL,
+    SENSOR_MEAL_PLAN_KEY,
+    SENSOR_NO_RECIPES_KEY,
+    SENSOR_SHOPPING_LIST_KEY,
+    SENSOR_TODAY_RECIPE_KEY,
+    STALE_RETRY_BASE_INTERVAL,
+)
+from custom_components.mealie.coordinator import MealieDataUpdateCoordinator
+from custom_components.mealie.exception import (
+    ApiException,
+    AuthenticationException,
+    HttpException,
+    NotFoundException,
+    RequestTimeoutException,
+)
+from custom_components.mealie.http_client import HttpClient
+from custom_components.mealie.model.model import (
+    Meal,
+    MealPlanResponse,
+    PlanDay,
+    StatisticsResponse,
+)
+from custom_components.mealie.shared_fetcher import SharedFetcher
+from custom_components.mealie.token_repository import TokenRepository
+
+statistics = StatisticsResponse(
+    total_recipes=10,
+    total_users=1,
+    total_groups=1,
+    uncategorized_recipes=2,
+    untagged_recipes=3,
+)
+
+meal_plan = MealPlanResponse(
+    group="Test",
+    start_date=date(2021, 11, 29),
+    end_date=date(2021, 11, 30),
+    plan_days=[
+        PlanDay(
+            date=date(2021, 11, 29),
+            meals=[
+                Meal(slug=None, name="leftovers", description=None),
+                Meal(slug="meal1", name="meal1", description=None),
+            ],
+        ),
+        PlanDay(
+            date=date(2021, 11, 30),
+            meals=[Meal(slug="meal2", name="meal2", description=None)],
+        ),
+    ],
+    uid=27,
+    shopping_list=25,
+)
+
+
+def delayed(value: Any, delay: float = 0.1):
+    async def _delayed(*args, **kwargs) -> Any:
+        await asyncio.sleep(delay)
+        return value
+
+    return _delayed
+
+
+def recipe(slug: str) -> MagicMock:
+    recipe = MagicMock()
+    recipe.slug = slug
+    return recipe
+
+
+@pytest.fixture(scope="function")
+async def coordinator(loop, mocker: MockerFixture) -> MealieDataUpdateCoordinator:
+    mocker.patch(
+        "custom_components.mealie.coordinator.dt_util.now",
+        return_value=datetime(2021, 11, 29, 12, 0),
+    )
+    mocker.patch(
+        "custom_components.mealie.api.Api.ensure_valid_token", return_value=None
+    )
+
+    api = Api(
+        http_client=HttpClient(client_session=ClientSession()),
+        base_url="",
+        token_repository=TokenRepository(),
+    )
+    config_entry = MagicMock()
+    config_entry.options = {}
+    yield MealieDataUpdateCoordinator(
+        hass=MagicMock(), config_entry=config_entry, mealie_api=api
+    )
+
+
+async def test_update_data_fetches_concurrently(
+    mocker: MockerFixture, coordinator: MealieDataUpdateCoordinator
+) -> None:
+    mocker.patch(
+        "custom_components.mealie.api.Api.get_statistics",
+        side_effect=delayed(statistics),
+    )
+    mocker.patch(
+        "custom_components.mealie.api.Api.get_meal_plan_this_week",
+        side_effect=delayed(meal_plan),
+    )
+    mocker.patch(
+        "custom_components.mealie.api.Api.get_recipe",
+        side_effect=delayed(recipe("meal1")),
+    )
+
+    start = time.perf_counter()
+    data = await coordinator._async_update_data()
+    elapsed = time.perf_counter() - start
+
+    assert elapsed < 0.28
+    assert data[SENSOR_NO_RECIPES_KEY] == 10
+    assert data[SENSOR_TODAY_RECIPE_KEY].slug == "meal1"
+    assert data[SENSOR_MEAL_PLAN_KEY] == meal_plan
+    assert set(coordinator.endpoint_timings) == {
+        "refresh_token",
+        SENSOR_NO_RECIPES_KEY,
+        SENSOR_TODAY_RECIPE_KEY,
+        SENSOR_MEAL_PLAN_KEY,
+        SENSOR_SHOPPING_LIST_KEY,
+    }
+
+
+async def test_update_data_only_refreshes_due_keys(
+    mocker: MockerFixture, coordinator: MealieDataUpdateCoordinator
+) -> None:
+    mocker.patch(
+        "custom_components.mealie.api.Api.get_statistics", return_value=statistics
+    )
+    get_meal_plan = mocker.patch(
+        "custom_components.mealie.api.Api.get_meal_plan_this_week",
+        return_value=meal_plan,
+    )
+    get_recipe = mocker.patch(
+        "custom_components.mealie.api.Api.get_recipe", return_value=recipe("meal1")
+    )
+
+    coordinator.data = await coordinator._async_update_data()
+    recipe_calls = get_recipe.call_count
+    coordinator.data = await coordinator._async_update_data()
+
+    assert get_meal_plan.call_count == 1
+    assert get_recipe.call_count == recipe_calls == 2
+    assert coordinator.data[SENSOR_NO_RECIPES_KEY] == 10
+
+
+async def test_update_data_keeps_results_that_finish_before_deadline(
+    mocker: MockerFixture, coordinator: MealieDataUpdateCoordinator
+) -> None:
+    mocker.patch(
+        "custom_components.mealie.api.Api.get_statistics",
+        side_effect=RequestTimeoutException(),
+    )
+    mocker.patch(
+        "custom_components.mealie.api.Api.get_meal_plan_this_week",
+        return_value=meal_plan,
+    )
+    mocker.patch(
+        "custom_components.mealie.api.Api.get_recipe", return_value=recipe("meal1")
+    )
+
+    data = await coordinator._async_update_data()
+
+    assert SENSOR_NO_RECIPES_KEY not in data
+    assert data[SENSOR_MEAL_PLAN_KEY] == meal_plan
+    assert coordinator.refresh_history[-1]["failed"] == {
+        SENSOR_NO_RECIPES_KEY: "RequestTimeoutException"
+    }
+    assert coordinator.update_interval == STALE_RETRY_BASE_INTERVAL
+
+
+async def test_first_refresh_fails_when_every_fetch_fails(
+    mocker: MockerFixture, coordinator: MealieDataUpdateCoordinator
+) -> None:
+    mocker.patch(
+        "custom_components.mealie.api.Api.get_statistics",
+        side_effect=RequestTimeoutException(),
+    )
+    mocker.patch(
+        "custom_components.mealie.api.Api.get_meal_plan_this_week",
+        side_effect=HttpException(),
+    )
+
+    with pytest.raises(UpdateFailed):
+        await coordinator._async_update_data()
+
+    assert coordinator.update_interval == FAILED_REFRESH_RETRY_INTERVAL
+
+
+async def test_rejected_token_starts_reauth(
+    mocker: MockerFixture, coordinator: MealieDataUpdateCoordinator
+) -> None:
+    mocker.patch(
+        "custom_components.mealie.api.Api.get_statistics",
+        side_effect=AuthenticationException(),
+    )
+    mocker.patch(
+        "custom_components.mealie.api.Api.get_meal_plan_this_week",
+        return_value=meal_plan,
+    )
+
+    with pytest.raises(ConfigEntryAuthFailed):
+        await coordinator._async_update_data()
+
+    assert coordinator.refresh_history[-1]["error"] == "AuthenticationException"
+
+
+async def test_failing_key_serves_stale_data_until_staleness_bound(
+    mocker: MockerFixture, coordinator: MealieDataUpdateCoordinator
+) -> None:
+    get_statistics = mocker.patch(
+        "custom_components.mealie.api.Api.get_statistics", return_value=statistics
+    )
+    mocker.patch(
+        "custom_components.mealie.api.Api.get_meal_plan_this_week",
+        return_value=meal_plan,
+    )
+    mocker.patch(
+        "custom_components.mealie.api.Api.get_recipe", return_value=recipe("meal1")
+    )
+    coordinator.data = await coordinator._async_update_data()
+
+    get_statistics.side_effect = ApiException()
+    mocker.patch(
+        "custom_components.mealie.coordinator.dt_util.now",
+        return_value=datetime(2021, 11, 29, 18, 0),
+    )
+    data = await coordinator._async_update_data()
+
+    assert data[SENSOR_NO_RECIPES_KEY] == 10
+    assert coordinator.is_available(SENSOR_NO_RECIPES_KEY)
+    assert coordinator.data_age(SENSOR_NO_RECIPES_KEY) < timedelta(minutes=1)
+
+    mocker.patch(
+        "custom_components.mealie.coordinator.dt_util.utcnow",
+        return_value=dt_util.utcnow() + timedelta(minutes=DEFAULT_STALENESS_BOUND + 1),
+    )
+    assert not coordinator.is_available(SENSOR_NO_RECIPES_KEY)
+    assert not coordinator.is_available(SENSOR_MEAL_PLAN_KEY)
+
+
+async def test_shopping_list_failures_leave_the_meal_plan_alone(
+    mocker: MockerFixture, coordinator: MealieDataUpdateCoordinator
+) -> None:
+    def get_recipe(slug: str, deadline=None) -> MagicMock:
+        if slug == "meal2":
+            raise NotFoundException()
+        return recipe(slug)
+
+    mocker.patch(
+        "custom_components.mealie.api.Api.get_statistics", return_value=statistics
+    )
+    mocker.patch(
+        "custom_components.mealie.api.Api.get_meal_plan_this_week",
+        return_value=meal_plan,
+    )
+    mocker.patch("custom_components.mealie.api.Api.get_recipe", side_effect=get_recipe)
+    coordinator.data = await coordinator._async_update_data()
+
+    assert "failed" not in coordinator.refresh_history[-1]
+    assert coordinator.shopping_list_stats()["recipes"] == 1
+
+    recipe_today = coordinator.data[SENSOR_TODAY_RECIPE_KEY]
+    coordinator.mealie_api.invalidate_recipes()
+    mocker.patch(
+        "custom_components.mealie.api.Api.get_recipe", side_effect=ApiException()
+    )
+    mocker.patch(
+        "custom_components.mealie.coordinator.dt_util.now",
+        return_value=datetime(2021, 11, 29, 12, 30),
+    )
+    coordinator.data = await coordinator._async_update_data()
+
+    failed = coordinator.refresh_history[-1]["failed"]
+    assert failed[SENSOR_SHOPPING_LIST_KEY] == "ApiException"
+    assert coordinator.data[SENSOR_TODAY_RECIPE_KEY] is recipe_today
+    assert coordinator.shopping_list_stats()["recipes"] == 1
+    assert SENSOR_MEAL_PLAN_KEY not in failed
+    assert coordinator.is_available(SENSOR_MEAL_PLAN_KEY)
+    assert coordinator._scheduler.failures(SENSOR_MEAL_PLAN_KEY) == 0
+
+
+async def test_midnight_switches_recipe_from_cached_meal_plan(
+    mocker: MockerFixture, coordinator: MealieDataUpdateCoordinator
+) -> None:
+    mocker.patch(
+        "custom_components.mealie.api.Api.get_statistics", return_value=statistics
+    )
+    get_meal_plan = mocker.patch(
+        "custom_components.mealie.api.Api.get_meal_plan_this_week",
+        return_value=meal_plan,
+    )
+    get_recipe = mocker.patch(
+        "custom_components.mealie.api.Api.get_recipe",
+        side_effect=lambda slug, deadline=None: recipe(slug),
+    )
+    coordinator.data = await coordinator._async_update_data()
+    set_updated_data = mocker.patch.object(coordinator, "async_set_updated_data")
+
+    await coordinator.async_handle_midnight(datetime(2021, 11, 29, 12, 0))
+    set_updated_data.assert_not_called()
+
+    midnight = datetime(2021, 11, 30, 0, 0)
+    mocker.patch(
+        "custom_components.mealie.coordinator.dt_util.now", return_value=midnight
+    )
+    await coordinator.async_handle_midnight(midnight)
+
+    assert get_meal_plan.call_count == 1
+    assert [call.args for call in get_recipe.call_args_list] == [("meal1",), ("meal2",)]
+    assert set_updated_data.call_args.args[0][SENSOR_TODAY_RECIPE_KEY].slug == "meal2"
+
+
+async def test_today_recipe_is_only_downloaded_when_slug_changes_or_invalidated(
+    mocker: MockerFixture, coordinator: MealieDataUpdateCoordinator
+) -> None:
+    mocker.patch(
+        "custom_components.mealie.api.Api.get_statistics", return_value=statistics
+    )
+    mocker.patch(
+        "custom_components.mealie.api.Api.get_meal_plan_this_week",
+        return_value=meal_plan,
+    )
+    mocker.patch(
+        "custom_components.mealie.api.Api.get_recipe",
+        side_effect=lambda slug, deadline=None: recipe(slug),
+    )
+    get_recipes = mocker.spy(coordinator.mealie_api, "get_recipes")
+
+    def today_recipe_requests() -> int:
+        return [call.args[0] for call in get_recipes.call_args_list].count(["meal1"])
+
+    coordinator.data = await coordinator._async_update_data()
+    recipe_today = coordinator.data[SENSOR_TODAY_RECIPE_KEY]
+
+    for hour in (14, 16):
+        mocker.patch(
+            "custom_components.mealie.coordinator.dt_util.now",
+            return_value=datetime(2021, 11, 29, hour, 0),
+        )
+        coordinator.mealie_api.invalidate_recipes()
+        coordinator.data = await coordinator._async_update_data()
+        assert SENSOR_TODAY_RECIPE_KEY in coordinator.refresh_history[-1]["keys"]
+        assert coordinator.data[SENSOR_TODAY_RECIPE_KEY] is recipe_today
+    assert today_recipe_requests() == 1
+
+    coordinator.async_invalidate_recipes()
+    mocker.patch(
+        "custom_components.mealie.coordinator.dt_util.now",
+        return_value=datetime(2021, 11, 29, 18, 0),
+    )
+    coordinator.data = await coordinator._async_update_data()
+
+    assert coordinator.data[SENSOR_TODAY_RECIPE_KEY] is not recipe_today
+    assert today_recipe_requests() == 2
+
+
+async def test_shared_fetcher_fetches_group_data_once_for_all_entries(
+    mocker: MockerFixture,
+) -> None:
+    mocker.patch(
+        "custom_components.mealie.coordinator.dt_util.now",
+        return_value=datetime(2021, 11, 29, 12, 0),
+    )
+    mocker.patch(
+        "custom_components.mealie.api.Api.ensure_valid_token", return_value=None
+    )
+    get_statistics = mocker.patch(
+        "custom_components.mealie.api.Api.get_statistics",
+        side_effect=delayed(statistics),
+    )
+    get_meal_plan = mocker.patch(
+        "custom_components.mealie.api.Api.get_meal_plan_this_week",
+        side_effect=delayed(meal_plan),
+    )
+
+    async def download_recipe(slug: str, deadline=None) -> MagicMock:
+        await asyncio.sleep(0.01)
+        return recipe(slug)
+
+    get_recipe = mocker.patch(
+        "custom_components.mealie.api.Api.get_recipe", side_effect=download_recipe
+    )
+
+    shared_fetcher = SharedFetcher(max_age=0)
+    tasks = []
+    hass = MagicMock()
+    hass.async_create_task.side_effect = lambda coro: tasks.append(
+        asyncio.ensure_future(coro)
+    )
+    coordinators = []
+    for entry_id in ("first", "second"):
+        config_entry = MagicMock()
+        config_entry.entry_id = entry_id
+        config_entry.options = {}
+        coordinator = MealieDataUpdateCoordinator(
+            hass=hass,
+            config_entry=config_entry,
+            mealie_api=Api(
+                http_client=HttpClient(client_session=ClientSession()),
+                base_url="",
+                token_repository=TokenRepository(),
+            ),
+            shared_fetcher=shared_fetcher,
+        )
+        shared_fetcher.async_subscribe(entry_id, coordinator.async_receive_shared)
+        coordinators.append(coordinator)
+    first, second = coordinators
+
+    first.data, second.data = await asyncio.gather(
+        first._async_update_data(), second._async_update_data()
+    )
+
+    assert get_statistics.call_count == get_meal_plan.call_count == 1
+    assert sorted(call.args[0] for call in get_recipe.call_args_list) == [
+        "meal1",
+        "meal2",
+    ]
+    assert not tasks
+    assert first.data[SENSOR_NO_RECIPES_KEY] == second.data[SENSOR_NO_RECIPES_KEY]
+
+    set_updated_data = mocker.patch.object(second, "async_set_updated_data")
+    await first._async_fetch(SENSOR_NO_RECIPES_KEY)
+    await asyncio.gather(*tasks)
+
+    assert get_statistics.call_count == 2
+    assert set_updated_data.call_args.args[0][SENSOR_NO_RECIPES_KEY] == 10
+    assert shared_fetcher.stats() == {"subscribers": 2, "fetches": 3, "reused": 2}
+
+
+async def test_listeners_are_only_notified_for_changed_keys(
+    mocker: MockerFixture, coordinator: MealieDataUpdateCoordinator
+) -> None:
+    mocker.patch.object(coordinator, "_schedule_refresh")
+    get_statistics = mocker.patch(
+        "custom_components.mealie.api.Api.get_statistics", return_value=statistics
+    )
+    mocker.patch(
+        "custom_components.mealie.api.Api.get_meal_plan_this_week",
+        return_value=meal_plan,
+    )
+    mocker.patch(
+        "custom_components.mealie.api.Api.get_recipe", return_value=recipe("meal1")
+    )
+    statistics_listener = MagicMock()
+    meal_plan_listener = MagicMock()
+    coordinator.async_add_listener(statistics_listener, SENSOR_NO_RECIPES_KEY)
+    coordinator.async_add_listener(meal_plan_listener, SENSOR_MEAL_PLAN_KEY)
+
+    coordinator.async_set_updated_data(await coordinator._async_update_data())
+    assert statistics_listener.call_count == meal_plan_listener.call_count == 1
+    meal_plan_version = coordinator.data_version(SENSOR_MEAL_PLAN_KEY)
+
+    get_statistics.return_value = StatisticsResponse(
+        total_recipes=11,
+        total_users=1,
+        total_groups=1,
+        uncategorized_recipes=2,
+        untagged_recipes=3,
+    )
+    mocker.patch(
+        "custom_components.mealie.coordinator.dt_util.now",
+        return_value=datetime(2021, 11, 29, 19, 0),
+    )
+    coordinator.async_set_updated_data(await coordinator._async_update_data())
+
+    assert statistics_listener.call_count == 2
+    assert meal_plan_listener.call_count == 1
+    assert coordinator.data_version(SENSOR_MEAL_PLAN_KEY) == meal_plan_version
+
+
+async def test_endpoint_listeners_are_only_notified_after_requests(
+    mocker: MockerFixture, coordinator: MealieDataUpdateCoordinator
+) -> None:
+    mocker.patch.object(coordinator, "_schedule_refresh")
+    statistics_endpoint = "/api/debug/statistics"
+    metrics_listener = MagicMock()
+    coordinator.async_add_listener(metrics_listener, statistics_endpoint)
+    coordinator.async_set_updated_data({})
+    metrics_listener.assert_not_called()
+
+    coordinator.mealie_api.metrics.endpoint(statistics_endpoint).record_request(
+        latency=0.1, status_code=200, size=100
+    )
+    coordinator.async_set_updated_data({})
+    coordinator.async_set_updated_data({})
+
+    assert metrics_listener.call_count == 1
@@ -0,0 +1,270 @@
+from datetime import datetime
+from unittest.mock import MagicMock
+
+from aiohttp import web
+from aiohttp.client import ClientSession
+from homeassistant.const import CONF_ACCESS_TOKEN, CONF_HOST, CONF_USERNAME
+import pytest
+from pytest_mock import MockerFixture
+
+from benchmarks.stub_server import MealieStubServer, StubServerConfig
+from custom_components.mealie import _async_resolve_group
+from custom_components.mealie.api import Api
+from custom_components.mealie.calendar import MealieMealPlanCalendar
+from custom_components.mealie.const import (
+    CONF_COORDINATOR,
+    CONF_GROUP,
+    DOMAIN,
+    SENSOR_MEAL_PLAN_KEY,
+    SENSOR_NO_RECIPES_KEY,
+    SENSOR_TODAY_RECIPE_KEY,
+    shopping_list_sensor_entity_description,
+)
+from custom_components.mealie.coordinator import MealieDataUpdateCoordinator
+from custom_components.mealie.diagnostics import (
+    async_get_config_entry_diagnostics,
+)
+from custom_components.mealie.exception import (
+    HttpException,
+    InternalClientException,
+)
+from custom_components.mealie.http_client import HttpClient
+from custom_components.mealie.resilience import RetryPolicy
+from custom_components.mealie.response_cache import ResponseCache
+from custom_components.mealie.sensor import MealieShoppingListSensor
+from custom_components.mealie.token_repository import TokenRepository
+from custom_components.mealie.webhook import webhook_handler, webhook_keys
+
+
+@pytest.fixture(scope="function")
+def stub_server() -> MealieStubServer:
+    return MealieStubServer(StubServerConfig(seed=1))
+
+
+@pytest.fixture(scope="function")
+async def base_url(aiohttp_server, stub_server: MealieStubServer) -> str:
+    server = await aiohttp_server(stub_server.app)
+    return str(server.make_url("")).rstrip("/")
+
+
+async def test_api_against_stub_server(
+    stub_server: MealieStubServer, base_url: str
+) -> None:
+    async with ClientSession() as session:
+        api = Api(
+            http_client=HttpClient(client_session=session),
+            base_url=base_url,
+            token_repository=TokenRepository(),
+        )
+        await api.get_token(username="user1", password="password")
+
+        user = await api.get_user()
+        statistics = await api.get_statistics()
+        meal_plan = await api.get_meal_plan_this_week()
+        recipe = await api.get_recipe(meal_plan.plan_days[0].meals[0].slug)
+
+    assert user.username == "user1"
+    assert statistics.total_recipes == 250
+    assert len(meal_plan.plan_days) == 7
+    assert recipe.slug == meal_plan.plan_days[0].meals[0].slug
+    assert stub_server.requests["/api/debug/statistics"] == 1
+
+
+async def test_group_lookup_stores_the_group_and_shares_fetches(base_url: str) -> None:
+    async with ClientSession() as session:
+        api = Api(
+            http_client=HttpClient(client_session=session),
+            base_url=base_url,
+            token_repository=TokenRepository(),
+        )
+        await api.get_token(username="user1", password="password")
+
+        hass = MagicMock()
+        hass.data = {}
+        entry = MagicMock()
+        entry.entry_id = "entry"
+        entry.options = {}
+        entry.data = {CONF_HOST: base_url}
+        coordinator = MealieDataUpdateCoordinator(
+            hass=hass, config_entry=entry, mealie_api=api
+        )
+        await _async_resolve_group(hass, entry, coordinator)
+
+    hass.config_entries.async_update_entry.assert_called_once_with(
+        entry, data={CONF_HOST: base_url, CONF_GROUP: "Home"}
+    )
+    assert coordinator.shared_fetcher is not None
+    assert coordinator.shared_fetcher.subscribers == 1
+    entry.async_on_unload.assert_called_once()
+
+
+def test_per_entry_entities_get_unique_ids() -> None:
+    entities = []
+    for entry_id in ("first", "second"):
+        coordinator = MagicMock()
+        coordinator.config_entry.entry_id = entry_id
+        entities += [
+            MealieMealPlanCalendar(mealie_coordinator=coordinator),
+            MealieShoppingListSensor(
+                mealie_api=MagicMock(),
+                mealie_coordinator=coordinator,
+                description=shopping_list_sensor_entity_description,
+            ),
+        ]
+
+    assert [entity.unique_id for entity in entities] == [
+        "first_meal_plan",
+        "first_shopping_list",
+        "second_meal_plan",
+        "second_shopping_list",
+    ]
+    assert all(entity.entity_id is None for entity in entities)
+
+
+async def test_truncated_body_raises_http_exception(
+    stub_server: MealieStubServer, base_url: str
+) -> None:
+    stub_server.config.truncate_rate = 1.0
+    async with ClientSession() as session:
+        http_client = HttpClient(
+            client_session=session, retry_policy=RetryPolicy(base_delay=0)
+        )
+
+        with pytest.raises(HttpException):
+            await http_client.get(
+                url=f"{base_url}/api/debug/statistics",
+                headers={"Authorization": f"Bearer {stub_server.token()}"},
+            )
+
+    assert stub_server.requests["/api/debug/statistics"] == 3
+
+
+async def test_diagnostics_redacts_tokens_and_user_details(
+    stub_server: MealieStubServer, base_url: str
+) -> None:
+    async with ClientSession() as session:
+        api = Api(
+            http_client=HttpClient(
+                client_session=session, response_cache=ResponseCache()
+            ),
+            base_url=base_url,
+            token_repository=TokenRepository(),
+        )
+        token = await api.get_token(username="user1", password="password")
+        await api.refresh_token()
+
+        entry = MagicMock()
+        entry.entry_id = "entry"
+        entry.options = {}
+        entry.data = {
+            CONF_HOST: base_url,
+            CONF_USERNAME: "user1",
+            CONF_ACCESS_TOKEN: token.access_token,
+        }
+        coordinator = MealieDataUpdateCoordinator(
+            hass=MagicMock(), config_entry=entry, mealie_api=api
+        )
+        await coordinator._async_update_data()
+
+        hass = MagicMock()
+        hass.data = {DOMAIN: {"entry": {CONF_COORDINATOR: coordinator}}}
+        diagnostics = await async_get_config_entry_diagnostics(hass, entry)
+
+    assert diagnostics["entry"]["data"][CONF_ACCESS_TOKEN] == "**REDACTED**"
+    assert diagnostics["entry"]["data"][CONF_USERNAME] == "**REDACTED**"
+    assert diagnostics["user"]["email"] == "**REDACTED**"
+    assert diagnostics["user"]["full_name"] == "**REDACTED**"
+    assert token.access_token not in str(diagnostics)
+
+    (cycle,) = diagnostics["coordinator"]["refresh_history"]
+    assert "error" not in cycle
+    assert cycle["bytes"] > 0
+    assert "refresh_token" in cycle["timings"]
+    assert diagnostics["api"]["token_refresh_history"][0]["succeeded"]
+    assert diagnostics["api"]["endpoints"]["/api/debug/statistics"]["requests"] == 1
+    assert diagnostics["api"]["response_cache"]["misses"] >= 1
+
+
+async def test_diagnostics_survive_a_failing_token_refresh(
+    mocker: MockerFixture,
+) -> None:
+    mocker.patch(
+        "custom_components.mealie.api.Api.get_user",
+        side_effect=InternalClientException(),
+    )
+    async with ClientSession() as session:
+        api = Api(
+            http_client=HttpClient(client_session=session),
+            base_url="http://mealie.local",
+            token_repository=TokenRepository(),
+        )
+        entry = MagicMock()
+        entry.entry_id = "entry"
+        entry.options = {}
+        entry.data = {CONF_HOST: "http://mealie.local"}
+        coordinator = MealieDataUpdateCoordinator(
+            hass=MagicMock(), config_entry=entry, mealie_api=api
+        )
+        hass = MagicMock()
+        hass.data = {DOMAIN: {"entry": {CONF_COORDINATOR: coordinator}}}
+
+        diagnostics = await async_get_config_entry_diagnostics(hass, entry)
+
+    assert diagnostics["user"] == {"error": "InternalClientException"}
+
+
+async def test_webhook_refreshes_only_the_notified_key(
+    aiohttp_server,
+    mocker: MockerFixture,
+    stub_server: MealieStubServer,
+    base_url: str,
+) -> None:
+    mocker.patch(
+        "custom_components.mealie.coordinator.dt_util.now",
+        return_value=datetime(2021, 11, 29, 12, 5),
+    )
+    hass = MagicMock()
+    hass.async_create_task.side_effect = lambda coroutine: coroutine.close()
+
+    async with ClientSession() as session:
+        api = Api(
+            http_client=HttpClient(client_session=session),
+            base_url=base_url,
+            token_repository=TokenRepository(),
+        )
+        await api.get_token(username="user1", password="password")
+        entry = MagicMock()
+        entry.options = {}
+        coordinator = MealieDataUpdateCoordinator(
+            hass=hass, config_entry=entry, mealie_api=api
+        )
+        coordinator.data = await coordinator._async_update_data()
+
+        handle = webhook_handler(coordinator)
+
+        async def receive(request: web.Request) -> web.Response:
+            await handle(hass, request.match_info["webhook_id"], request)
+            return web.Response()
+
+        app = web.Application()
+        app.router.add_post("/api/webhook/{webhook_id}", receive)
+        webhook_server = await aiohttp_server(app)
+
+        status = await stub_server.notify(
+            str(webhook_server.make_url("/api/webhook/id")), "Meal Plan Updated"
+        )
+        coordinator.data = await coordinator._async_update_data()
+
+    assert status == 200
+    assert coordinator.pushes == 1
+    assert coordinator.refresh_history[-1]["keys"] == [SENSOR_MEAL_PLAN_KEY]
+    assert stub_server.requests["/api/meal-plans/this-week"] == 2
+    assert stub_server.requests["/api/debug/statistics"] == 1
+    assert coordinator._scheduler.next_run(SENSOR_MEAL_PLAN_KEY) == datetime(
+        2021, 11, 29, 18, 0
+    )
+    assert webhook_keys({"title": "Recipe Updated"}) == {
+        SENSOR_NO_RECIPES_KEY,
+        SENSOR_MEAL_PLAN_KEY,
+        SENSOR_TODAY_RECIPE_KEY,
+    }
@@ -0,0 +1,277 @@
+import asyncio
+import time
+
+from aiohttp import web
+from aiohttp.client import ClientSession
+import pytest
+
+from custom_components.mealie.exception import (
+    CircuitOpenException,
+    RequestTimeoutException,
+)
+from custom_components.mealie.http_client import HttpClient
+from custom_components.mealie.json_decoder import (
+    default_decoder,
+    stdlib_decoder,
+)
+from custom_components.mealie.metrics import MetricsRecorder
+from custom_components.mealie.model.model import Response, Status
+from custom_components.mealie.resilience import (
+    CircuitBreaker,
+    Deadline,
+    RetryPolicy,
+)
+from custom_components.mealie.response_cache import ResponseCache
+
+statistics = {
+    "totalRecipes": 10,
+    "totalUsers": 1,
+    "totalGroups": 1,
+    "uncategorizedRecipes": 2,
+    "untaggedRecipes": 3,
+}
+
+
+async def etag_handler(request: web.Request) -> web.Response:
+    request.app["requests"] += 1
+    if request.headers.get("If-None-Match") == '"v1"':
+        return web.Response(status=304)
+    return web.json_response(statistics, headers={"ETag": '"v1"'})
+
+
+async def plain_handler(request: web.Request) -> web.Response:
+    request.app["requests"] += 1
+    return web.json_response(statistics)
+
+
+async def flaky_handler(request: web.Request) -> web.Response:
+    request.app["requests"] += 1
+    if request.app["requests"] <= request.app["failures"]:
+        return web.json_response({"detail": "restarting"}, status=503)
+    return web.json_response(statistics)
+
+
+async def slow_handler(request: web.Request) -> web.Response:
+    await asyncio.sleep(1)
+    return web.json_response(statistics)
+
+
+@pytest.fixture(scope="function")
+async def server(aiohttp_server):
+    app = web.Application()
+    app["requests"] = 0
+    app["failures"] = 0
+    app.router.add_get("/flaky", flaky_handler)
+    app.router.add_get("/slow", slow_handler)
+    app.router.add_get("/etag", etag_handler)
+    app.router.add_get("/plain", plain_handler)
+    app.router.add_get("/api/auth/refresh", plain_handler)
+    return await aiohttp_server(app)
+
+
+async def test_get_without_cache(server) -> None:
+    async with ClientSession() as session:
+        http_client = HttpClient(client_session=session)
+        response = await http_client.get(url=str(server.make_url("/etag")), headers={})
+
+    assert response == Response(status=Status.SUCCESS, status_code=200, data=statistics)
+
+
+async def test_get_not_modified_returns_cached_response(server) -> None:
+    cache = ResponseCache()
+    async with ClientSession() as session:
+        http_client = HttpClient(client_session=session, response_cache=cache)
+        url = str(server.make_url("/etag"))
+        first = await http_client.get(url=url, headers={"Authorization": "a"})
+        second = await http_client.get(url=url, headers={"Authorization": "a"})
+        other_scope = await http_client.get(url=url, headers={"Authorization": "b"})
+
+    assert first is second
+    assert other_scope is not first
+    assert server.app["requests"] == 3
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 2
+
+
+async def test_get_unchanged_content_hash_returns_cached_response(server) -> None:
+    cache = ResponseCache()
+    async with ClientSession() as session:
+        http_client = HttpClient(client_session=session, response_cache=cache)
+        url = str(server.make_url("/plain"))
+        first = await http_client.get(url=url, headers={})
+        second = await http_client.get(url=url, headers={})
+
+    assert first is second
+    assert cache.stats()["hits"] == 1
+
+
+def test_cache_evicts_least_recently_used() -> None:
+    cache = ResponseCache(max_entries=2)
+    response = Response(status=Status.SUCCESS, status_code=200, data={})
+    for url in ("a", "b", "c"):
+        cache.store(
+            key=(url, ""), response=response, body=b"{}", etag="1", last_modified=None
+        )
+
+    assert cache.get(("a", "")) is None
+    assert cache.get(("c", "")) is not None
+    assert cache.stats()["evictions"] == 1
+
+
+async def test_get_does_not_cache_auth_responses(server) -> None:
+    async with ClientSession() as session:
+        http_client = HttpClient(client_session=session, response_cache=ResponseCache())
+        for token in ("first", "second"):
+            await http_client.get(
+                url=str(server.make_url("/api/auth/refresh")),
+                headers={"Authorization": f"Bearer {token}"},
+            )
+
+    assert http_client.response_cache.stats()["entries"] == 0
+
+
+async def test_get_uses_configured_decoder(server) -> None:
+    bodies = []
+
+    def decoder(body: bytes) -> dict:
+        bodies.append(body)
+        return stdlib_decoder(body)
+
+    async with ClientSession() as session:
+        http_client = HttpClient(client_session=session, decoder=decoder)
+        response = await http_client.get(url=str(server.make_url("/plain")), headers={})
+
+    assert response.data == statistics
+    assert len(bodies) == 1 and isinstance(bodies[0], bytes)
+
+
+async def test_get_records_endpoint_metrics(server) -> None:
+    metrics = MetricsRecorder(buckets=(0.5, 0.1))
+    async with ClientSession() as session:
+        http_client = HttpClient(client_session=session, metrics=metrics)
+        await http_client.get(
+            url=str(server.make_url("/plain")), headers={}, endpoint="/plain"
+        )
+        await http_client.get(
+            url=str(server.make_url("/plain")), headers={}, endpoint="/plain"
+        )
+
+    endpoint_metrics = metrics.snapshot()["/plain"]
+    assert endpoint_metrics["requests"] == 2
+    assert endpoint_metrics["status_codes"] == {200: 2}
+    assert endpoint_metrics["total_bytes"] == 2 * endpoint_metrics["last_bytes"] > 0
+    assert sum(endpoint_metrics["latency_histogram"].values()) == 2
+    assert list(endpoint_metrics["latency_histogram"]) == [
+        "<=100ms",
+        "<=500ms",
+        ">500ms",
+    ]
+    assert endpoint_metrics["last_decode_time"] is not None
+
+
+async def test_get_retries_unavailable_responses(server) -> None:
+    server.app["failures"] = 2
+    async with ClientSession() as session:
+        http_client = HttpClient(
+            client_session=session, retry_policy=RetryPolicy(base_delay=0)
+        )
+        response = await http_client.get(
+            url=str(server.make_url("/flaky")), headers={}, endpoint="/flaky"
+        )
+
+    assert response.data == statistics
+    assert server.app["requests"] == 3
+    assert http_client.retries == 2
+    assert http_client.metrics.snapshot()["/flaky"]["retries"] == 2
+
+
+async def test_circuit_breaker_fails_fast_while_host_is_down(server) -> None:
+    server.app["failures"] = 10
+    now = [0.0]
+    async with ClientSession() as session:
+        http_client = HttpClient(
+            client_session=session,
+            retry_policy=RetryPolicy(attempts=1),
+            circuit_breaker_factory=lambda: CircuitBreaker(
+                failure_threshold=2, reset_timeout=30, clock=lambda: now[0]
+            ),
+        )
+        url = str(server.make_url("/flaky"))
+        for _ in range(2):
+            response = await http_client.get(url=url, headers={})
+            assert response.status_code == 503
+
+        with pytest.raises(CircuitOpenException):
+            await http_client.get(url=url, headers={})
+        assert server.app["requests"] == 2
+
+        server.app["failures"] = 0
+        now[0] = 30
+        response = await http_client.get(url=url, headers={})
+
+    assert response.data == statistics
+    (breaker,) = http_client.resilience_stats()["circuit_breakers"].values()
+    assert breaker == {"state": "closed", "failures": 0, "rejected": 1, "opened": 1}
+
+
+async def test_cancelled_trial_request_lets_the_next_request_through(server) -> None:
+    server.app["failures"] = 1
+    now = [0.0]
+    async with ClientSession() as session:
+        http_client = HttpClient(
+            client_session=session,
+            retry_policy=RetryPolicy(attempts=1),
+            circuit_breaker_factory=lambda: CircuitBreaker(
+                failure_threshold=1, reset_timeout=30, clock=lambda: now[0]
+            ),
+        )
+        response = await http_client.get(url=str(server.make_url("/flaky")), headers={})
+        assert response.status_code == 503
+
+        now[0] = 30
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(
+                http_client.get(url=str(server.make_url("/slow")), headers={}), 0.05
+            )
+        response = await http_client.get(url=str(server.make_url("/plain")), headers={})
+
+    assert response.data == statistics
+    (breaker,) = http_client.resilience_stats()["circuit_breakers"].values()
+    assert breaker["state"] == "closed"
+
+
+async def test_get_times_out_per_endpoint_and_respects_deadline(server) -> None:
+    async with ClientSession() as session:
+        http_client = HttpClient(
+            client_session=session,
+            retry_policy=RetryPolicy(base_delay=0.05),
+            request_timeouts={"/slow": 0.05},
+        )
+        url = str(server.make_url("/slow"))
+
+        start = time.perf_counter()
+        with pytest.raises(RequestTimeoutException):
+            await http_client.get(url=url, headers={}, endpoint="/slow")
+        assert time.perf_counter() - start < 0.5
+
+        with pytest.raises(RequestTimeoutException):
+            await http_client.get(
+                url=url, headers={}, endpoint="/slow", deadline=Deadline.after(0)
+            )
+
+    assert http_client.resilience_stats()["timeouts"] == 4
+
+
+def test_retry_delay_backs_off_exponentially_with_jitter() -> None:
+    policy = RetryPolicy(base_delay=1, max_delay=5, jitter=0.5)
+
+    assert [policy.delay(attempt, max) for attempt in range(4)] == [1, 2, 4, 5]
+    assert [policy.delay(attempt, min) for attempt in range(4)] == [0.5, 1, 2, 2.5]
+
+
+def test_default_decoder_raises_value_error_on_invalid_json() -> None:
+    decoder = default_decoder()
+
+    assert decoder(b'{"a": [1, 2]}') == {"a": [1, 2]}
+    with pytest.raises(ValueError):
+        decoder(b'{"a": ')
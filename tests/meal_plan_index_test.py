@@ -0,0 +1,56 @@
+from datetime import date
+
+from custom_components.mealie.meal_plan_index import MealPlanIndex
+from custom_components.mealie.model.model import Meal, MealPlanResponse, PlanDay
+
+
+def _meal_plan(days: dict) -> MealPlanResponse:
+    return MealPlanResponse(
+        group="Home",
+        start_date=min(days),
+        end_date=max(days),
+        plan_days=[
+            PlanDay(
+                date=day, meals=[Meal(slug=slug, name=slug.title(), description=None)]
+            )
+            for day, slug in days.items()
+        ],
+        uid=1,
+        shopping_list=1,
+    )
+
+
+def test_meals_between_excludes_end_date() -> None:
+    index = MealPlanIndex(
+        _meal_plan(
+            {
+                date(2021, 11, 29): "soup",
+                date(2021, 12, 1): "pasta",
+                date(2021, 12, 3): "curry",
+            }
+        )
+    )
+
+    assert [
+        day for day, _ in index.meals_between(date(2021, 11, 30), date(2021, 12, 3))
+    ] == [date(2021, 12, 1)]
+    assert index.recipe_slug_on(date(2021, 12, 3)) == "curry"
+    assert index.next_day_with_meals(date(2021, 11, 30))[0] == date(2021, 12, 1)
+    assert index.next_day_with_meals(date(2021, 12, 4)) is None
+
+
+def test_update_only_reports_changed_days() -> None:
+    index = MealPlanIndex(
+        _meal_plan({date(2021, 11, 29): "soup", date(2021, 11, 30): "pasta"})
+    )
+
+    changed = index.update(
+        _meal_plan({date(2021, 11, 30): "pasta", date(2021, 12, 1): "curry"})
+    )
+
+    assert changed == {date(2021, 11, 29), date(2021, 12, 1)}
+    assert index.meals_on(date(2021, 11, 29)) == ()
+    assert [
+        day for day, _ in index.meals_between(date(2021, 11, 1), date(2021, 12, 31))
+    ] == [date(2021, 11, 30), date(2021, 12, 1)]
+    assert index.update(None) == {date(2021, 11, 30), date(2021, 12, 1)}
@@ -0,0 +1,41 @@
+from benchmarks.payloads import recipe_payload
+from custom_components.mealie.model.compact import CompactRecipeResponse
+from custom_components.mealie.model.model import (
+    LazyRecipeResponse,
+    Note,
+    RecipeResponse,
+)
+
+
+def test_lazy_recipe_matches_eager_recipe() -> None:
+    payload = recipe_payload(slug="lazy-recipe", comments=3)
+
+    lazy = LazyRecipeResponse.from_json(payload)
+    eager = RecipeResponse.from_json(payload)
+
+    assert lazy.slug == eager.slug == "lazy-recipe"
+    assert lazy.date_updated == eager.date_updated
+    assert "recipe_ingredient" not in vars(lazy)
+    assert lazy.recipe_ingredient == eager.recipe_ingredient
+    assert "recipe_ingredient" in vars(lazy)
+    assert lazy.comments == eager.comments
+    assert lazy.notes == [Note(title="Tip", text="Tastes better the next day.")]
+    assert lazy == eager
+
+
+def test_compact_recipe_matches_eager_recipe() -> None:
+    payload = recipe_payload(slug="compact-recipe", comments=3)
+
+    compact = CompactRecipeResponse.from_json(payload)
+    eager = RecipeResponse.from_json(payload)
+
+    assert not hasattr(compact, "__dict__")
+    assert isinstance(compact.recipe_ingredient, tuple)
+    assert [ingredient.food.name for ingredient in compact.recipe_ingredient] == [
+        ingredient.food.name for ingredient in eager.recipe_ingredient
+    ]
+    assert [comment.user.id for comment in compact.comments] == [
+        comment.user.id for comment in eager.comments
+    ]
+    assert compact.settings.public == eager.settings.public
+    assert CompactRecipeResponse.from_json(compact.to_json()) == compact
@@ -0,0 +1,28 @@
+import threading
+
+from custom_components.mealie.offload import PayloadExecutor
+
+
+def current_thread(*args) -> threading.Thread:
+    return threading.current_thread()
+
+
+async def test_small_payloads_run_inline(loop) -> None:
+    executor = PayloadExecutor(threshold=10)
+
+    assert await executor.run("parse", 10, current_thread) is threading.current_thread()
+    stats = executor.blocking_stats()["parse"]
+    assert stats["inline"] == 1
+    assert stats["offloaded"] == 0
+
+
+async def test_large_payloads_run_in_executor(loop) -> None:
+    executor = PayloadExecutor(threshold=10)
+
+    assert await executor.run("parse", 11, current_thread) is not (
+        threading.current_thread()
+    )
+    stats = executor.blocking_stats()["parse"]
+    assert stats["inline"] == 0
+    assert stats["offloaded"] == 1
+    assert stats["total"] == 0.0
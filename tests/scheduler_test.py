@@ -0,0 +1,83 @@
+from datetime import datetime, timedelta
+
+from custom_components.mealie.scheduler import RefreshSchedule, RefreshScheduler
+
+
+def test_unaligned_schedule_runs_after_interval() -> None:
+    schedule = RefreshSchedule(interval=timedelta(minutes=30))
+
+    assert schedule.next_run(datetime(2021, 11, 29, 10, 7)) == datetime(
+        2021, 11, 29, 10, 37
+    )
+
+
+def test_aligned_schedule_runs_on_wall_clock_boundaries() -> None:
+    schedule = RefreshSchedule(interval=timedelta(minutes=30), aligned=True)
+    daily = RefreshSchedule(interval=timedelta(hours=7), aligned=True)
+
+    assert schedule.next_run(datetime(2021, 11, 29, 10, 7)) == datetime(
+        2021, 11, 29, 10, 30
+    )
+    assert daily.next_run(datetime(2021, 11, 29, 22, 0)) == datetime(2021, 11, 30, 0, 0)
+
+
+def test_scheduler_only_returns_due_keys() -> None:
+    now = datetime(2021, 11, 29, 10, 0)
+    scheduler = RefreshScheduler(
+        {
+            "fast": RefreshSchedule(interval=timedelta(minutes=5)),
+            "slow": RefreshSchedule(interval=timedelta(hours=6)),
+        }
+    )
+    assert scheduler.due_keys(now) == {"fast", "slow"}
+
+    scheduler.mark_refreshed({"fast", "slow"}, now)
+    assert scheduler.due_keys(now) == set()
+    assert scheduler.time_until_next_run(now) == timedelta(minutes=5)
+    assert scheduler.due_keys(now + timedelta(minutes=5)) == {"fast"}
+
+
+def test_update_schedules_reschedules_changed_keys() -> None:
+    now = datetime(2021, 11, 29, 10, 0)
+    scheduler = RefreshScheduler({"key": RefreshSchedule(interval=timedelta(hours=6))})
+    scheduler.mark_refreshed({"key"}, now)
+
+    assert not scheduler.update_schedules(
+        {"key": RefreshSchedule(interval=timedelta(hours=6))}, now
+    )
+    assert scheduler.update_schedules(
+        {"key": RefreshSchedule(interval=timedelta(minutes=10))}, now
+    ) == {"key"}
+    assert scheduler.next_run("key") == now + timedelta(minutes=10)
+
+
+def test_failed_keys_back_off_until_refreshed() -> None:
+    now = datetime(2021, 11, 29, 10, 0)
+    scheduler = RefreshScheduler(
+        {"slow": RefreshSchedule(interval=timedelta(hours=6))},
+        retry_base=timedelta(minutes=1),
+        retry_max=timedelta(minutes=3),
+    )
+
+    for expected in (1, 2, 3, 3):
+        scheduler.mark_failed({"slow"}, now)
+        assert scheduler.next_run("slow") == now + timedelta(minutes=expected)
+
+    scheduler.mark_refreshed({"slow"}, now)
+    assert scheduler.failures("slow") == 0
+    assert scheduler.next_run("slow") == now + timedelta(hours=6)
+
+
+def test_backoff_stays_capped_for_keys_that_keep_failing() -> None:
+    now = datetime(2021, 11, 29, 10, 0)
+    scheduler = RefreshScheduler(
+        {"slow": RefreshSchedule(interval=timedelta(hours=6))},
+        retry_base=timedelta(minutes=1),
+        retry_max=timedelta(minutes=30),
+    )
+
+    for _ in range(100):
+        scheduler.mark_failed({"slow"}, now)
+
+    assert scheduler.failures("slow") == 100
+    assert scheduler.next_run("slow") == now + timedelta(minutes=30)
@@ -0,0 +1,91 @@
+from datetime import date
+from typing import Any, Dict, List
+
+from benchmarks.payloads import recipe_payload
+from custom_components.mealie.model.compact import CompactRecipeResponse
+from custom_components.mealie.model.model import Meal, MealPlanResponse, PlanDay
+from custom_components.mealie.shopping_list import (
+    ShoppingList,
+    ShoppingListItem,
+    planned_servings,
+)
+
+
+def ingredient(food: str, unit: str, quantity: int) -> Dict[str, Any]:
+    return {
+        "title": None,
+        "note": None,
+        "unit": {"name": unit, "description": None},
+        "food": {"name": food, "description": None},
+        "disableAmount": False,
+        "quantity": quantity,
+    }
+
+
+def recipe(slug: str, ingredients: List[Dict[str, Any]]) -> CompactRecipeResponse:
+    return CompactRecipeResponse.from_json(
+        {**recipe_payload(slug=slug), "recipeIngredient": ingredients}
+    )
+
+
+def test_planned_servings_counts_repeated_meals() -> None:
+    meal_plan = MealPlanResponse(
+        group="Test",
+        start_date=date(2021, 11, 29),
+        end_date=date(2021, 11, 30),
+        plan_days=[
+            PlanDay(
+                date=date(2021, 11, 29),
+                meals=[
+                    Meal(slug=None, name="leftovers", description=None),
+                    Meal(slug="soup", name="Soup", description=None),
+                ],
+            ),
+            PlanDay(
+                date=date(2021, 11, 30),
+                meals=[Meal(slug="soup", name="Soup", description=None)],
+            ),
+        ],
+        uid=27,
+        shopping_list=25,
+    )
+
+    assert planned_servings(meal_plan) == {"soup": 2}
+    assert planned_servings(None) == {}
+
+
+def test_shopping_list_merges_by_food_and_unit() -> None:
+    soup = recipe(
+        "soup", [ingredient("Onion", "piece", 1), ingredient("stock", "ml", 500)]
+    )
+    pasta = recipe(
+        "pasta", [ingredient("onion", "piece", 2), ingredient("Pasta", "gram", 250)]
+    )
+    shopping_list = ShoppingList()
+
+    assert shopping_list.update({"soup": 2, "pasta": 1}, {"soup": soup, "pasta": pasta})
+    assert shopping_list.items == (
+        ShoppingListItem(food="Onion", unit="piece", quantity=4),
+        ShoppingListItem(food="Pasta", unit="gram", quantity=250),
+        ShoppingListItem(food="stock", unit="ml", quantity=1000),
+    )
+
+
+def test_shopping_list_only_reaggregates_changed_recipes() -> None:
+    soup = recipe("soup", [ingredient("onion", "piece", 1)])
+    pasta = recipe("pasta", [ingredient("onion", "piece", 2)])
+    shopping_list = ShoppingList()
+    shopping_list.update({"soup": 1, "pasta": 1}, {"soup": soup, "pasta": pasta})
+    items = shopping_list.items
+
+    assert not shopping_list.update(
+        {"soup": 1, "pasta": 1}, {"soup": soup, "pasta": pasta}
+    )
+    assert shopping_list.items is items
+    assert shopping_list.stats()["aggregated"] == 2
+
+    assert shopping_list.update({"pasta": 1}, {"pasta": pasta})
+    assert shopping_list.items == (
+        ShoppingListItem(food="onion", unit="piece", quantity=2),
+    )
+    assert shopping_list.stats()["aggregated"] == 3
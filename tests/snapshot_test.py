@@ -0,0 +1,116 @@
+from datetime import date, datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock
+
+from aiohttp.client import ClientSession
+from homeassistant.util import dt as dt_util
+import pytest
+from pytest_mock import MockerFixture
+
+from benchmarks.payloads import recipe_payload
+from custom_components.mealie.api import Api
+from custom_components.mealie.const import (
+    SENSOR_MEAL_PLAN_KEY,
+    SENSOR_NO_RECIPES_KEY,
+    SENSOR_NO_UNCATEGORIZED_RECIPES_KEY,
+    SENSOR_NO_UNTAGGED_RECIPES_KEY,
+    SENSOR_SHOPPING_LIST_KEY,
+    SENSOR_TODAY_RECIPE_KEY,
+)
+from custom_components.mealie.coordinator import MealieDataUpdateCoordinator
+from custom_components.mealie.http_client import HttpClient
+from custom_components.mealie.model.compact import CompactRecipeResponse
+from custom_components.mealie.model.model import Meal, MealPlanResponse, PlanDay
+from custom_components.mealie.shopping_list import ShoppingListItem
+from custom_components.mealie.snapshot import pack_data, unpack_data
+from custom_components.mealie.token_repository import TokenRepository
+
+meal_plan = MealPlanResponse(
+    group="Test",
+    start_date=date(2021, 11, 29),
+    end_date=date(2021, 11, 30),
+    plan_days=[
+        PlanDay(
+            date=date(2021, 11, 29),
+            meals=[Meal(slug="meal1", name="meal1", description=None)],
+        ),
+        PlanDay(date=date(2021, 11, 30), meals=[]),
+    ],
+    uid=27,
+    shopping_list=25,
+)
+
+data = {
+    SENSOR_NO_RECIPES_KEY: 10,
+    SENSOR_NO_UNCATEGORIZED_RECIPES_KEY: 2,
+    SENSOR_NO_UNTAGGED_RECIPES_KEY: 3,
+    SENSOR_MEAL_PLAN_KEY: meal_plan,
+    SENSOR_SHOPPING_LIST_KEY: (
+        ShoppingListItem(food="Food 1", unit="gram", quantity=4),
+        ShoppingListItem(food="salt", unit=None, quantity=0),
+    ),
+    SENSOR_TODAY_RECIPE_KEY: CompactRecipeResponse.from_json(
+        recipe_payload(slug="meal1")
+    ),
+}
+
+
+def test_pack_data_round_trips_model_objects() -> None:
+    packed = pack_data(data)
+
+    assert isinstance(packed[SENSOR_MEAL_PLAN_KEY], list)
+    assert unpack_data(packed) == data
+    assert unpack_data(pack_data({SENSOR_TODAY_RECIPE_KEY: None})) == {
+        SENSOR_TODAY_RECIPE_KEY: None
+    }
+
+
+@pytest.fixture(scope="function")
+async def coordinator(loop, mocker: MockerFixture) -> MealieDataUpdateCoordinator:
+    mocker.patch(
+        "custom_components.mealie.coordinator.dt_util.now",
+        return_value=dt_util.as_local(datetime(2021, 11, 29, 12, 0)),
+    )
+    snapshot_store = MagicMock()
+    snapshot_store.async_load = AsyncMock(
+        return_value=(
+            unpack_data(pack_data(data)),
+            {
+                key: dt_util.utcnow() - timedelta(minutes=1)
+                for key in (
+                    SENSOR_NO_RECIPES_KEY,
+                    SENSOR_MEAL_PLAN_KEY,
+                    SENSOR_SHOPPING_LIST_KEY,
+                    SENSOR_TODAY_RECIPE_KEY,
+                )
+            },
+        )
+    )
+    config_entry = MagicMock()
+    config_entry.options = {}
+    yield MealieDataUpdateCoordinator(
+        hass=MagicMock(),
+        config_entry=config_entry,
+        mealie_api=Api(
+            http_client=HttpClient(client_session=ClientSession()),
+            base_url="",
+            token_repository=TokenRepository(),
+        ),
+        snapshot_store=snapshot_store,
+    )
+
+
+async def test_restored_snapshot_serves_data_before_first_refresh(
+    mocker: MockerFixture, coordinator: MealieDataUpdateCoordinator
+) -> None:
+    mocker.patch(
+        "custom_components.mealie.api.Api.ensure_valid_token", return_value=None
+    )
+    get_statistics = mocker.patch("custom_components.mealie.api.Api.get_statistics")
+
+    assert await coordinator.async_restore_snapshot()
+
+    assert coordinator.data == data
+    assert coordinator.is_available(SENSOR_MEAL_PLAN_KEY)
+
+    await coordinator._async_update_data()
+    get_statistics.assert_not_called()
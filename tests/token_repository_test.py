@@ -1,7 +1,16 @@
+import asyncio
+from datetime import datetime, timezone
+from unittest.mock import MagicMock
+
+from homeassistant.const import CONF_ACCESS_TOKEN
+import jwt
 import pytest
 
 from custom_components.mealie.exception import NoTokenException
-from custom_components.mealie.token_repository import TokenRepository
+from custom_components.mealie.token_repository import (
+    HomeAssistantTokenRepository,
+    TokenRepository,
+)
 
 
 @pytest.fixture(scope="function")
@@ -23,3 +32,72 @@ async def test_purge_token(token_repository: TokenRepository) -> None:
 
     with pytest.raises(NoTokenException):
         await token_repository.get_token()
+
+
+async def test_token_expiry(token_repository: TokenRepository) -> None:
+    assert await token_repository.get_token_expiry() is None
+
+    token = jwt.encode({"sub": "user", "exp": 1700000000}, "secret")
+    await token_repository.set_token(token=token)
+
+    assert await token_repository.get_token_expiry() == datetime(
+        2023, 11, 14, 22, 13, 20, tzinfo=timezone.utc
+    )
+
+
+@pytest.fixture(scope="function")
+async def home_assistant_token_repository(loop) -> HomeAssistantTokenRepository:
+    entry = MagicMock()
+    entry.data = {CONF_ACCESS_TOKEN: "persisted_token"}
+
+    def async_update_entry(config_entry, data) -> None:
+        config_entry.data = data
+
+    hass = MagicMock()
+    hass.loop = asyncio.get_running_loop()
+    hass.config_entries.async_update_entry.side_effect = async_update_entry
+    return HomeAssistantTokenRepository(hass=hass, entry=entry)
+
+
+async def test_identical_token_is_not_written(
+    home_assistant_token_repository: HomeAssistantTokenRepository,
+) -> None:
+    await home_assistant_token_repository.set_token("persisted_token")
+    home_assistant_token_repository.async_flush()
+
+    assert home_assistant_token_repository.stats() == {
+        "writes": 0,
+        "writes_avoided": 1,
+    }
+
+
+async def test_token_writes_are_coalesced(
+    home_assistant_token_repository: HomeAssistantTokenRepository,
+) -> None:
+    await home_assistant_token_repository.set_token("first_token")
+    await home_assistant_token_repository.set_token("second_token")
+    assert await home_assistant_token_repository.get_token() == "second_token"
+
+    home_assistant_token_repository.async_flush()
+
+    assert home_assistant_token_repository._entry.data == {
+        CONF_ACCESS_TOKEN: "second_token"
+    }
+    assert home_assistant_token_repository.stats() == {
+        "writes": 1,
+        "writes_avoided": 1,
+    }
+
+
+async def test_pending_write_does_not_overwrite_a_token_stored_elsewhere(
+    home_assistant_token_repository: HomeAssistantTokenRepository,
+) -> None:
+    await home_assistant_token_repository.set_token("refreshed_token")
+    home_assistant_token_repository._entry.data = {CONF_ACCESS_TOKEN: "reauth_token"}
+
+    home_assistant_token_repository.async_flush()
+
+    assert home_assistant_token_repository._entry.data == {
+        CONF_ACCESS_TOKEN: "reauth_token"
+    }
+    assert home_assistant_token_repository.stats()["writes"] == 0